@@ -1,14 +1,18 @@
 import pygame
 import sys
-import random
-import time
+import argparse
 import numpy as np
 
+from snake_game import FPS, UP, DOWN, LEFT, RIGHT, GREEN_PLAYER, RED_PLAYER
+from snake_bot import SnakeBot
+from snake_replay import new_recorded_game, REPLAY_DIR
+
 # Constants
 WINDOW_SIZE = 800
 CELL_SIZE = 20
 GRID_SIZE = WINDOW_SIZE // CELL_SIZE
-FPS = 10
+RENDER_FPS = 60  # frames drawn per second; the game itself still ticks at FPS
+MAX_LAG_TICKS = 5  # after a stall, catch up at most this many ticks at once
 
 # Colors
 BLACK = (0, 0, 0)
@@ -17,11 +21,17 @@ RED = (200, 0, 0)
 WHITE = (255, 255, 255)
 ORANGE = (255, 225, 180)  # Orange for bombs
 
-# Directions
-UP = (0, -1)
-DOWN = (0, 1)
-LEFT = (-1, 0)
-RIGHT = (1, 0)
+# Controls
+CONTROLS = {
+    pygame.K_w: (GREEN_PLAYER, UP),
+    pygame.K_s: (GREEN_PLAYER, DOWN),
+    pygame.K_a: (GREEN_PLAYER, LEFT),
+    pygame.K_d: (GREEN_PLAYER, RIGHT),
+    pygame.K_UP: (RED_PLAYER, UP),
+    pygame.K_DOWN: (RED_PLAYER, DOWN),
+    pygame.K_LEFT: (RED_PLAYER, LEFT),
+    pygame.K_RIGHT: (RED_PLAYER, RIGHT),
+}
 
 # Initialize Pygame
 pygame.init()
@@ -79,9 +89,17 @@ fruit_beep = create_sound(frequency=600, duration=0.1, volume=.5, waveform='sine
 begin_game=generate_beep_sound()
 death_buzz = create_sound(frequency=100, duration=0.3, volume=.15,  waveform='square')
 
-def draw_snake(screen, snake, color):
-    for segment in snake:
-        pygame.draw.rect(screen, color, pygame.Rect(segment[0]*CELL_SIZE, segment[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
+def draw_snake(screen, snake, color, previous=None, alpha=1.0):
+    # With the snake as it was before the last tick, each segment is drawn
+    # alpha of the way from its old cell to its new one. Segment i always
+    # moves to where segment i - 1 was, so the body slides along its path;
+    # a segment grown this tick starts on the old tail.
+    for i, segment in enumerate(snake):
+        x, y = segment
+        if previous:
+            old_x, old_y = previous[min(i, len(previous) - 1)]
+            x, y = old_x + (x - old_x) * alpha, old_y + (y - old_y) * alpha
+        pygame.draw.rect(screen, color, pygame.Rect(round(x*CELL_SIZE), round(y*CELL_SIZE), CELL_SIZE, CELL_SIZE))
 
 def draw_fruit(screen, fruit):
     pygame.draw.rect(screen, WHITE, pygame.Rect(fruit[0]*CELL_SIZE, fruit[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
@@ -89,19 +107,6 @@ def draw_fruit(screen, fruit):
 def draw_bomb(screen, bomb):
     pygame.draw.rect(screen, ORANGE, pygame.Rect(bomb[0]*CELL_SIZE, bomb[1]*CELL_SIZE, CELL_SIZE, CELL_SIZE))
 
-def move_snake(snake, direction, grow=False):
-    head_x, head_y = snake[0]
-    dir_x, dir_y = direction
-    new_head = (head_x + dir_x, head_y + dir_y)
-    if grow:
-        return [new_head] + snake
-    else:
-        return [new_head] + snake[:-1]
-
-def check_collision(snake):
-    head = snake[0]
-    return head in snake[1:] or head[0] < 0 or head[1] < 0 or head[0] >= GRID_SIZE or head[1] >= GRID_SIZE
-
 def wait_for_input():
     while True:
         for event in pygame.event.get():
@@ -112,147 +117,75 @@ def wait_for_input():
                 begin_game.play()
                 return
 
-def get_random_position(snake1, snake2, bombs=[]):
-    while True:
-        position = (random.randint(0, GRID_SIZE - 1), random.randint(0, GRID_SIZE - 1))
-        if position not in snake1 and position not in snake2 and position not in bombs:
-            return position
-
 def draw_score(screen, score1, score2):
     score_text = f"GREEN: {score1} |   RED : {score2}"
     score_surface = score_font.render(score_text, True, WHITE)
     screen.blit(score_surface, (10, 10))
 
-def game_loop():
-    # Initial game setup
-    snake1 = [(5, 5), (4, 5), (3, 5)]
-    snake2 = [(GRID_SIZE - 6, GRID_SIZE - 6), (GRID_SIZE - 5, GRID_SIZE - 6), (GRID_SIZE - 4, GRID_SIZE - 6)]
-    direction1 = RIGHT
-    direction2 = LEFT
-    grow1 = False
-    grow2 = False
-    fruit = get_random_position(snake1, snake2)
-    bombs = []
-    score1 = 0
-    score2 = 0
-    last_bomb_time = time.time()
-    bomb_spawn_interval = 2
-    game_over = False
-    winner = None
-    death_reason = ""
+def game_loop(bot_players=(), fruit_count=1, replay_dir=REPLAY_DIR):
+    # Initial game setup; every match is recorded for snake_viewer.py
+    game, recorder = new_recorded_game(grid_size=GRID_SIZE, fruit_count=fruit_count)
+    bots = [SnakeBot(player) for player in bot_players]
+    clock = pygame.time.Clock()
 
     screen.fill(BLACK)
-    draw_snake(screen, snake1, GREEN)
-    draw_snake(screen, snake2, RED)
-    draw_fruit(screen, fruit)
+    draw_snake(screen, game.snakes[GREEN_PLAYER], GREEN)
+    draw_snake(screen, game.snakes[RED_PLAYER], RED)
+    for fruit in game.fruits:
+        draw_fruit(screen, fruit)
     pygame.display.flip()
     wait_for_input()
 
-    while not game_over:
-        grow1 = grow2 = False
-        current_time = time.time()
-
-        if current_time - last_bomb_time >= bomb_spawn_interval:
-            bombs.append(get_random_position(snake1, snake2, bombs=bombs))
-            last_bomb_time = current_time
-
+    # Fixed-step loop: input is read and the screen drawn every frame, and
+    # the game steps once per 1/FPS seconds of elapsed time, so drawing at
+    # RENDER_FPS doesn't change its speed. Keys go into the game's turn
+    # queue, so two taps between ticks become two turns.
+    tick_ms = 1000 / FPS
+    previous = [list(snake) for snake in game.snakes]
+    lag = 0.0
+    clock.tick()
+    while not game.game_over:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 pygame.quit()
                 sys.exit()
-            elif event.type == pygame.KEYDOWN:
-                # Snake 1 controls
-                if event.key == pygame.K_w and direction1 != DOWN:
-                    direction1 = UP
-                elif event.key == pygame.K_s and direction1 != UP:
-                    direction1 = DOWN
-                elif event.key == pygame.K_a and direction1 != RIGHT:
-                    direction1 = LEFT
-                elif event.key == pygame.K_d and direction1 != LEFT:
-                    direction1 = RIGHT
-                # Snake 2 controls
-                elif event.key == pygame.K_UP and direction2 != DOWN:
-                    direction2 = UP
-                elif event.key == pygame.K_DOWN and direction2 != UP:
-                    direction2 = DOWN
-                elif event.key == pygame.K_LEFT and direction2 != RIGHT:
-                    direction2 = LEFT
-                elif event.key == pygame.K_RIGHT and direction2 != LEFT:
-                    direction2 = RIGHT
-
-        # Check for fruit eating
-        next_head1 = (snake1[0][0] + direction1[0], snake1[0][1] + direction1[1])
-        next_head2 = (snake2[0][0] + direction2[0], snake2[0][1] + direction2[1])
-
-        if next_head1 == fruit:
-            grow1 = True
-            fruit = get_random_position(snake1, snake2, bombs)
-            score1 += 1
-            fruit_beep.play()
-        if next_head2 == fruit:
-            grow2 = True
-            fruit = get_random_position(snake1, snake2, bombs)
-            score2 += 1
-            fruit_beep.play()
-
-        # Move snakes
-        snake1 = move_snake(snake1, direction1, grow1)
-        snake2 = move_snake(snake2, direction2, grow2)
-
-        # Collision checks
-
-# Collision checks
-        if check_collision(snake1):
-            if snake1[0][0] < 0 or snake1[0][1] < 0 or snake1[0][0] >= GRID_SIZE or snake1[0][1] >= GRID_SIZE:
-                death_reason = "GREEN hit the wall"
-            else:
-                death_reason = "GREEN ran into itself"
-            game_over = True
-            winner = "RED"
-        elif check_collision(snake2):
-            if snake2[0][0] < 0 or snake2[0][1] < 0 or snake2[0][0] >= GRID_SIZE or snake2[0][1] >= GRID_SIZE:
-                death_reason = "RED hit the wall"
-            else:
-                death_reason = "RED ran into itself"
-            game_over = True
-            winner = "GREEN"
-        elif snake1[0] == snake2[0]:
-            game_over = True
-            winner = "Draw"
-            death_reason = "head-on collision"
-        elif snake1[0] in snake2:
-            game_over = True
-            winner = "RED"
-            death_reason = "GREEN ran into RED"
-        elif snake2[0] in snake1:
-            game_over = True
-            winner = "GREEN"
-            death_reason = "RED ran into GREEN"
-
-        # Bomb collisions
-        if snake1[0] in bombs:
-            game_over = True
-            winner = "RED"
-            death_reason = "GREEN exploded"
-        if snake2[0] in bombs:
-            game_over = True
-            winner = "GREEN"
-            death_reason = "RED exploded"
-
-        if game_over:
-            death_buzz.play()
-
-        # Draw everything
+            elif event.type == pygame.KEYDOWN and event.key in CONTROLS:
+                player, direction = CONTROLS[event.key]
+                if player not in bot_players:
+                    game.queue_turn(player, direction)
+
+        lag = min(lag + clock.tick(RENDER_FPS), MAX_LAG_TICKS * tick_ms)
+        while lag >= tick_ms and not game.game_over:
+            lag -= tick_ms
+            for bot in bots:
+                game.turn(bot.player, bot.choose(game))
+
+            previous = [list(snake) for snake in game.snakes]
+            for _ in game.step():
+                fruit_beep.play()
+            recorder.record()
+
+            if game.game_over:
+                death_buzz.play()
+
+        # Draw everything, the snakes part of the way into the next tick
+        alpha = 1.0 if game.game_over else lag / tick_ms
         screen.fill(BLACK)
-        draw_snake(screen, snake1, GREEN)
-        draw_snake(screen, snake2, RED)
-        draw_fruit(screen, fruit)
-        for bomb in bombs:
+        draw_snake(screen, game.snakes[GREEN_PLAYER], GREEN, previous[GREEN_PLAYER], alpha)
+        draw_snake(screen, game.snakes[RED_PLAYER], RED, previous[RED_PLAYER], alpha)
+        for fruit in game.fruits:
+            draw_fruit(screen, fruit)
+        for bomb in game.bombs:
             draw_bomb(screen, bomb)
-        draw_score(screen, score1, score2)
+        draw_score(screen, *game.scores)
 
         pygame.display.flip()
-        pygame.time.Clock().tick(FPS)
+
+    if replay_dir:
+        recorder.save(replay_dir)
+
+    winner = game.winner
+    death_reason = game.death_reason
 
     # Game Over message
     if winner == "Draw":
@@ -281,10 +214,16 @@ def game_loop():
                 sys.exit()
             elif event.type == pygame.KEYDOWN:
                 if event.key == pygame.K_r:
-                    game_loop()
+                    game_loop(bot_players, fruit_count, replay_dir)
                 elif event.key == pygame.K_q:
                     pygame.quit()
                     sys.exit()
 
 if __name__ == "__main__":
-    game_loop()
+    parser = argparse.ArgumentParser(description="Two player snake with bombs.")
+    parser.add_argument("--bot", action="append", choices=("green", "red"), default=[],
+                        help="let the computer play this snake (may be given twice)")
+    parser.add_argument("--fruits", type=int, default=1, help="fruit on the board at once")
+    parser.add_argument("--replays", default=REPLAY_DIR, help="directory replays are saved to ('' to not save)")
+    args = parser.parse_args()
+    game_loop(tuple(GREEN_PLAYER if name == "green" else RED_PLAYER for name in args.bot), args.fruits, args.replays)
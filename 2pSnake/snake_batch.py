@@ -0,0 +1,243 @@
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+
+from snake_game import (
+    GRID_SIZE, BOMB_SPAWN_TICKS, BOMB_FUSE_TICKS, DIRECTIONS, EMPTY, BOMB, BODY_CELLS, PLAYER_NAMES,
+    GREEN_BODY, RED_BODY, GREEN_PLAYER, RED_PLAYER,
+)
+
+# Many independent games stepped together, for bot training and bulk
+# evaluation. Every piece of state is a NumPy array with one row per game:
+# the flat occupancy grids, head positions, each snake's body as a ring
+# buffer of cell indices (head at start, tail length - 1 after it), the
+# fruit and the live bombs, oldest first. step(actions) advances all of them
+# with the rules of SnakeGame.step, bomb spawns and fuses included. Both run
+# on fixed periods, so the oldest bomb is always the next to burn out and no
+# timer wheel is needed. Games that finished start over before the next
+# step. One generator drives the whole batch, so a batch replays exactly
+# from its seed but single games don't match the SnakeGame of the same seed.
+
+# Direction codes are indices into DIRECTIONS; a code's opposite is code ^ 1
+DX = np.array([dx for dx, _ in DIRECTIONS], np.int32)
+DY = np.array([dy for _, dy in DIRECTIONS], np.int32)
+KEEP = -1                 # action: carry on in the current direction
+WALL = 255                # what a head that left the board hits
+
+GREEN_WINS, RED_WINS, DRAW = 0, 1, 2
+PLAYING = -1
+WINNERS = PLAYER_NAMES + ("Draw",)
+REASONS = (
+    "", "GREEN hit the wall", "GREEN ran into itself", "RED hit the wall", "RED ran into itself",
+    "head-on collision", "GREEN ran into RED", "RED ran into GREEN", "GREEN exploded", "RED exploded",
+    "time limit",
+)
+(GREEN_WALL, GREEN_SELF, RED_WALL, RED_SELF, HEAD_ON, GREEN_INTO_RED, RED_INTO_GREEN,
+ GREEN_EXPLODED, RED_EXPLODED, TIME_LIMIT) = range(1, len(REASONS))
+
+
+class SnakeBatch:
+    def __init__(self, games, grid_size=GRID_SIZE, seed=None, bomb_spawn_ticks=BOMB_SPAWN_TICKS,
+                 bomb_fuse_ticks=BOMB_FUSE_TICKS, max_ticks=None):
+        self.games = games
+        self.grid_size = grid_size
+        self.cells = grid_size * grid_size
+        self.bomb_spawn_ticks = bomb_spawn_ticks
+        self.bomb_fuse_ticks = bomb_fuse_ticks
+        self.max_ticks = max_ticks
+        self.rng = np.random.default_rng(seed)
+        self.rows = np.arange(games)
+
+        index = np.int16 if self.cells <= np.iinfo(np.int16).max else np.int32
+        self.grid = np.zeros((games, self.cells), np.uint8)
+        self.body = np.zeros((games, 2, self.cells), index)
+        self.start = np.zeros((games, 2), np.int32)
+        self.length = np.zeros((games, 2), np.int32)
+        self.x = np.zeros((games, 2), np.int32)
+        self.y = np.zeros((games, 2), np.int32)
+        self.direction = np.zeros((games, 2), np.int8)
+        self.fruit = np.zeros(games, np.int32)
+        # Bomb cells as a FIFO ring per game: at most fuse // spawn + 1 are ever live
+        live_bombs = self.cells if bomb_fuse_ticks is None else bomb_fuse_ticks // bomb_spawn_ticks + 1
+        self.bomb_cells = np.zeros((games, min(live_bombs, self.cells)), index)
+        self.bomb_first = np.zeros(games, np.int32)
+        self.bombs = np.zeros(games, np.int32)
+        self.scores = np.zeros((games, 2), np.int32)
+        self.tick = np.zeros(games, np.int32)
+
+        # Same opening as SnakeGame: heads first, GREEN heading right, RED left
+        size = grid_size
+        self.openings = (
+            ([(5, 5), (4, 5), (3, 5)], DIRECTIONS.index((1, 0))),
+            ([(size - 6, size - 6), (size - 5, size - 6), (size - 4, size - 6)], DIRECTIONS.index((-1, 0))),
+        )
+        self.reset(self.rows)
+
+    def board(self) -> np.ndarray:
+        """The grids as a (games, grid_size, grid_size) view, indexed [game, y, x]."""
+        return self.grid.reshape(self.games, self.grid_size, self.grid_size)
+
+    def reset(self, games):
+        """Start the given games (an index array) over."""
+        self.grid[games] = EMPTY
+        for player, (segments, direction) in enumerate(self.openings):
+            cells = [y * self.grid_size + x for x, y in segments]
+            self.body[games, player, :len(cells)] = cells
+            self.grid[np.ix_(games, cells)] = BODY_CELLS[player]
+            self.start[games, player] = 0
+            self.length[games, player] = len(cells)
+            self.x[games, player], self.y[games, player] = segments[0]
+            self.direction[games, player] = direction
+        self.fruit[games] = self.random_empty(games)
+        self.bomb_first[games] = 0
+        self.bombs[games] = 0
+        self.scores[games] = 0
+        self.tick[games] = 0
+
+    def random_empty(self, games) -> np.ndarray:
+        """A random empty cell in each of the given games, drawn until every one is empty."""
+        cells = self.rng.integers(0, self.cells, len(games))
+        taken = self.grid[games, cells] != EMPTY
+        while taken.any():
+            cells[taken] = self.rng.integers(0, self.cells, np.count_nonzero(taken))
+            taken[taken] = self.grid[games[taken], cells[taken]] != EMPTY
+        return cells
+
+    def step(self, actions):
+        """Advance every game one tick.
+
+        actions is (games, 2): a direction code per snake, or KEEP. Returns
+        (eaten, winner, reason, ticks): who ate the fruit, the WINNERS code
+        of every game that ended (PLAYING for the rest), its REASONS code and
+        each game's tick count. Finished games have already been reset when
+        this returns.
+        """
+        rows = self.rows
+        actions = np.asarray(actions)
+        turn = (actions >= 0) & (actions != self.direction ^ 1)
+        self.direction = np.where(turn, actions, self.direction).astype(np.int8)
+
+        self.tick += 1
+        # Bombs are lit every bomb_spawn_ticks and burn out bomb_fuse_ticks
+        # later; one that burns out on a spawn tick goes first, as on SnakeGame's wheel
+        phase = self.tick % self.bomb_spawn_ticks
+        if self.bomb_fuse_ticks is not None:
+            expire = np.flatnonzero(phase == self.bomb_fuse_ticks % self.bomb_spawn_ticks)
+            expire = expire[self.tick[expire] > self.bomb_fuse_ticks]
+            if len(expire):
+                first = self.bomb_first[expire]
+                self.grid[expire, self.bomb_cells[expire, first]] = EMPTY
+                self.bomb_first[expire] = (first + 1) % self.bomb_cells.shape[1]
+                self.bombs[expire] -= 1
+        spawn = np.flatnonzero(phase == 0)
+        if len(spawn):
+            cells = self.random_empty(spawn)
+            self.grid[spawn, cells] = BOMB
+            slot = (self.bomb_first[spawn] + self.bombs[spawn]) % self.bomb_cells.shape[1]
+            self.bomb_cells[spawn, slot] = cells
+            self.bombs[spawn] += 1
+
+        x = self.x + DX[self.direction]
+        y = self.y + DY[self.direction]
+        inside = (x >= 0) & (x < self.grid_size) & (y >= 0) & (y < self.grid_size)
+        head = np.where(inside, y * self.grid_size + x, 0)
+
+        # GREEN eats first, and the fruit moves before RED's head is compared
+        eaten = np.zeros((self.games, 2), bool)
+        for player in (GREEN_PLAYER, RED_PLAYER):
+            eaten[:, player] = inside[:, player] & (head[:, player] == self.fruit)
+            moved = np.flatnonzero(eaten[:, player])
+            if len(moved):
+                self.fruit[moved] = self.random_empty(moved)
+        self.scores += eaten
+
+        # Tails leave the grid before any head is tested
+        for player in (GREEN_PLAYER, RED_PLAYER):
+            start, length = self.start[:, player], self.length[:, player]
+            move = np.flatnonzero(~eaten[:, player])
+            tail = self.body[move, player, (start[move] + length[move] - 1) % self.cells]
+            self.grid[move, tail] = EMPTY
+            length[move] -= 1
+            start[:] = (start - 1) % self.cells
+            self.body[rows, player, start] = head[:, player]
+            length += 1
+        self.x, self.y = x, y
+
+        hit = np.where(inside, self.grid[rows[:, None], head], WALL)
+        hit1, hit2 = hit[:, GREEN_PLAYER], hit[:, RED_PLAYER]
+        same = inside.all(axis=1) & (head[:, 0] == head[:, 1])
+        conditions = [hit1 == WALL, hit1 == GREEN_BODY, hit2 == WALL, hit2 == RED_BODY,
+                      same, hit1 == RED_BODY, hit2 == GREEN_BODY]
+        winner = np.select(conditions, [RED_WINS, RED_WINS, GREEN_WINS, GREEN_WINS, DRAW, RED_WINS, GREEN_WINS],
+                           PLAYING).astype(np.int8)
+        reason = np.select(conditions, [GREEN_WALL, GREEN_SELF, RED_WALL, RED_SELF, HEAD_ON,
+                                        GREEN_INTO_RED, RED_INTO_GREEN], 0).astype(np.int8)
+        # Bombs are checked after the collisions and override them, GREEN's first
+        for blown, wins, why in ((hit1 == BOMB, RED_WINS, GREEN_EXPLODED), (hit2 == BOMB, GREEN_WINS, RED_EXPLODED)):
+            winner[blown] = wins
+            reason[blown] = why
+        if self.max_ticks is not None:
+            timeout = (winner == PLAYING) & (self.tick >= self.max_ticks)
+            winner[timeout] = DRAW
+            reason[timeout] = TIME_LIMIT
+
+        done = winner != PLAYING
+        live = np.flatnonzero(~done)
+        for player in (GREEN_PLAYER, RED_PLAYER):
+            self.grid[live, head[live, player]] = BODY_CELLS[player]
+
+        ticks = self.tick.copy()
+        finished = np.flatnonzero(done)
+        if len(finished):
+            self.reset(finished)
+        return eaten, winner, reason, ticks
+
+
+def random_actions(rng, games) -> np.ndarray:
+    """Uniformly random turns, keeping straight half the time."""
+    actions = rng.integers(0, len(DIRECTIONS), (games, 2))
+    actions[rng.random((games, 2)) < 0.5] = KEEP
+    return actions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Step a batch of 2pSnake games with random play.")
+    parser.add_argument("--games", type=int, default=4096, help="games stepped together")
+    parser.add_argument("--steps", type=int, default=1000)
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument("--max-ticks", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    batch = SnakeBatch(args.games, args.grid_size, args.seed, max_ticks=args.max_ticks)
+    rng = np.random.default_rng(args.seed + 1)
+    actions = [random_actions(rng, args.games) for _ in range(min(args.steps, 64))]
+    winners = np.zeros(len(WINNERS), np.int64)
+    reasons = np.zeros(len(REASONS), np.int64)
+    ticks = 0
+
+    started = time.perf_counter()
+    for i in range(args.steps):
+        _, winner, reason, length = batch.step(actions[i % len(actions)])
+        done = winner != PLAYING
+        winners += np.bincount(winner[done], minlength=len(WINNERS))
+        reasons += np.bincount(reason[done], minlength=len(REASONS))
+        ticks += int(length[done].sum())
+    elapsed = time.perf_counter() - started
+
+    finished = int(winners.sum())
+    print(f"{args.games * args.steps} game-steps on a {args.grid_size}x{args.grid_size} board in {elapsed:.2f}s "
+          f"({args.games * args.steps / elapsed / 1e6:.2f}M steps/s, {args.games} games at a time)")
+    print(f"{finished} games finished, average length {ticks / max(1, finished):.1f} ticks")
+    for code, name in enumerate(WINNERS):
+        print(f"  {name:<6} {winners[code]:>9}  {100 * winners[code] / max(1, finished):5.1f}%")
+    print("Death reasons:")
+    for reason, count in Counter(dict(zip(REASONS, reasons))).most_common():
+        if count:
+            print(f"  {reason:<22} {count:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+import heapq
+from dataclasses import dataclass
+
+from snake_game import DIRECTIONS, OPPOSITE, EMPTY
+
+# Computer-controlled snakes. Every decision works on the game's flat
+# occupancy grid and is bounded by a node budget, so a move costs the same
+# on a 40x40 board as on a 400x400 one.
+
+
+@dataclass
+class BotParams:
+    search_budget: int = 4000   # max A* expansions per decision
+    space_margin: float = 2.0   # free cells required ahead, as a multiple of own length
+    head_penalty: int = 6       # extra path cost for cells the enemy head can reach next
+    space_cap: int = 400        # flood fill never counts past this many cells
+
+
+class SnakeBot:
+    def __init__(self, player, params=None):
+        self.player = player
+        self.params = params or BotParams()
+
+    def choose(self, game):
+        """Return the direction to play this tick."""
+        size = game.grid_size
+        grid = game.grid
+        snake = game.snakes[self.player]
+        enemy = game.snakes[1 - self.player]
+        head = snake[0]
+        current = game.directions[self.player]
+
+        # Our own tail moves out of the way unless we eat this tick
+        passable_tail = game.index(snake[-1])
+        enemy_x, enemy_y = enemy[0]
+        danger = set()
+        for dx, dy in DIRECTIONS:
+            x, y = enemy_x + dx, enemy_y + dy
+            if 0 <= x < size and 0 <= y < size:
+                danger.add(y * size + x)
+
+        candidates = []
+        for direction in DIRECTIONS:
+            if direction == OPPOSITE[current]:
+                continue
+            x, y = head[0] + direction[0], head[1] + direction[1]
+            if not (0 <= x < size and 0 <= y < size):
+                continue
+            idx = y * size + x
+            if grid[idx] != EMPTY and idx != passable_tail:
+                continue
+            candidates.append((direction, idx))
+        if not candidates:
+            return current
+
+        need = min(int(len(snake) * self.params.space_margin) + 1, self.params.space_cap)
+        fruit = game.nearest_fruit(head)
+        step = self.path_step(game, head, fruit, danger, passable_tail)
+        if step is not None:
+            for direction, idx in candidates:
+                if direction == step and idx not in danger and self.space(game, idx, need) >= need:
+                    return direction
+
+        # No safe path to the fruit: take the roomiest move, preferring
+        # cells away from the enemy head and closer to the fruit
+        fruit_x, fruit_y = fruit
+        best = None
+        for direction, idx in candidates:
+            x, y = idx % size, idx // size
+            score = (
+                self.space(game, idx, need),
+                idx not in danger,
+                -(abs(x - fruit_x) + abs(y - fruit_y)),
+            )
+            if best is None or score > best[0]:
+                best = (score, direction)
+        return best[1]
+
+    def path_step(self, game, start, goal, danger, passable_tail):
+        """A* from start to goal over free cells; returns the first direction or None."""
+        size = game.grid_size
+        grid = game.grid
+        penalty = self.params.head_penalty
+        goal_x, goal_y = goal
+        start_idx = start[1] * size + start[0]
+        goal_idx = goal_y * size + goal_x
+
+        came_from = {start_idx: None}
+        cost = {start_idx: 0}
+        frontier = [(0, start_idx)]
+        expanded = 0
+        while frontier and expanded < self.params.search_budget:
+            _, current = heapq.heappop(frontier)
+            if current == goal_idx:
+                break
+            expanded += 1
+            x, y = current % size, current // size
+            for dx, dy in DIRECTIONS:
+                nx, ny = x + dx, y + dy
+                if not (0 <= nx < size and 0 <= ny < size):
+                    continue
+                nxt = ny * size + nx
+                if grid[nxt] != EMPTY and nxt != passable_tail:
+                    continue
+                new_cost = cost[current] + 1 + (penalty if nxt in danger else 0)
+                if new_cost < cost.get(nxt, new_cost + 1):
+                    cost[nxt] = new_cost
+                    came_from[nxt] = current
+                    heapq.heappush(frontier, (new_cost + abs(nx - goal_x) + abs(ny - goal_y), nxt))
+        else:
+            return None
+
+        if goal_idx not in came_from or goal_idx == start_idx:
+            return None
+        node = goal_idx
+        while came_from[node] != start_idx:
+            node = came_from[node]
+        return ((node % size) - start[0], (node // size) - start[1])
+
+    def space(self, game, start_idx, limit):
+        """Count free cells reachable from start_idx, stopping at limit."""
+        size = game.grid_size
+        grid = game.grid
+        seen = {start_idx}
+        stack = [start_idx]
+        while stack and len(seen) < limit:
+            current = stack.pop()
+            x = current % size
+            for nxt in (current - size, current + size,
+                        current - 1 if x > 0 else -1,
+                        current + 1 if x < size - 1 else -1):
+                if 0 <= nxt < len(grid) and nxt not in seen and grid[nxt] == EMPTY:
+                    seen.add(nxt)
+                    stack.append(nxt)
+        return len(seen)
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+import sys
+
+import pygame
+
+from py_snake_bomb import (
+    screen, font, BLACK, GREEN, RED, WHITE, WINDOW_SIZE, CONTROLS,
+    draw_snake, draw_fruit, draw_bomb, draw_score, fruit_beep, death_buzz,
+)
+from snake_game import GREEN_PLAYER, RED_PLAYER, PLAYER_NAMES
+from snake_net import NetClient, DEFAULT_PORT
+
+# Thin pygame client for snake_server.py: it only sends direction changes
+# and draws the mirror that the server's deltas keep up to date. Either key
+# set steers your own snake.
+
+RENDER_FPS = 60
+
+
+async def play(host, port):
+    pygame.display.set_caption("Two Player Snake with Bombs - waiting for opponent")
+    client = await NetClient.connect(host, port)
+    game = client.game
+    pygame.display.set_caption(f"Two Player Snake with Bombs - you are {PLAYER_NAMES[game.player]}")
+    receiver = asyncio.create_task(client.receive_forever())
+    scores = list(game.scores)
+
+    while not receiver.done():
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                client.close()
+                pygame.quit()
+                sys.exit()
+            elif event.type == pygame.KEYDOWN and event.key in CONTROLS:
+                client.send_direction(CONTROLS[event.key][1])
+
+        if game.scores != scores:
+            fruit_beep.play()
+            scores = list(game.scores)
+
+        screen.fill(BLACK)
+        draw_snake(screen, game.snakes[GREEN_PLAYER], GREEN)
+        draw_snake(screen, game.snakes[RED_PLAYER], RED)
+        draw_fruit(screen, game.fruit)
+        for bomb in game.bombs:
+            draw_bomb(screen, bomb)
+        draw_score(screen, *game.scores)
+        pygame.display.flip()
+        await asyncio.sleep(1 / RENDER_FPS)
+
+    await receiver
+    death_buzz.play()
+    if game.winner == "Draw":
+        result_message = f"It's a draw! ({game.death_reason})"
+    else:
+        result_message = f"{game.winner} wins! ({game.death_reason})"
+    result_surface = font.render(result_message, True, WHITE)
+    screen.blit(result_surface, (WINDOW_SIZE // 2 - result_surface.get_width() // 2, WINDOW_SIZE // 2 - 20))
+    pygame.display.flip()
+    client.close()
+
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or event.type == pygame.KEYDOWN:
+                pygame.quit()
+                return
+        await asyncio.sleep(1 / RENDER_FPS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Networked 2pSnake client.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args()
+    asyncio.run(play(args.host, args.port))
@@ -0,0 +1,200 @@
+import random
+from collections import deque
+
+from snake_spatial import SpatialIndex
+from snake_timers import TimerWheel
+
+# Headless game rules shared by the pygame front end, the bots and the
+# tournament runner. Nothing in here may import pygame.
+
+# Constants
+GRID_SIZE = 40
+FPS = 10
+BOMB_SPAWN_TICKS = 2 * FPS  # one bomb every 2 seconds of play
+BOMB_FUSE_TICKS = 30 * FPS  # and each burns out 30 seconds later
+MAX_QUEUED_TURNS = 3        # turns a player can buffer ahead of the ticks
+
+# Directions
+UP = (0, -1)
+DOWN = (0, 1)
+LEFT = (-1, 0)
+RIGHT = (1, 0)
+DIRECTIONS = (UP, DOWN, LEFT, RIGHT)
+OPPOSITE = {UP: DOWN, DOWN: UP, LEFT: RIGHT, RIGHT: LEFT}
+
+# Occupancy grid cell values
+EMPTY = 0
+GREEN_BODY = 1
+RED_BODY = 2
+BOMB = 3
+
+GREEN_PLAYER = 0
+RED_PLAYER = 1
+PLAYER_NAMES = ("GREEN", "RED")
+BODY_CELLS = (GREEN_BODY, RED_BODY)
+
+# Timer events: (kind, data) pairs filed on SnakeGame.timers
+SPAWN_BOMB = "spawn bomb"
+EXPIRE_BOMB = "expire bomb"
+
+
+class SnakeGame:
+    def __init__(self, grid_size=GRID_SIZE, seed=None, bomb_spawn_ticks=BOMB_SPAWN_TICKS,
+                 bomb_fuse_ticks=BOMB_FUSE_TICKS, fruit_count=1):
+        self.grid_size = grid_size
+        self.rng = random.Random(seed)
+        self.bomb_spawn_ticks = bomb_spawn_ticks
+        self.bomb_fuse_ticks = bomb_fuse_ticks  # None: bombs never burn out
+
+        # Flat occupancy grid indexed by y * grid_size + x
+        self.grid = bytearray(grid_size * grid_size)
+        self.snakes = [
+            deque([(5, 5), (4, 5), (3, 5)]),
+            deque([(grid_size - 6, grid_size - 6), (grid_size - 5, grid_size - 6), (grid_size - 4, grid_size - 6)]),
+        ]
+        for player, snake in enumerate(self.snakes):
+            for segment in snake:
+                self.grid[self.index(segment)] = BODY_CELLS[player]
+
+        self.directions = [RIGHT, LEFT]
+        self.queued_turns = [deque(), deque()]
+        self.scores = [0, 0]
+        # Fruit and bombs are indexed by position for nearest/radius queries;
+        # bombs are also on the grid, fruit isn't (snakes can move onto it)
+        self.bombs = SpatialIndex(grid_size)   # iterates oldest first
+        self.bombs_added = []    # bomb changes made by the last step
+        self.bombs_expired = []
+        self.fruits = SpatialIndex(grid_size)
+        for _ in range(fruit_count):
+            self.fruits.add(self.random_position(self.fruits))
+        self.tick = 0
+
+        # Everything that happens on a schedule goes through the wheel
+        self.timers = TimerWheel()
+        self.handlers = {SPAWN_BOMB: self.spawn_bomb, EXPIRE_BOMB: self.expire_bomb}
+        self.timers.schedule(bomb_spawn_ticks, (SPAWN_BOMB, None))
+        self.game_over = False
+        self.winner = None
+        self.death_reason = ""
+
+    def index(self, position):
+        return position[1] * self.grid_size + position[0]
+
+    def in_bounds(self, position):
+        return 0 <= position[0] < self.grid_size and 0 <= position[1] < self.grid_size
+
+    def cell(self, position):
+        return self.grid[self.index(position)]
+
+    def random_position(self, avoid=()):
+        while True:
+            position = (self.rng.randint(0, self.grid_size - 1), self.rng.randint(0, self.grid_size - 1))
+            if self.grid[self.index(position)] == EMPTY and position not in avoid:
+                return position
+
+    @property
+    def fruit(self):
+        """The fruit, when there is only one (the network protocol and GameMirror assume that)."""
+        return next(iter(self.fruits))
+
+    def nearest_fruit(self, position):
+        return self.fruits.nearest(position)[0]
+
+    def turn(self, player, direction):
+        if direction != OPPOSITE[self.directions[player]]:
+            self.directions[player] = direction
+
+    def queue_turn(self, player, direction):
+        """Buffer a turn for a later tick; step() applies one per tick.
+
+        Keys pressed faster than the tick rate would otherwise overwrite each
+        other in turn(). Each turn is checked against the one queued before
+        it, so a quick up-then-left can't queue a reversal.
+        """
+        queue = self.queued_turns[player]
+        last = queue[-1] if queue else self.directions[player]
+        if direction != last and direction != OPPOSITE[last] and len(queue) < MAX_QUEUED_TURNS:
+            queue.append(direction)
+
+    def next_head(self, player):
+        head_x, head_y = self.snakes[player][0]
+        dir_x, dir_y = self.directions[player]
+        return (head_x + dir_x, head_y + dir_y)
+
+    def step(self):
+        """Advance one tick. Returns the players that ate a fruit."""
+        for player, queue in enumerate(self.queued_turns):
+            if queue:
+                self.turn(player, queue.popleft())
+
+        self.tick += 1
+        self.bombs_added = []
+        self.bombs_expired = []
+        for kind, data in self.timers.advance():
+            self.handlers[kind](data)
+
+        # Check for fruit eating; an eaten fruit regrows elsewhere at once
+        eaten = []
+        for player in (GREEN_PLAYER, RED_PLAYER):
+            head = self.next_head(player)
+            if head in self.fruits:
+                eaten.append(player)
+                self.fruits.remove(head)
+                self.fruits.add(self.random_position(self.fruits))
+                self.scores[player] += 1
+
+        # Move snakes: tails leave the grid before any head is tested
+        heads = []
+        for player, snake in enumerate(self.snakes):
+            head = self.next_head(player)
+            snake.appendleft(head)
+            if player not in eaten:
+                self.grid[self.index(snake.pop())] = EMPTY
+            heads.append(head)
+
+        head1, head2 = heads
+        hit1 = self.cell(head1) if self.in_bounds(head1) else None
+        hit2 = self.cell(head2) if self.in_bounds(head2) else None
+
+        # Collision checks
+        if hit1 is None or hit1 == GREEN_BODY:
+            self.finish("RED", "GREEN hit the wall" if hit1 is None else "GREEN ran into itself")
+        elif hit2 is None or hit2 == RED_BODY:
+            self.finish("GREEN", "RED hit the wall" if hit2 is None else "RED ran into itself")
+        elif head1 == head2:
+            self.finish("Draw", "head-on collision")
+        elif hit1 == RED_BODY:
+            self.finish("RED", "GREEN ran into RED")
+        elif hit2 == GREEN_BODY:
+            self.finish("GREEN", "RED ran into GREEN")
+
+        # Bomb collisions
+        if hit1 == BOMB:
+            self.finish("RED", "GREEN exploded")
+        if hit2 == BOMB:
+            self.finish("GREEN", "RED exploded")
+
+        if not self.game_over:
+            for player, head in enumerate(heads):
+                self.grid[self.index(head)] = BODY_CELLS[player]
+        return eaten
+
+    def spawn_bomb(self, _):
+        bomb = self.random_position()
+        self.bombs.add(bomb)
+        self.bombs_added.append(bomb)
+        self.grid[self.index(bomb)] = BOMB
+        if self.bomb_fuse_ticks is not None:
+            self.timers.schedule(self.bomb_fuse_ticks, (EXPIRE_BOMB, bomb))
+        self.timers.schedule(self.bomb_spawn_ticks, (SPAWN_BOMB, None))
+
+    def expire_bomb(self, bomb):
+        # A head that reached the bomb ended the game, so the cell is still the bomb's
+        self.bombs.remove(bomb)
+        self.bombs_expired.append(bomb)
+        self.grid[self.index(bomb)] = EMPTY
+
+    def finish(self, winner, death_reason):
+        self.game_over = True
+        self.winner = winner
+        self.death_reason = death_reason
@@ -0,0 +1,74 @@
+import argparse
+import asyncio
+import time
+
+from snake_net import run_bot_client
+from snake_server import SnakeServer
+
+# Scripted loopback check of the server and the wire protocol: a server on a
+# free port, pairs of bot clients playing full matches against each other,
+# and for every match a check that both clients' mirrors ended where the
+# server's game did (winner, reason, tick, scores and bombs).
+
+TICK_RATE = 1000  # far faster than play; bots that fall behind just keep their direction
+TIMEOUT = 120
+
+
+def outcome(game):
+    return game.winner, game.death_reason, game.tick, list(game.scores), sorted(game.bombs)
+
+
+async def start_match(server, port):
+    """Connect two bot clients, the second only once the first waits, so they pair with each other."""
+    green = asyncio.create_task(run_bot_client("127.0.0.1", port))
+    while server.waiting is None:
+        await asyncio.sleep(0)
+    running = set(server.matches)
+    red = asyncio.create_task(run_bot_client("127.0.0.1", port))
+    while server.waiting is not None:
+        await asyncio.sleep(0)
+    (match,) = server.matches - running
+    return match, green, red
+
+
+async def finish_match(number, match, green, red):
+    mirrors = await asyncio.gather(green, red)
+    expected = outcome(match.game)
+    for mirror in mirrors:
+        if outcome(mirror) != expected:
+            raise RuntimeError(f"Match {number}: player {mirror.player} mirrored {outcome(mirror)}, "
+                               f"the server had {expected}")
+    return expected
+
+
+async def check(matches, concurrent, seed):
+    server = SnakeServer(tick_rate=TICK_RATE, seed=seed, replay_dir="")
+    listener = await server.start("127.0.0.1", 0)
+    port = listener.sockets[0].getsockname()[1]
+    results = []
+    try:
+        for first in range(0, matches, concurrent):
+            batch = [finish_match(number, *await start_match(server, port))
+                     for number in range(first, min(matches, first + concurrent))]
+            results += await asyncio.wait_for(asyncio.gather(*batch), TIMEOUT)
+    finally:
+        server.ticker.cancel()
+        listener.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot matches through a loopback server and check the mirrors.")
+    parser.add_argument("--matches", type=int, default=8)
+    parser.add_argument("--concurrent", type=int, default=4, help="matches running at once")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first match; match i uses seed + i")
+    args = parser.parse_args()
+    started = time.perf_counter()
+    results = asyncio.run(check(args.matches, args.concurrent, args.seed))
+    for winner, reason, ticks, scores, bombs in results:
+        print(f"  {winner:<5} {reason:<22} {ticks:>6} ticks  scores {scores[0]}-{scores[1]}  {len(bombs)} bombs")
+    print(f"{len(results)} matches, every mirror matched the server ({time.perf_counter() - started:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,221 @@
+import asyncio
+import struct
+from collections import deque
+
+from snake_game import (
+    DIRECTIONS, EMPTY, BOMB, BODY_CELLS, GREEN_PLAYER, RED_PLAYER, RIGHT, LEFT,
+)
+from snake_bot import SnakeBot
+
+# Wire protocol shared by snake_server.py and its clients. The server sends
+# the full state once (START) and then one compact delta per tick: the two
+# new heads, which tails were removed and any fruit or bomb changes.
+
+DEFAULT_PORT = 7777
+
+MSG_DIRECTION = 0x44  # "D" client -> server, followed by a direction code
+MSG_START = 0x53      # "S" server -> client, full state
+MSG_TICK = 0x54       # "T" server -> client, per-tick delta
+MSG_OVER = 0x4F       # "O" server -> client, result
+
+# Tick flags
+GREEN_TAIL_REMOVED = 0x01
+RED_TAIL_REMOVED = 0x02
+FRUIT_MOVED = 0x04
+BOMB_ADDED = 0x08      # followed by a count and the new bombs
+BOMB_EXPIRED = 0x10    # followed by a count and the bombs that burned out
+TAIL_FLAGS = (GREEN_TAIL_REMOVED, RED_TAIL_REMOVED)
+
+WINNER_CODES = {"GREEN": 0, "RED": 1, "Draw": 2}
+WINNERS = {code: name for name, code in WINNER_CODES.items()}
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+POINT = struct.Struct("<HH")
+COUNT = struct.Struct("<H")
+START_HEADER = struct.Struct("<BBH")   # type, player, grid size
+TICK_HEADER = struct.Struct("<BB4H")   # type, flags, green head, red head
+OVER_HEADER = struct.Struct("<BBB")    # type, winner, reason length
+
+
+def encode_direction(direction):
+    return bytes((MSG_DIRECTION, DIRECTION_CODES[direction]))
+
+
+def encode_start(game, player):
+    parts = [START_HEADER.pack(MSG_START, player, game.grid_size)]
+    for snake in game.snakes:
+        parts.append(COUNT.pack(len(snake)))
+        parts.extend(POINT.pack(*segment) for segment in snake)
+    parts.append(POINT.pack(*game.fruit))
+    parts.append(COUNT.pack(len(game.bombs)))
+    parts.extend(POINT.pack(*bomb) for bomb in game.bombs)
+    return b"".join(parts)
+
+
+def encode_points(points):
+    return COUNT.pack(len(points)) + b"".join(POINT.pack(*point) for point in points)
+
+
+def encode_tick(game, eaten, fruit_moved):
+    """Delta for the step just taken; bomb changes come from game.bombs_added/bombs_expired."""
+    flags = 0
+    for player in (GREEN_PLAYER, RED_PLAYER):
+        if player not in eaten:
+            flags |= TAIL_FLAGS[player]
+    if fruit_moved:
+        flags |= FRUIT_MOVED
+    if game.bombs_added:
+        flags |= BOMB_ADDED
+    if game.bombs_expired:
+        flags |= BOMB_EXPIRED
+    (x1, y1), (x2, y2) = game.snakes[GREEN_PLAYER][0], game.snakes[RED_PLAYER][0]
+    data = TICK_HEADER.pack(MSG_TICK, flags, x1 & 0xFFFF, y1 & 0xFFFF, x2 & 0xFFFF, y2 & 0xFFFF)
+    if fruit_moved:
+        data += POINT.pack(*game.fruit)
+    if game.bombs_added:
+        data += encode_points(game.bombs_added)
+    if game.bombs_expired:
+        data += encode_points(game.bombs_expired)
+    return data
+
+
+def encode_over(winner, death_reason):
+    reason = death_reason.encode()[:255]
+    return OVER_HEADER.pack(MSG_OVER, WINNER_CODES[winner], len(reason)) + reason
+
+
+def signed(value):
+    # Heads that left the board are sent as wrapped 16-bit values
+    return value - 0x10000 if value >= 0x8000 else value
+
+
+class GameMirror:
+    """Client-side copy of a match, rebuilt from START and kept in sync by deltas.
+
+    Exposes the same fields SnakeBot reads from SnakeGame.
+    """
+
+    def __init__(self, player, grid_size):
+        self.player = player
+        self.grid_size = grid_size
+        self.grid = bytearray(grid_size * grid_size)
+        self.snakes = [deque(), deque()]
+        self.directions = [RIGHT, LEFT]
+        self.scores = [0, 0]
+        self.bombs = {}
+        self.fruit = (0, 0)
+        self.tick = 0
+        self.game_over = False
+        self.winner = None
+        self.death_reason = ""
+
+    def index(self, position):
+        return position[1] * self.grid_size + position[0]
+
+    def in_bounds(self, position):
+        return 0 <= position[0] < self.grid_size and 0 <= position[1] < self.grid_size
+
+    def nearest_fruit(self, position):
+        return self.fruit  # networked matches have a single fruit
+
+    def apply_tick(self, flags, heads, fruit, added, expired):
+        self.tick += 1
+        # Bombs change first, then tails leave before heads land, as in SnakeGame.step
+        for bomb in expired:
+            del self.bombs[bomb]
+            self.grid[self.index(bomb)] = EMPTY
+        for bomb in added:
+            self.bombs[bomb] = None
+            self.grid[self.index(bomb)] = BOMB
+        for player, snake in enumerate(self.snakes):
+            if flags & TAIL_FLAGS[player]:
+                self.grid[self.index(snake.pop())] = EMPTY
+            else:
+                self.scores[player] += 1
+        for player, head in enumerate(heads):
+            old_x, old_y = self.snakes[player][0]
+            self.directions[player] = (head[0] - old_x, head[1] - old_y)
+            self.snakes[player].appendleft(head)
+            if self.in_bounds(head) and self.grid[self.index(head)] == EMPTY:
+                self.grid[self.index(head)] = BODY_CELLS[player]
+        if fruit is not None:
+            self.fruit = fruit
+
+
+class NetClient:
+    def __init__(self, reader, writer, game):
+        self.reader = reader
+        self.writer = writer
+        self.game = game
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=DEFAULT_PORT):
+        """Connect and wait until the server has paired us into a match."""
+        reader, writer = await asyncio.open_connection(host, port)
+        _, player, grid_size = START_HEADER.unpack(await reader.readexactly(START_HEADER.size))
+        game = GameMirror(player, grid_size)
+        for snake_player, snake in enumerate(game.snakes):
+            (count,) = COUNT.unpack(await reader.readexactly(COUNT.size))
+            for _ in range(count):
+                segment = POINT.unpack(await reader.readexactly(POINT.size))
+                snake.append(segment)
+                game.grid[game.index(segment)] = BODY_CELLS[snake_player]
+        game.fruit = POINT.unpack(await reader.readexactly(POINT.size))
+        (count,) = COUNT.unpack(await reader.readexactly(COUNT.size))
+        for _ in range(count):
+            bomb = POINT.unpack(await reader.readexactly(POINT.size))
+            game.bombs[bomb] = None
+            game.grid[game.index(bomb)] = BOMB
+        return cls(reader, writer, game)
+
+    async def receive_points(self):
+        (count,) = COUNT.unpack(await self.reader.readexactly(COUNT.size))
+        data = await self.reader.readexactly(count * POINT.size)
+        return [POINT.unpack_from(data, i * POINT.size) for i in range(count)]
+
+    def send_direction(self, direction):
+        self.writer.write(encode_direction(direction))
+
+    async def receive(self):
+        """Read and apply one server message. Returns False once the match is over."""
+        msg_type = (await self.reader.readexactly(1))[0]
+        if msg_type == MSG_TICK:
+            rest = await self.reader.readexactly(TICK_HEADER.size - 1)
+            _, flags, x1, y1, x2, y2 = TICK_HEADER.unpack(bytes((msg_type,)) + rest)
+            fruit = None
+            added = expired = ()
+            if flags & FRUIT_MOVED:
+                fruit = POINT.unpack(await self.reader.readexactly(POINT.size))
+            if flags & BOMB_ADDED:
+                added = await self.receive_points()
+            if flags & BOMB_EXPIRED:
+                expired = await self.receive_points()
+            heads = ((signed(x1), signed(y1)), (signed(x2), signed(y2)))
+            self.game.apply_tick(flags, heads, fruit, added, expired)
+            return True
+        if msg_type == MSG_OVER:
+            winner, length = await self.reader.readexactly(OVER_HEADER.size - 1)
+            self.game.game_over = True
+            self.game.winner = WINNERS[winner]
+            self.game.death_reason = (await self.reader.readexactly(length)).decode()
+            return False
+        raise ValueError(f"Unknown message type {msg_type:#x}")
+
+    async def receive_forever(self):
+        while await self.receive():
+            pass
+
+    def close(self):
+        self.writer.close()
+
+
+async def run_bot_client(host="127.0.0.1", port=DEFAULT_PORT, params=None):
+    """Scripted client: a SnakeBot answers every tick. Returns the final mirror."""
+    client = await NetClient.connect(host, port)
+    bot = SnakeBot(client.game.player, params)
+    try:
+        while await client.receive():
+            client.send_direction(bot.choose(client.game))
+    finally:
+        client.close()
+    return client.game
@@ -0,0 +1,257 @@
+import argparse
+import os
+import random
+import struct
+import time
+import zlib
+from collections import deque
+
+from snake_game import SnakeGame, DIRECTIONS, BOMB, BODY_CELLS, PLAYER_NAMES, SPAWN_BOMB, EXPIRE_BOMB
+from snake_spatial import SpatialIndex
+from snake_timers import TimerWheel
+
+# Match replays. A replay is the game's settings and RNG seed, the direction
+# each snake moved on every tick (one byte per tick) and a full keyframe of
+# the game every KEYFRAME_TICKS. seek(tick) restores the last keyframe at or
+# before tick and steps the game forward headlessly with the recorded
+# directions, so any tick of a long match is at most KEYFRAME_TICKS steps
+# away. Nothing in here may import pygame.
+#
+#   file      MAGIC, then everything below zlib-compressed
+#   header    settings, tick count, keyframe count, winner, reason
+#   ticks     one byte per tick: GREEN's direction code | RED's << 2
+#   keyframes tick and length of each, then the keyframes themselves
+
+MAGIC = b"SNR1"
+KEYFRAME_TICKS = 300  # 30 seconds of play
+REPLAY_SUFFIX = ".snr"
+REPLAY_DIR = "replays"
+
+NO_FUSE = 0
+NO_WINNER = 0xFF
+WINNER_CODES = {"GREEN": 0, "RED": 1, "Draw": 2}
+WINNERS = {code: name for name, code in WINNER_CODES.items()}
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+EVENT_KINDS = (SPAWN_BOMB, EXPIRE_BOMB)
+NO_POINT = (0xFFFF, 0xFFFF)
+
+HEADER = struct.Struct("<HQHHHHII")   # grid size, seed, bomb spawn, bomb fuse, fruit, keyframe interval,
+                                      # ticks, keyframes
+OUTCOME = struct.Struct("<BB")        # winner, reason length
+KEYFRAME_ENTRY = struct.Struct("<II")  # tick, length
+STATE = struct.Struct("<IBII")        # tick, directions, scores
+COUNT = struct.Struct("<I")
+POINT = struct.Struct("<HH")
+EVENT = struct.Struct("<IBHH")        # due tick, kind, point (NO_POINT if none)
+RNG_STATE = struct.Struct("<625I")    # random.Random's Mersenne Twister state and position
+
+
+def encode_directions(game):
+    return DIRECTION_CODES[game.directions[0]] | DIRECTION_CODES[game.directions[1]] << 2
+
+
+def encode_points(points):
+    points = list(points)
+    return COUNT.pack(len(points)) + b"".join(POINT.pack(*point) for point in points)
+
+
+def decode_points(data, offset):
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    points = [POINT.unpack_from(data, offset + i * POINT.size) for i in range(count)]
+    return points, offset + count * POINT.size
+
+
+def encode_keyframe(game):
+    """Everything SnakeGame.step reads, for a game that is still running."""
+    parts = [STATE.pack(game.tick, encode_directions(game), *game.scores)]
+    parts.extend(encode_points(snake) for snake in game.snakes)
+    parts.append(encode_points(game.fruits))
+    parts.append(encode_points(game.bombs))
+    events = game.timers.pending()
+    parts.append(COUNT.pack(len(events)))
+    for due, (kind, point) in events:
+        parts.append(EVENT.pack(due, EVENT_KINDS.index(kind), *(point or NO_POINT)))
+    parts.append(RNG_STATE.pack(*game.rng.getstate()[1]))
+    return b"".join(parts)
+
+
+def decode_keyframe(game, data):
+    """Put game (built with the replay's settings) into the state of a keyframe."""
+    game.tick, directions, *scores = STATE.unpack_from(data, 0)
+    game.scores = scores
+    game.directions = [DIRECTIONS[directions & 3], DIRECTIONS[directions >> 2]]
+    game.queued_turns = [deque(), deque()]
+    offset = STATE.size
+
+    game.grid = bytearray(game.grid_size * game.grid_size)
+    game.snakes = []
+    for player in range(2):
+        snake, offset = decode_points(data, offset)
+        game.snakes.append(deque(snake))
+        for segment in snake:
+            game.grid[game.index(segment)] = BODY_CELLS[player]
+    fruits, offset = decode_points(data, offset)
+    bombs, offset = decode_points(data, offset)
+    game.fruits = SpatialIndex(game.grid_size)
+    game.bombs = SpatialIndex(game.grid_size)
+    for fruit in fruits:
+        game.fruits.add(fruit)
+    for bomb in bombs:
+        game.bombs.add(bomb)
+        game.grid[game.index(bomb)] = BOMB
+
+    # Rescheduled in their original order, so events due together still fire in it
+    (count,) = COUNT.unpack_from(data, offset)
+    offset += COUNT.size
+    game.timers = TimerWheel()
+    game.timers.now = game.tick
+    for i in range(count):
+        due, kind, x, y = EVENT.unpack_from(data, offset + i * EVENT.size)
+        game.timers.schedule(due - game.tick, (EVENT_KINDS[kind], None if (x, y) == NO_POINT else (x, y)))
+    offset += count * EVENT.size
+    game.rng.setstate((3, RNG_STATE.unpack_from(data, offset), None))
+    game.bombs_added = []
+    game.bombs_expired = []
+    game.game_over = False
+    game.winner = None
+    game.death_reason = ""
+
+
+class ReplayRecorder:
+    """Records a match as it is played: call record() after every step()."""
+
+    def __init__(self, game, seed, keyframe_ticks=KEYFRAME_TICKS):
+        self.game = game
+        self.settings = (game.grid_size, seed, game.bomb_spawn_ticks,
+                         NO_FUSE if game.bomb_fuse_ticks is None else game.bomb_fuse_ticks,
+                         len(game.fruits), keyframe_ticks)
+        self.keyframe_ticks = keyframe_ticks
+        self.ticks = bytearray()
+        self.keyframes = []  # (tick, data)
+
+    def record(self):
+        game = self.game
+        self.ticks.append(encode_directions(game))
+        if game.tick % self.keyframe_ticks == 0 and not game.game_over:
+            self.keyframes.append((game.tick, encode_keyframe(game)))
+
+    def to_bytes(self):
+        game = self.game
+        reason = game.death_reason.encode()[:255]
+        parts = [HEADER.pack(*self.settings, len(self.ticks), len(self.keyframes)),
+                 OUTCOME.pack(WINNER_CODES.get(game.winner, NO_WINNER), len(reason)), reason,
+                 bytes(self.ticks)]
+        parts.extend(KEYFRAME_ENTRY.pack(tick, len(data)) for tick, data in self.keyframes)
+        parts.extend(data for _, data in self.keyframes)
+        return MAGIC + zlib.compress(b"".join(parts))
+
+    def save(self, directory):
+        """Write the replay into directory under a time-and-seed name; returns its path."""
+        os.makedirs(directory, exist_ok=True)
+        name = f"{time.strftime('%Y%m%d-%H%M%S')}-{self.settings[1]}{REPLAY_SUFFIX}"
+        path = os.path.join(directory, name)
+        with open(path, "wb") as f:
+            f.write(self.to_bytes())
+        return path
+
+
+def new_recorded_game(seed=None, keyframe_ticks=KEYFRAME_TICKS, **settings):
+    """SnakeGame plus its ReplayRecorder; a seed is drawn if none is given."""
+    if seed is None:
+        seed = random.randrange(1 << 32)
+    game = SnakeGame(seed=seed, **settings)
+    return game, ReplayRecorder(game, seed, keyframe_ticks)
+
+
+class Replay:
+    def __init__(self, data):
+        if data[:len(MAGIC)] != MAGIC:
+            raise ValueError("not a 2pSnake replay")
+        data = zlib.decompress(data[len(MAGIC):])
+        (self.grid_size, self.seed, self.bomb_spawn_ticks, fuse, self.fruit_count,
+         self.keyframe_ticks, self.ticks, keyframes) = HEADER.unpack_from(data, 0)
+        self.bomb_fuse_ticks = None if fuse == NO_FUSE else fuse
+        offset = HEADER.size
+        winner, length = OUTCOME.unpack_from(data, offset)
+        offset += OUTCOME.size
+        self.winner = WINNERS.get(winner)
+        self.death_reason = data[offset:offset + length].decode()
+        offset += length
+        self.directions = data[offset:offset + self.ticks]
+        offset += self.ticks
+
+        self.keyframes = []  # (tick, data), in tick order
+        entries = [KEYFRAME_ENTRY.unpack_from(data, offset + i * KEYFRAME_ENTRY.size) for i in range(keyframes)]
+        offset += keyframes * KEYFRAME_ENTRY.size
+        for tick, length in entries:
+            self.keyframes.append((tick, data[offset:offset + length]))
+            offset += length
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            return cls(f.read())
+
+    def new_game(self):
+        return SnakeGame(self.grid_size, self.seed, self.bomb_spawn_ticks, self.bomb_fuse_ticks, self.fruit_count)
+
+    def seek(self, tick, game=None):
+        """The match as it was after tick (0: before the first step).
+
+        Pass the game returned by an earlier seek to step it forward instead
+        of restoring a keyframe when that is shorter.
+        """
+        tick = max(0, min(tick, self.ticks))
+        index = tick // self.keyframe_ticks - 1
+        if index >= len(self.keyframes):
+            index = len(self.keyframes) - 1
+        start = self.keyframes[index][0] if index >= 0 else 0
+        if game is None or not start <= game.tick <= tick or game.game_over:
+            game = self.new_game()
+            if index >= 0:
+                decode_keyframe(game, self.keyframes[index][1])
+        while game.tick < tick:
+            code = self.directions[game.tick]
+            game.directions = [DIRECTIONS[code & 3], DIRECTIONS[code >> 2]]
+            game.step()
+        return game
+
+
+def describe(game):
+    """Text board and state of game, for reviewing a tick without a window."""
+    symbols = {0: ".", BODY_CELLS[0]: "g", BODY_CELLS[1]: "r", BOMB: "*"}
+    rows = [[symbols[game.grid[y * game.grid_size + x]] for x in range(game.grid_size)]
+            for y in range(game.grid_size)]
+    for fruit in game.fruits:
+        rows[fruit[1]][fruit[0]] = "o"
+    for player, snake in enumerate(game.snakes):
+        if game.in_bounds(snake[0]):
+            rows[snake[0][1]][snake[0][0]] = "GR"[player]
+    lines = [f"tick {game.tick}  scores GREEN {game.scores[0]} RED {game.scores[1]}"]
+    for player, name in enumerate(PLAYER_NAMES):
+        lines.append(f"  {name:<5} head {game.snakes[player][0]} moving {game.directions[player]} "
+                     f"length {len(game.snakes[player])}")
+    if game.game_over:
+        lines.append(f"  over: {game.winner} ({game.death_reason})")
+    lines.extend("".join(row) for row in rows)
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Inspect a 2pSnake replay at any tick.")
+    parser.add_argument("replay")
+    parser.add_argument("--tick", type=int, help="tick to show (default: the last one)")
+    args = parser.parse_args()
+
+    replay = Replay.load(args.replay)
+    print(f"{replay.ticks} ticks on a {replay.grid_size}x{replay.grid_size} board, seed {replay.seed}, "
+          f"{len(replay.keyframes)} keyframes; {replay.winner} ({replay.death_reason})")
+    started = time.perf_counter()
+    game = replay.seek(replay.ticks if args.tick is None else args.tick)
+    print(f"seek took {1000 * (time.perf_counter() - started):.1f} ms")
+    print(describe(game))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import argparse
+import asyncio
+
+from snake_game import GRID_SIZE, FPS, DIRECTIONS, PLAYER_NAMES, GREEN_PLAYER, RED_PLAYER
+from snake_net import DEFAULT_PORT, MSG_DIRECTION, encode_start, encode_tick, encode_over
+from snake_replay import new_recorded_game, REPLAY_DIR
+
+# Authoritative 2pSnake server. One asyncio task reads each connection, and a
+# single fixed-rate ticker steps every running match, so thousands of matches
+# share one timer instead of one sleep per match. Once a client is in a match
+# the ticker owns its connection and closes it after sending OVER, so a
+# handler that stops reading never cuts the result off.
+
+MAX_WRITE_BUFFER = 64 * 1024  # drop clients that stop reading
+
+
+class Match:
+    def __init__(self, writers, grid_size=GRID_SIZE, seed=None, replay_dir=REPLAY_DIR):
+        self.game, self.recorder = new_recorded_game(seed, grid_size=grid_size)
+        self.replay_dir = replay_dir
+        self.writers = writers
+        for player, writer in enumerate(writers):
+            writer.write(encode_start(self.game, player))
+
+    def broadcast(self, data):
+        for writer in self.writers:
+            if not writer.is_closing():
+                writer.write(data)
+
+    def step(self):
+        game = self.game
+        if not game.game_over:
+            fruit = game.fruit
+            eaten = game.step()
+            self.recorder.record()
+            self.broadcast(encode_tick(game, eaten, game.fruit != fruit))
+            for player, writer in enumerate(self.writers):
+                if writer.is_closing() or writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                    self.forfeit(player)
+        if game.game_over:
+            self.broadcast(encode_over(game.winner, game.death_reason))
+            for writer in self.writers:
+                if writer.transport.get_write_buffer_size() > MAX_WRITE_BUFFER:
+                    writer.transport.abort()  # it stopped reading; don't wait to flush
+                else:
+                    writer.close()
+            if self.replay_dir:
+                self.recorder.save(self.replay_dir)
+
+    def forfeit(self, player):
+        if not self.game.game_over:
+            self.game.finish(PLAYER_NAMES[1 - player], f"{PLAYER_NAMES[player]} disconnected")
+
+
+class SnakeServer:
+    def __init__(self, tick_rate=FPS, grid_size=GRID_SIZE, seed=None, replay_dir=REPLAY_DIR):
+        self.tick_rate = tick_rate
+        self.grid_size = grid_size
+        self.seed = seed
+        self.replay_dir = replay_dir
+        self.matches = set()
+        self.waiting = None  # (reader, writer, future) of the client waiting for an opponent
+        self.matches_played = 0
+
+    async def handle_client(self, reader, writer):
+        seat = asyncio.get_running_loop().create_future()
+        if self.waiting is None or self.waiting[0].at_eof() or self.waiting[1].is_closing():
+            self.waiting = (reader, writer, seat)
+        else:
+            _, other_writer, other_seat = self.waiting
+            self.waiting = None
+            seed = None if self.seed is None else self.seed + self.matches_played
+            match = Match([other_writer, writer], self.grid_size, seed, self.replay_dir)
+            self.matches_played += 1
+            self.matches.add(match)
+            other_seat.set_result((match, GREEN_PLAYER))
+            seat.set_result((match, RED_PLAYER))
+
+        # Read while waiting too, so a client that hangs up leaves the queue
+        # instead of being paired; anything it sends before START is dropped
+        read = asyncio.ensure_future(reader.readexactly(2))
+        try:
+            while not seat.done():
+                await asyncio.wait((seat, read), return_when=asyncio.FIRST_COMPLETED)
+                if read.done() and not seat.done():
+                    read.result()
+                    read = asyncio.ensure_future(reader.readexactly(2))
+            match, player = seat.result()
+            message = await read
+            while not match.game.game_over:
+                msg_type, code = message
+                if msg_type == MSG_DIRECTION and code < len(DIRECTIONS):
+                    match.game.turn(player, DIRECTIONS[code])
+                message = await reader.readexactly(2)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            if seat.done():
+                match, player = seat.result()
+                match.forfeit(player)
+        finally:
+            read.cancel()
+            if self.waiting is not None and self.waiting[1] is writer:
+                self.waiting = None
+            if not seat.done():
+                # Never paired, so no match will close it
+                seat.cancel()
+                writer.close()
+
+    def step(self):
+        for match in list(self.matches):
+            match.step()
+            if match.game.game_over:
+                self.matches.discard(match)
+
+    async def run_ticks(self):
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.tick_rate
+        next_tick = loop.time()
+        while True:
+            next_tick += interval
+            self.step()
+            delay = next_tick - loop.time()
+            if delay < -interval:
+                next_tick = loop.time()  # fell behind: skip ahead instead of bursting
+            await asyncio.sleep(max(0, delay))
+
+    async def start(self, host="127.0.0.1", port=DEFAULT_PORT):
+        """Listen and start ticking; port 0 picks a free loopback port for scripted tests."""
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        self.ticker = asyncio.create_task(self.run_ticks())
+        return self.server
+
+    async def serve(self, host="127.0.0.1", port=DEFAULT_PORT):
+        server = await self.start(host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Authoritative server for networked 2pSnake.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--tick-rate", type=float, default=FPS)
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument("--seed", type=int, default=None, help="seed of the first match; match i uses seed + i")
+    parser.add_argument("--replays", default=REPLAY_DIR, help="directory replays are saved to ('' to not save)")
+    args = parser.parse_args()
+    try:
+        asyncio.run(SnakeServer(args.tick_rate, args.grid_size, args.seed, args.replays).serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+# Board items (fruit, bombs) bucketed by position. Nothing in here may
+# import pygame.
+#
+# The board is cut into square buckets of BUCKET_SIZE cells, each holding
+# the set of item positions inside it, so adding or removing an item is O(1).
+# nearest() walks rings of buckets outwards from the query cell and stops as
+# soon as no unvisited bucket can hold anything closer, and within() only
+# visits the buckets its square overlaps; both cost about the number of items
+# near the query, not the number on the board. Distances are Manhattan, the
+# number of moves a snake needs.
+
+BUCKET_SIZE = 8
+
+
+def distance(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+class SpatialIndex:
+    def __init__(self, grid_size, bucket_size=BUCKET_SIZE):
+        self.grid_size = grid_size
+        self.bucket_size = bucket_size
+        self.buckets_across = -(-grid_size // bucket_size)
+        self.buckets = [set() for _ in range(self.buckets_across * self.buckets_across)]
+        self.items = {}  # position -> None, in insertion order
+
+    def bucket(self, position):
+        return self.buckets[(position[1] // self.bucket_size) * self.buckets_across + position[0] // self.bucket_size]
+
+    def add(self, position):
+        if position not in self.items:
+            self.items[position] = None
+            self.bucket(position).add(position)
+
+    def remove(self, position):
+        del self.items[position]
+        self.bucket(position).discard(position)
+
+    def __contains__(self, position):
+        return position in self.items
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+    def nearest(self, position, k=1):
+        """Up to k items closest to position, nearest first (ties broken by position)."""
+        if not self.items:
+            return []
+        size, across = self.bucket_size, self.buckets_across
+        center_x, center_y = position[0] // size, position[1] // size
+        last = max(abs(center_x), abs(across - 1 - center_x), abs(center_y), abs(across - 1 - center_y))
+        found = []
+        ring = 0
+        while ring <= last:
+            for bx, by in self.ring(center_x, center_y, ring):
+                found.extend((distance(position, item), item) for item in self.buckets[by * across + bx])
+            ring += 1
+            # Anything in ring r is at least (r - 1) * size + 1 moves away
+            if len(found) >= k:
+                found.sort()
+                if found[k - 1][0] <= (ring - 1) * size:
+                    break
+        found.sort()
+        return [item for _, item in found[:k]]
+
+    def ring(self, center_x, center_y, ring):
+        """Buckets at Chebyshev distance ring from (center_x, center_y) that are on the board."""
+        across = self.buckets_across
+        low_y, high_y = max(0, center_y - ring), min(across - 1, center_y + ring)
+        for by in range(low_y, high_y + 1):
+            if abs(by - center_y) == ring:
+                xs = range(max(0, center_x - ring), min(across - 1, center_x + ring) + 1)
+            else:
+                xs = [bx for bx in (center_x - ring, center_x + ring) if 0 <= bx < across]
+            for bx in xs:
+                yield bx, by
+
+    def within(self, position, radius):
+        """Every item at most radius moves from position."""
+        size, across = self.bucket_size, self.buckets_across
+        x, y = position
+        low_x, high_x = max(0, (x - radius) // size), min(across - 1, (x + radius) // size)
+        low_y, high_y = max(0, (y - radius) // size), min(across - 1, (y + radius) // size)
+        return [
+            item
+            for by in range(low_y, high_y + 1)
+            for bx in range(low_x, high_x + 1)
+            for item in self.buckets[by * across + bx]
+            if distance(position, item) <= radius
+        ]
@@ -0,0 +1,69 @@
+# Tick-based scheduling for SnakeGame. Nothing in here may import pygame.
+#
+# A hierarchical timing wheel: level 0 has one slot per tick for the next
+# SLOTS ticks, and each level above covers SLOTS times the span of the one
+# below. An event is filed in the lowest level whose span reaches its due
+# tick and is moved down a level each time the wheel below wraps, so
+# scheduling, cancelling and each tick's advance cost the same however many
+# events are pending or how far ahead they are.
+
+SLOT_BITS = 6
+SLOTS = 1 << SLOT_BITS
+LEVELS = 4        # 2**24 ticks ahead before an event waits in the overflow list
+
+
+class TimerWheel:
+    def __init__(self, levels=LEVELS):
+        self.levels = levels
+        self.wheels = [[[] for _ in range(SLOTS)] for _ in range(levels)]
+        self.overflow = []
+        self.now = 0
+        self.sequence = 0
+
+    def schedule(self, delay, event):
+        """File event to fire delay ticks from now (at least one); returns a handle for cancel()."""
+        entry = [self.now + max(1, delay), self.sequence, event]
+        self.sequence += 1
+        self.place(entry)
+        return entry
+
+    def cancel(self, handle):
+        handle[2] = None
+
+    def place(self, entry):
+        due = entry[0]
+        delta = due - self.now
+        for level in range(self.levels):
+            if delta < 1 << (SLOT_BITS * (level + 1)):
+                self.wheels[level][(due >> (SLOT_BITS * level)) & (SLOTS - 1)].append(entry)
+                return
+        self.overflow.append(entry)
+
+    def advance(self):
+        """Move to the next tick and return the events due on it, in the order they were scheduled."""
+        self.now += 1
+        now = self.now
+        # Wheels that just wrapped hand their next slot down, highest first
+        top = 0
+        while top < self.levels and now & ((1 << (SLOT_BITS * (top + 1))) - 1) == 0:
+            top += 1
+        if top == self.levels:
+            waiting, self.overflow = self.overflow, []
+            for entry in waiting:
+                self.place(entry)
+        for level in range(min(top, self.levels - 1), 0, -1):
+            slot = (now >> (SLOT_BITS * level)) & (SLOTS - 1)
+            entries, self.wheels[level][slot] = self.wheels[level][slot], []
+            for entry in entries:
+                self.place(entry)
+
+        due, self.wheels[0][now & (SLOTS - 1)] = self.wheels[0][now & (SLOTS - 1)], []
+        if len(due) > 1:
+            due.sort(key=lambda entry: entry[1])
+        return [entry[2] for entry in due if entry[2] is not None]
+
+    def pending(self):
+        """(due tick, event) for everything still scheduled, in the order it was scheduled."""
+        entries = [entry for wheel in self.wheels for slot in wheel for entry in slot] + self.overflow
+        entries.sort(key=lambda entry: entry[1])
+        return [(entry[0], entry[2]) for entry in entries if entry[2] is not None]
@@ -0,0 +1,117 @@
+import argparse
+import multiprocessing
+import os
+import time
+from collections import Counter
+from dataclasses import fields
+
+from snake_game import GRID_SIZE, GREEN_PLAYER, RED_PLAYER
+from snake_bot import SnakeBot, BotParams
+from snake_replay import new_recorded_game
+
+# Bot-vs-bot self-play. Each worker plays a whole chunk of games and sends
+# back only counters, so the pool scales with cores instead of with IPC.
+
+MAX_TICKS = 5000
+CHUNK_SIZE = 32
+
+
+def play_game(seed, grid_size=GRID_SIZE, max_ticks=MAX_TICKS, green_params=None, red_params=None, fruit_count=1,
+              replay_dir=None):
+    game, recorder = new_recorded_game(seed, grid_size=grid_size, fruit_count=fruit_count)
+    bots = (SnakeBot(GREEN_PLAYER, green_params), SnakeBot(RED_PLAYER, red_params))
+    while not game.game_over and game.tick < max_ticks:
+        for bot in bots:
+            game.turn(bot.player, bot.choose(game))
+        game.step()
+        if replay_dir:
+            recorder.record()
+    if not game.game_over:
+        game.finish("Draw", "time limit")
+    if replay_dir:
+        recorder.save(replay_dir)
+    return game.winner, game.death_reason, game.tick
+
+
+def play_chunk(args):
+    seeds, grid_size, max_ticks, green_params, red_params, fruit_count, replay_dir = args
+    winners = Counter()
+    reasons = Counter()
+    ticks = 0
+    for seed in seeds:
+        winner, reason, length = play_game(seed, grid_size, max_ticks, green_params, red_params, fruit_count,
+                                           replay_dir)
+        winners[winner] += 1
+        reasons[reason] += 1
+        ticks += length
+    return winners, reasons, ticks, len(seeds)
+
+
+def run_tournament(games, workers=None, grid_size=GRID_SIZE, max_ticks=MAX_TICKS,
+                   first_seed=0, green_params=None, red_params=None, chunk_size=CHUNK_SIZE, fruit_count=1,
+                   replay_dir=None):
+    seeds = range(first_seed, first_seed + games)
+    jobs = [
+        (seeds[i:i + chunk_size], grid_size, max_ticks, green_params, red_params, fruit_count, replay_dir)
+        for i in range(0, games, chunk_size)
+    ]
+    winners = Counter()
+    reasons = Counter()
+    ticks = 0
+    played = 0
+    with multiprocessing.Pool(workers) as pool:
+        for chunk_winners, chunk_reasons, chunk_ticks, chunk_games in pool.imap_unordered(play_chunk, jobs):
+            winners.update(chunk_winners)
+            reasons.update(chunk_reasons)
+            ticks += chunk_ticks
+            played += chunk_games
+    return winners, reasons, ticks / max(1, played)
+
+
+def parse_params(text):
+    # "search_budget=2000,space_margin=1.5" -> BotParams
+    params = BotParams()
+    if not text:
+        return params
+    types = {f.name: f.type for f in fields(BotParams)}
+    for item in text.split(","):
+        key, value = item.split("=")
+        key = key.strip()
+        if key not in types:
+            raise ValueError(f"Unknown bot parameter: {key}")
+        setattr(params, key, float(value) if types[key] is float else int(value))
+    return params
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play bot-vs-bot 2pSnake games across a process pool.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--grid-size", type=int, default=GRID_SIZE)
+    parser.add_argument("--max-ticks", type=int, default=MAX_TICKS)
+    parser.add_argument("--fruits", type=int, default=1, help="fruit on the board at once")
+    parser.add_argument("--replays", metavar="DIR", help="save a replay of every game to DIR")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first game; game i uses seed + i")
+    parser.add_argument("--green", default="", help="GREEN bot parameters, e.g. search_budget=2000,space_margin=1.5")
+    parser.add_argument("--red", default="", help="RED bot parameters")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    winners, reasons, average_ticks = run_tournament(
+        args.games, args.workers, args.grid_size, args.max_ticks, args.seed,
+        parse_params(args.green), parse_params(args.red), fruit_count=args.fruits, replay_dir=args.replays,
+    )
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.games} games on a {args.grid_size}x{args.grid_size} board in {elapsed:.1f}s "
+          f"({args.workers} workers)")
+    for name in ("GREEN", "RED", "Draw"):
+        print(f"  {name:<6} {winners[name]:>7}  {100 * winners[name] / args.games:5.1f}%")
+    print(f"Average game length: {average_ticks:.1f} ticks")
+    print("Death reasons:")
+    for reason, count in reasons.most_common():
+        print(f"  {reason:<22} {count:>7}")
+
+
+if __name__ == "__main__":
+    main()
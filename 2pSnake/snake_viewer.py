@@ -0,0 +1,87 @@
+import argparse
+import sys
+
+import pygame
+
+from py_snake_bomb import (
+    screen, score_font, BLACK, GREEN, RED, WHITE, WINDOW_SIZE,
+    draw_snake, draw_fruit, draw_bomb, draw_score,
+)
+from snake_game import FPS, GREEN_PLAYER, RED_PLAYER
+from snake_replay import Replay
+
+# Replay viewer. Every frame shows replay.seek(tick), so any jump costs at
+# most one keyframe restore plus KEYFRAME_TICKS headless steps, and playing
+# forward just steps the game already shown.
+#   space  play / pause          left / right   one tick
+#   down / up  ten seconds       home / end     start / final tick
+
+RENDER_FPS = 60
+JUMP_TICKS = 10 * FPS
+
+KEY_STEPS = {pygame.K_LEFT: -1, pygame.K_RIGHT: 1, pygame.K_DOWN: -JUMP_TICKS, pygame.K_UP: JUMP_TICKS}
+
+
+def draw(game, replay, playing):
+    screen.fill(BLACK)
+    draw_snake(screen, game.snakes[GREEN_PLAYER], GREEN)
+    draw_snake(screen, game.snakes[RED_PLAYER], RED)
+    for fruit in game.fruits:
+        draw_fruit(screen, fruit)
+    for bomb in game.bombs:
+        draw_bomb(screen, bomb)
+    draw_score(screen, *game.scores)
+    status = f"tick {game.tick}/{replay.ticks}" + ("" if playing else "  (paused)")
+    if game.game_over:
+        status += f"  {game.winner}: {game.death_reason}"
+    surface = score_font.render(status, True, WHITE)
+    screen.blit(surface, (10, WINDOW_SIZE - surface.get_height() - 10))
+    pygame.display.flip()
+
+
+def view(replay, tick=0):
+    clock = pygame.time.Clock()
+    game = replay.seek(tick)
+    playing = False
+    elapsed = 0.0
+    while True:
+        target = game.tick
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key in (pygame.K_q, pygame.K_ESCAPE)):
+                return
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_SPACE:
+                    playing = not playing
+                    elapsed = 0.0
+                elif event.key in KEY_STEPS:
+                    target += KEY_STEPS[event.key]
+                elif event.key == pygame.K_HOME:
+                    target = 0
+                elif event.key == pygame.K_END:
+                    target = replay.ticks
+
+        elapsed += clock.tick(RENDER_FPS)
+        if playing:
+            target += int(elapsed * FPS / 1000)
+            elapsed %= 1000 / FPS
+            if target >= replay.ticks:
+                playing = False
+        if target != game.tick:
+            game = replay.seek(target, game)
+        draw(game, replay, playing)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Watch a 2pSnake replay.")
+    parser.add_argument("replay")
+    parser.add_argument("--tick", type=int, default=0, help="tick to open at")
+    args = parser.parse_args()
+    replay = Replay.load(args.replay)
+    pygame.display.set_caption(f"2pSnake replay - {replay.winner} ({replay.death_reason})")
+    view(replay, args.tick)
+    pygame.quit()
+    sys.exit()
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,7 @@ import pygame
 import math
 from enum import Enum, auto
 from dataclasses import dataclass, field
-from noise import pnoise1
+from core.perlin import pnoise1
 import random
 import tkinter as tk
 from tkinter import colorchooser
@@ -60,10 +60,7 @@ class Terrain:
         octaves = 4 + (scrambled % 6)                       # 4 to 9 octaves
 
         # Step 2: Collect raw noise values
-        tempTerrain = []
-        for x in range(WIDTH):
-            noise_val = pnoise1((x + offset) / self.scale + self.seed, octaves=octaves)
-            tempTerrain.append(noise_val)
+        tempTerrain = pnoise1([(x + offset) / self.scale + self.seed for x in range(WIDTH)], octaves=octaves).tolist()
 
         # Step 3: Normalize values to min_height → max_height
         min_val = min(tempTerrain)
@@ -0,0 +1,39 @@
+# build_assets.py
+#
+# Packs assets/ into one memory-mapped bundle (core/bundle.py):
+#   python3 build_assets.py
+#   python3 build_assets.py --frequency 48000 --channels 1
+# Sound effects are decoded and resampled here, once, to the mixer format
+# the game will then open. Rerun after changing anything under assets/.
+
+import os
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")   # decoding needs no sound device
+
+import argparse
+
+import pygame
+
+from core.bundle import BUNDLE_NAME, pack
+
+DEFAULT_ASSETS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pack TerraNuka assets into a bundle")
+    parser.add_argument("--assets", default=os.environ.get("TERRANUKA_ASSETS", DEFAULT_ASSETS))
+    parser.add_argument("--out", help=f"bundle path (default: <assets>/{BUNDLE_NAME})")
+    parser.add_argument("--frequency", type=int, default=44100)
+    parser.add_argument("--size", type=int, default=-16, help="sample size in bits, negative for signed")
+    parser.add_argument("--channels", type=int, default=2)
+    args = parser.parse_args()
+
+    pygame.mixer.init(args.frequency, args.size, args.channels)
+    out = args.out or os.path.join(args.assets, BUNDLE_NAME)
+    names = pack(args.assets, out)
+    print(f"{out}: {len(names)} assets at {pygame.mixer.get_init()}, {os.path.getsize(out)} bytes")
+    for name in names:
+        print(f"  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+# core/ai.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import math
+import random
+
+from .config import WIDTH, GRAVITY, bounds
+from .simulation import TurnInput, MAX_SHOT_FRAMES, apply_input, begin_turn, resolve_shot
+from .snapshot import fork
+
+# Computer player for headless matches. For a few angles it bisects the
+# power that lands on the nearest enemy, flying trial shots against the
+# terrain and that enemy only, then adds seeded aiming error so results stay reproducible.
+# With lookahead it plays the closest few of those shots out in forks of the
+# match (blasts, falls and napalm included) and keeps the one that does the
+# most damage to the enemies for the least to itself.
+
+ANGLE_STEP = 10
+POWER_ITERATIONS = 8
+
+
+def landing_x(terrain_heights, x: float, y: float, vx: float, vy: float, target=None) -> float:
+    """Where a shot leaving (x, y) comes down; same integration as ProjectileSystem.update.
+
+    Passing through the target tank counts as landing on its centre.
+    """
+    if target:
+        left, top = target.x, target.y
+        right, bottom = left + target.width, top + target.height
+    for _ in range(MAX_SHOT_FRAMES):
+        steps = int(max(abs(vx), abs(vy), 1))
+        step_x, step_y = vx / steps, vy / steps
+        for _ in range(steps):
+            x += step_x
+            y += step_y
+            if x < 0 or x >= WIDTH:
+                return x
+            if y < 0:
+                break  # above the screen the rest of the frame is skipped, as in the game
+            if y >= bounds.y2 - terrain_heights[int(x)]:
+                return x
+            if target and left <= x < right and top <= y < bottom:
+                return left + target.width / 2
+        vy += GRAVITY
+    return x
+
+
+def trial_shot(tank, terrain_heights, angle: float, power: float, target=None) -> float:
+    rad = math.radians(angle)
+    speed = power / 2.4
+    return landing_x(
+        terrain_heights,
+        tank.x + math.cos(rad) * tank.cannonLen,
+        tank.y - math.sin(rad) * tank.cannonLen,
+        speed * math.cos(rad),
+        -speed * math.sin(rad),
+        target,
+    )
+
+
+def shot_value(g, tank_index: int, turn_input: TurnInput, seed: int = 0) -> float:
+    """Damage turn_input does to the other tanks minus what it does to the shooter, played out in a fork."""
+    state = fork(g)
+    tank = state.tanks[tank_index]
+    apply_input(tank, turn_input, begin_turn(state.tanks, tank_index), state.terrain.heightMap)
+    health = [t.health for t in state.tanks]
+    resolve_shot(state, tank, seed)
+    damage = [before - t.health for before, t in zip(health, state.tanks)]
+    return sum(damage) - 2 * damage[tank_index]
+
+
+def choose_input(g, tank_index: int, rng: random.Random, angle_error: float = 1.0,
+                 power_error: float = 0.5, lookahead: int = 0, seed: int = 0) -> TurnInput:
+    """With lookahead > 0, that many of the closest trial shots are played out in
+    forks of g; seed is what the real shot will pass to resolve_shot."""
+    tank = g.tanks[tank_index]
+    heights = g.terrain.heightMap
+    enemies = [t for t in g.tanks if t.active and t is not tank]
+    target = min(enemies, key=lambda t: abs(t.x - tank.x))
+    target_x = target.x + target.width / 2
+    rightward = target_x >= tank.x
+
+    angles = range(15, 90, ANGLE_STEP) if rightward else range(165, 90, -ANGLE_STEP)
+    candidates = []  # closest (miss, angle, power) of each angle
+    for angle in angles:
+        low, high = 0.0, 100.0
+        best = None
+        for _ in range(POWER_ITERATIONS):
+            power = (low + high) / 2
+            x = trial_shot(tank, heights, angle, power, target)
+            miss = abs(x - target_x)
+            if best is None or miss < best[0]:
+                best = (miss, angle, power)
+            if (x > target_x) == rightward:
+                high = power
+            else:
+                low = power
+        candidates.append(best)
+
+    candidates.sort(key=lambda candidate: candidate[0])
+    _, angle, power = candidates[0]
+    if lookahead > 0:
+        _, angle, power = max(
+            candidates[:lookahead],
+            key=lambda c: shot_value(g, tank_index, TurnInput(angle=c[1], power=int(round(c[2] * 10))), seed),
+        )
+    angle = min(180, max(0, round(angle + rng.gauss(0, angle_error))))
+    power = min(100.0, max(0.0, power + rng.gauss(0, power_error)))
+    return TurnInput(angle=angle, power=int(round(power * 10)))
@@ -0,0 +1,77 @@
+# core/audio.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import os
+
+import pygame
+
+from .enums import Sound
+
+# Gameplay code never plays sounds; it emits Sound events on an AudioBus.
+# Once a frame mix() plays them: each sound at most once per frame, on a
+# fixed pool of mixer channels, never on more than its voice cap at a time.
+# When the pool is full a sound may take the channel of a lower-priority one,
+# so a firework show can't crowd out a tank exploding. A disabled bus
+# (headless runs) drops events as they are emitted. Sounds come from the
+# asset bundle (core.bundle) when there is one at the mixer's format, and are
+# decoded from their files otherwise.
+
+CHANNELS = 12
+
+# file, volume, voice cap, priority (higher wins a full pool)
+SOUNDS = {
+    Sound.TANK_EXPLOSION: ("tank_explosion.wav", 0.5, 2, 3),
+    Sound.EXPLOSION: ("explosion.wav", 0.8, 3, 2),
+    Sound.SHOT: ("shot.wav", 0.8, 2, 2),
+    Sound.FIREWORK: ("fireworks_explosion.wav", 0.8, 4, 1),
+}
+
+
+class AudioBus:
+    def __init__(self, asset_dir: str, enabled: bool = True, bundle=None):
+        self.enabled = enabled
+        self.pending = {}      # Sound -> None, in emit order
+        self.sounds = {}
+        self.channels = []
+        self.playing = []      # Sound last started on each channel
+        if not enabled:
+            return
+        if bundle is not None and bundle.mixer_format != pygame.mixer.get_init():
+            bundle = None       # the device wouldn't open at the bundle's format
+        for sound, (name, volume, _, _) in SOUNDS.items():
+            if bundle is not None and f"sounds/{name}" in bundle:
+                self.sounds[sound] = bundle.sound(f"sounds/{name}")
+            else:
+                self.sounds[sound] = pygame.mixer.Sound(os.path.join(asset_dir, "sounds", name))
+            self.sounds[sound].set_volume(volume)
+        pygame.mixer.set_num_channels(CHANNELS)
+        self.channels = [pygame.mixer.Channel(i) for i in range(CHANNELS)]
+        self.playing = [None] * CHANNELS
+
+    def emit(self, sound: Sound):
+        if self.enabled:
+            self.pending[sound] = None
+
+    def mix(self):
+        """Play this frame's events; call once per frame."""
+        if not self.pending:
+            return
+        busy = [channel.get_busy() for channel in self.channels]
+        for sound in self.pending:
+            _, _, voices, priority = SOUNDS[sound]
+            if sum(b and p is sound for b, p in zip(busy, self.playing)) >= voices:
+                continue
+            if False in busy:
+                i = busy.index(False)
+            else:
+                # Take the channel of the lowest-priority sound, if it is below this one
+                i = min(range(CHANNELS), key=lambda c: SOUNDS[self.playing[c]][3])
+                if SOUNDS[self.playing[i]][3] >= priority:
+                    continue
+            self.channels[i].play(self.sounds[sound])
+            self.playing[i] = sound
+            busy[i] = True
+        self.pending.clear()
@@ -0,0 +1,158 @@
+# core/bundle.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import io
+import mmap
+import os
+import struct
+
+import pygame
+
+# One packed file for every asset, built by build_assets.py. Sound effects
+# are stored as PCM already decoded and resampled to the mixer format named
+# in the header, so at startup a Sound is made straight from a slice of the
+# mapped file: no decoding, no resampling, no per-file open. Music stays
+# encoded and is streamed from the mapping. The file is opened read-only
+# with mmap, so every game running on a machine shares its pages.
+#
+#   header   MAGIC, frequency, sample size, channels, entry count
+#   index    per entry: kind, name length, name (utf-8), offset, length
+#   data     entries, each aligned to ALIGN bytes
+
+MAGIC = b"TNB1"
+BUNDLE_NAME = "assets.tnb"
+ALIGN = 64
+
+PCM, STREAM = 0, 1          # entry kinds
+PCM_SUFFIXES = (".wav", ".ogg")
+STREAM_SUFFIXES = (".mp3",)
+
+_HEADER = struct.Struct("<4sIhBxI")
+_ENTRY = struct.Struct("<BH")
+_SPAN = struct.Struct("<QQ")
+
+
+def _entries(asset_dir: str):
+    """(kind, name, path) for every packable asset under asset_dir, names '/'-separated."""
+    for root, dirs, files in os.walk(asset_dir):
+        dirs.sort()
+        for file in sorted(files):
+            suffix = os.path.splitext(file)[1].lower()
+            kind = PCM if suffix in PCM_SUFFIXES else STREAM if suffix in STREAM_SUFFIXES else None
+            if kind is not None:
+                path = os.path.join(root, file)
+                yield kind, os.path.relpath(path, asset_dir).replace(os.sep, "/"), path
+
+
+def pack(asset_dir: str, path: str) -> list[str]:
+    """Write the bundle for asset_dir to path and return the names packed.
+
+    PCM is decoded in the format the mixer was opened with, so open it
+    (pygame.mixer.init) with the format the game should run at first.
+    """
+    frequency, size, channels = pygame.mixer.get_init()
+    blobs = []
+    for kind, name, file in _entries(asset_dir):
+        if kind == PCM:
+            data = pygame.mixer.Sound(file).get_raw()
+        else:
+            with open(file, "rb") as f:
+                data = f.read()
+        blobs.append((kind, name.encode("utf-8"), data))
+
+    index_size = sum(_ENTRY.size + len(name) + _SPAN.size for _, name, _ in blobs)
+    offset = _HEADER.size + index_size
+    index, spans = [], []
+    for kind, name, data in blobs:
+        offset += -offset % ALIGN
+        index.append(_ENTRY.pack(kind, len(name)) + name + _SPAN.pack(offset, len(data)))
+        spans.append(offset)
+        offset += len(data)
+
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(MAGIC, frequency, size, channels, len(blobs)))
+        f.write(b"".join(index))
+        for start, (_, _, data) in zip(spans, blobs):
+            f.write(b"\0" * (start - f.tell()))
+            f.write(data)
+    os.replace(tmp, path)       # a running game keeps its mapping of the old file
+    return [name.decode("utf-8") for _, name, _ in blobs]
+
+
+class _Stream(io.RawIOBase):
+    """Read-only file object over one entry of the mapping (for pygame.mixer.music)."""
+
+    def __init__(self, view: memoryview):
+        self.view = view
+        self.pos = 0
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def readinto(self, buffer):
+        n = max(0, min(len(buffer), len(self.view) - self.pos))
+        buffer[:n] = self.view[self.pos:self.pos + n]
+        self.pos += n
+        return n
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        base = (0, self.pos, len(self.view))[whence]
+        self.pos = max(0, base + offset)
+        return self.pos
+
+    def tell(self):
+        return self.pos
+
+
+class Bundle:
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, frequency, size, channels, count = _HEADER.unpack_from(self.map, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a TerraNuka asset bundle")
+        self.mixer_format = (frequency, size, channels)
+        self.view = memoryview(self.map)
+        self.index = {}         # name -> (kind, offset, length)
+        pos = _HEADER.size
+        for _ in range(count):
+            kind, name_len = _ENTRY.unpack_from(self.map, pos)
+            pos += _ENTRY.size
+            name = bytes(self.map[pos:pos + name_len]).decode("utf-8")
+            pos += name_len
+            self.index[name] = (kind,) + _SPAN.unpack_from(self.map, pos)
+            pos += _SPAN.size
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def _slice(self, name: str, kind: int) -> memoryview:
+        entry_kind, offset, length = self.index[name]
+        if entry_kind != kind:
+            raise ValueError(f"{name} is not stored as {'PCM' if kind == PCM else 'a stream'}")
+        return self.view[offset:offset + length]
+
+    def sound(self, name: str) -> pygame.mixer.Sound:
+        """Sound from the stored PCM; the mixer must be open at mixer_format."""
+        if pygame.mixer.get_init() != self.mixer_format:
+            raise ValueError(f"bundle is {self.mixer_format}, mixer is {pygame.mixer.get_init()}")
+        return pygame.mixer.Sound(buffer=self._slice(name, PCM))
+
+    def stream(self, name: str) -> io.BufferedReader:
+        return io.BufferedReader(_Stream(self._slice(name, STREAM)))
+
+
+def open_bundle(asset_dir: str) -> Bundle | None:
+    """The bundle in asset_dir, or None if there isn't a usable one (assets load from files)."""
+    path = os.path.join(asset_dir, BUNDLE_NAME)
+    try:
+        return Bundle(path)
+    except (OSError, ValueError, struct.error):
+        return None
@@ -0,0 +1,132 @@
+# core/cli.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import argparse
+import json
+import os
+import random
+
+from .config import GameConfig
+from .lockstep import DEFAULT_PORT
+from .perlin import GENERATORS
+
+# Command line for main.py. Nothing here may import core.globals: --headless
+# has to set the environment before globals decides whether to open the mixer.
+# Any match option (or --config) skips the Tk menu and feeds load_game_config
+# a menuconfig built from the arguments.
+
+PLAYER_COLORS = [
+    (255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255),
+    (0, 255, 255), (136, 255, 0), (255, 136, 0), (0, 136, 255), (136, 136, 255),
+]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="TerraNuka")
+    parser.add_argument("--lockstep-host", type=int, metavar="PEERS",
+                        help="host a lockstep match for PEERS machines (including this one)")
+    parser.add_argument("--lockstep-join", metavar="ADDRESS", help="join the lockstep match hosted at ADDRESS")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+
+    match = parser.add_argument_group("match options (skip the setup menu)")
+    match.add_argument("--config", metavar="PATH", help="load a saved config profile (JSON)")
+    match.add_argument("--seed", type=int, help="terrain seed; random for every match if omitted")
+    match.add_argument("--players", type=int, choices=range(2, 11), metavar="2-10")
+    match.add_argument("--health", type=int)
+    match.add_argument("--fuel", type=float)
+    match.add_argument("--min-height", type=int)
+    match.add_argument("--max-height", type=int)
+    match.add_argument("--terrain-generator", type=int, choices=GENERATORS,
+                       help="1 (default) matches every existing seed; 2 is built for very wide worlds")
+
+    parser.add_argument("--save-config", metavar="PATH", help="save the settings of each match as a profile")
+    parser.add_argument("--headless", action="store_true",
+                        help="no window, sound or assets (smoke tests, kiosks without a display)")
+    parser.add_argument("--window", type=window_size, metavar="WxH",
+                        help="window size; the game is drawn at 1000x720 and scaled to it")
+    parser.add_argument("--frames", type=int, help="quit after this many frames")
+    parser.add_argument("--profile", metavar="PATH", help="write cProfile stats of the run to PATH")
+    return parser
+
+
+def window_size(text: str) -> tuple[int, int]:
+    try:
+        width, height = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WIDTHxHEIGHT, got {text!r}")
+    return width, height
+
+
+def uses_cli_config(args) -> bool:
+    return any(value is not None for value in (
+        args.config, args.seed, args.players, args.health, args.fuel, args.min_height, args.max_height,
+        args.terrain_generator,
+    ))
+
+
+def apply_headless(args):
+    if args.headless:
+        os.environ["TERRANUKA_HEADLESS"] = "1"
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+
+def load_profile(path: str) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_profile(path: str, menuconfig: dict):
+    with open(path, "w") as f:
+        json.dump(menuconfig, f, indent=2)
+
+
+def menuconfig_from_args(args) -> dict:
+    """The dict GameConfigUI.collect_config would produce, built from a profile and the flags."""
+    menuconfig = {
+        "players": [],
+        "terrain_seed": None,
+        "terrain_min_height": 10,
+        "terrain_max_height": 540,
+        "fuel": 0.5,
+        "health": 100,
+        "terrain_generator": 1,
+    }
+    if args.config:
+        menuconfig.update(load_profile(args.config))
+
+    player_count = args.players or len(menuconfig["players"]) or 2
+    players = list(menuconfig["players"][:player_count])
+    for i in range(len(players), player_count):
+        players.append({"name": f"Player {i + 1}", "color": PLAYER_COLORS[i % len(PLAYER_COLORS)]})
+    menuconfig["players"] = players
+
+    overrides = {
+        "terrain_seed": args.seed,
+        "terrain_min_height": args.min_height,
+        "terrain_max_height": args.max_height,
+        "terrain_generator": args.terrain_generator,
+        "fuel": args.fuel,
+        "health": args.health,
+    }
+    menuconfig.update({key: value for key, value in overrides.items() if value is not None})
+    if menuconfig["terrain_seed"] is None:
+        menuconfig["terrain_seed"] = random.randint(0, 100000)
+    return menuconfig
+
+
+def game_config(menuconfig: dict) -> GameConfig:
+    """The GameConfig a menuconfig (from the menu, a profile, the flags or a lockstep host) describes."""
+    player_data = menuconfig["players"]
+    return GameConfig(
+        player_count=len(player_data),
+        player_colors=[tuple(player["color"]) for player in player_data],
+        terrain_bounds=(int(menuconfig["terrain_min_height"]), int(menuconfig["terrain_max_height"])),
+        terrain_seed=int(menuconfig["terrain_seed"]),
+        tank_health=float(menuconfig["health"]),
+        tank_fuel_start=float(menuconfig["fuel"]),
+        terrain_generator=int(menuconfig.get("terrain_generator", 1)),
+    )
@@ -0,0 +1,55 @@
+# core/columnar.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import json
+import os
+
+import numpy as np
+
+# Append-only column store: one raw little-endian file per column plus a
+# schema.json of NumPy dtypes. Rows can be streamed in batches as they are
+# produced and a column is read back with a single np.fromfile.
+
+SCHEMA_FILE = "schema.json"
+
+
+class ColumnWriter:
+    def __init__(self, directory: str, schema: dict[str, str]):
+        self.directory = directory
+        self.schema = schema
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, SCHEMA_FILE), "w") as f:
+            json.dump(schema, f, indent=2)
+        self.files = {name: open(os.path.join(directory, f"{name}.bin"), "wb") for name in schema}
+        self.rows = 0
+
+    def append(self, columns: dict[str, list]):
+        lengths = {len(columns[name]) for name in self.schema}
+        if len(lengths) != 1:
+            raise ValueError("All columns in a batch must have the same length")
+        for name, dtype in self.schema.items():
+            np.asarray(columns[name], dtype=dtype).tofile(self.files[name])
+            self.files[name].flush()
+        self.rows += lengths.pop()
+
+    def close(self):
+        for f in self.files.values():
+            f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def read_columns(directory: str) -> dict[str, np.ndarray]:
+    with open(os.path.join(directory, SCHEMA_FILE)) as f:
+        schema = json.load(f)
+    return {
+        name: np.fromfile(os.path.join(directory, f"{name}.bin"), dtype=dtype)
+        for name, dtype in schema.items()
+    }
@@ -32,3 +32,4 @@ class GameConfig:
     tank_health: float = 100
     tank_fuel_start: float = 0.5
     tank_strength: float = 15
+    terrain_generator: int = 1
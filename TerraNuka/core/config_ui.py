@@ -1,4 +1,4 @@
-# core/ui.py
+# core/config_ui.py
 
 
 if __name__ == "__main__":
@@ -7,10 +7,11 @@ if __name__ == "__main__":
 import tkinter as tk
 from tkinter import colorchooser
 import random
+from concurrent.futures import ThreadPoolExecutor
 
-from .config import WIDTH, bounds
-from .terrain import Terrain
-from .entities import Tank
+from .cli import game_config
+from .config import bounds
+from .terrain import Terrain, generate_heights
 from .enums import GameState
 
 adjectives = [
@@ -30,11 +31,25 @@ animals = [
 
 current_state = GameState.MENU
 menuconfig = None
+menu_heights = None  # heightmap the menu already generated for menuconfig's terrain
+
+THUMB_WIDTH, THUMB_HEIGHT = 250, 80
+PREVIEW_DEBOUNCE_MS = 250
+PREVIEW_POLL_MS = 30
 
 class GameConfigUI:
     def __init__(self, root):
         self.root = root
         self.root.title("Game Setup")
+        self.root.protocol("WM_DELETE_WINDOW", self.close)
+        self.closed = False
+
+        # Terrain thumbnails are generated off the Tk thread, newest request wins
+        self.executor = ThreadPoolExecutor(max_workers=1)
+        self.preview_job = None
+        self.preview_key = None
+        self.preview_future = None
+        self.preview_heights = None  # (key, heights) of the last finished preview
 
         self.players_frame = tk.LabelFrame(root, text="Players", padx=10, pady=10)
         self.players_frame.grid(row=0, column=0, padx=10, pady=10)
@@ -59,15 +74,21 @@ class GameConfigUI:
         self.terrain_seed.insert(0, str(random.randint(0, 100000)))
         self.terrain_seed.grid(row=0, column=1)
         self.terrain_seed.bind("<FocusOut>", self.clamp_seed)
+        self.terrain_seed.bind("<KeyRelease>", self.schedule_preview)
 
         self.min_height_var = tk.IntVar(value=10)
         self.max_height_var = tk.IntVar(value=540)
 
         tk.Label(self.terrain_frame, text="Min Height:").grid(row=1, column=0)
-        tk.Scale(self.terrain_frame, from_=0, to=200, orient='horizontal', variable=self.min_height_var).grid(row=1, column=1)
+        tk.Scale(self.terrain_frame, from_=0, to=200, orient='horizontal', variable=self.min_height_var,
+                 command=self.schedule_preview).grid(row=1, column=1)
 
         tk.Label(self.terrain_frame, text="Max Height:").grid(row=2, column=0)
-        tk.Scale(self.terrain_frame, from_=300, to=700, orient='horizontal', variable=self.max_height_var).grid(row=2, column=1)
+        tk.Scale(self.terrain_frame, from_=300, to=700, orient='horizontal', variable=self.max_height_var,
+                 command=self.schedule_preview).grid(row=2, column=1)
+
+        self.thumbnail = tk.Canvas(self.terrain_frame, width=THUMB_WIDTH, height=THUMB_HEIGHT, bg="#1e1e1e")
+        self.thumbnail.grid(row=3, column=0, columnspan=2, pady=(10, 0))
 
         self.settings_frame = tk.LabelFrame(root, text="Gameplay Settings", padx=10, pady=10)
         self.settings_frame.grid(row=2, column=0, padx=10, pady=10)
@@ -84,6 +105,57 @@ class GameConfigUI:
         self.start_button = tk.Button(root, text="Start Game", command=self.collect_config)
         self.start_button.grid(row=3, column=0, pady=20)
 
+        self.start_preview()
+
+    def pump(self) -> bool:
+        """Run pending Tk work without blocking; call once per pygame frame. False once closed."""
+        if not self.closed:
+            self.root.update()
+        return not self.closed
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.root.destroy()
+
+    def terrain_key(self):
+        seed = self.terrain_seed.get().strip()
+        if not seed:
+            return None
+        return int(seed), self.min_height_var.get(), self.max_height_var.get()
+
+    def schedule_preview(self, *_):
+        # Debounce: only the last change in a burst of typing or dragging starts a job
+        if self.preview_job is not None:
+            self.root.after_cancel(self.preview_job)
+        self.preview_job = self.root.after(PREVIEW_DEBOUNCE_MS, self.start_preview)
+
+    def start_preview(self):
+        self.preview_job = None
+        key = self.terrain_key()
+        if key is None or key == self.preview_key:
+            return
+        self.preview_key = key
+        self.preview_future = self.executor.submit(generate_heights, *key)
+        self.root.after(PREVIEW_POLL_MS, self.poll_preview, key, self.preview_future)
+
+    def poll_preview(self, key, future):
+        if self.closed or future is not self.preview_future:
+            return  # superseded by a newer request
+        if not future.done():
+            self.root.after(PREVIEW_POLL_MS, self.poll_preview, key, future)
+            return
+        heights = future.result()
+        self.preview_heights = (key, heights)
+        step = len(heights) / THUMB_WIDTH
+        scale = THUMB_HEIGHT / bounds.y2
+        outline = [(0, THUMB_HEIGHT)]
+        outline += [(x, THUMB_HEIGHT - heights[int(x * step)] * scale) for x in range(THUMB_WIDTH)]
+        outline.append((THUMB_WIDTH, THUMB_HEIGHT))
+        self.thumbnail.delete("all")
+        self.thumbnail.create_polygon(outline, fill="#28b400")
+
     def is_digit_input(self, value):
         return value.isdigit() or value == ""
 
@@ -147,7 +219,8 @@ class GameConfigUI:
             self.player_widgets[index][2].config(bg=color)
 
     def collect_config(self):
-        global current_state, menuconfig
+        global current_state, menuconfig, menu_heights
+        self.clamp_seed()
         player_data = []
         for idx, name_entry in enumerate(self.player_names):
             name = name_entry.get()
@@ -164,34 +237,24 @@ class GameConfigUI:
             "health": self.health_var.get()
         }
 
+        key = self.terrain_key()
+        if self.preview_heights and self.preview_heights[0] == key:
+            menu_heights = self.preview_heights[1]
+        elif key is not None:
+            menu_heights = generate_heights(*key)
+
         current_state = GameState.PLAYING
-        self.root.destroy()
+        self.close()
 
 def load_game_config():
-    from .globals import terrain, tanks, config_loaded
-    global menuconfig
-
-    if menuconfig:
-        tanks.clear()
-        player_data = menuconfig["players"]
-        terrain.seed = int(menuconfig["terrain_seed"])
-        terrain.min_height = int(menuconfig["terrain_min_height"])
-        terrain.max_height = int(menuconfig["terrain_max_height"])
-        terrain.heightMap = terrain.generate_terrain()
-
-        for i, player in enumerate(player_data):
-            tank = Tank(
-                height=12,
-                width=24,
-                name=player["name"],
-                color=player["color"],
-                fuel=float(menuconfig["fuel"]),
-                health=float(menuconfig["health"]),
-                max_health=float(menuconfig["health"]),
-                x=(WIDTH // (len(player_data) + 1)) * (i + 1),
-            )
-            tank.cannonColor = tuple(255 - c for c in tank.color)
-            tank.y = bounds.y2 - tank.height - tank.bottomCollide()
-            tanks.append(tank)
-
-        config_loaded[0] = True
+    from . import globals as g
+    from .simulation import new_match
+    global menuconfig, menu_heights
+
+    # Each config starts one match; the next one comes from the menu, the host or the CLI again
+    settings, menuconfig = menuconfig, None
+    if settings:
+        heights, menu_heights = menu_heights, None
+        new_match(g, game_config(settings), [player["name"] for player in settings["players"]], heights)
+
+        g.config_loaded[0] = True
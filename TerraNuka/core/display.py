@@ -0,0 +1,54 @@
+# core/display.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import pygame
+
+from .config import WIDTH, HEIGHT
+
+# Everything is drawn in logical coordinates onto one WIDTH x HEIGHT surface,
+# whatever the window. By default pygame.SCALED lets SDL stretch it to the
+# window on the GPU, so a 4K window costs no more fill than a 720p one. With
+# an explicit --window size (or where SCALED isn't available) the surface is
+# scaled onto the window once per frame in present(), letterboxed to keep
+# its aspect ratio.
+
+
+class Display:
+    def __init__(self, window_size: tuple[int, int] | None = None, headless: bool = False):
+        self.logical = (WIDTH, HEIGHT)
+        self.window = None
+        self.target = None       # letterboxed area of the window the surface is scaled into
+        if headless:
+            self.surface = pygame.display.set_mode(self.logical)
+            return
+        if window_size is None:
+            try:
+                self.surface = pygame.display.set_mode(self.logical, pygame.SCALED | pygame.RESIZABLE)
+                return
+            except pygame.error:
+                window_size = self.logical
+        self.window = pygame.display.set_mode(window_size, pygame.RESIZABLE)
+        self.surface = pygame.Surface(self.logical).convert()
+
+    def _letterbox(self) -> pygame.Surface:
+        self.window = pygame.display.get_surface()  # replaced when the window is resized
+        size = self.window.get_size()
+        if self.target is None or self.target[0] != (self.window, size):
+            scale = min(size[0] / self.logical[0], size[1] / self.logical[1])
+            w, h = int(self.logical[0] * scale), int(self.logical[1] * scale)
+            area = pygame.Rect((size[0] - w) // 2, (size[1] - h) // 2, w, h)
+            self.window.fill((0, 0, 0))
+            self.target = ((self.window, size), self.window.subsurface(area))
+        return self.target[1]
+
+    def present(self):
+        if self.window is not None:
+            target = self._letterbox()
+            if target.get_size() == self.logical:
+                target.blit(self.surface, (0, 0))
+            else:
+                pygame.transform.scale(self.surface, target.get_size(), target)
+        pygame.display.flip()
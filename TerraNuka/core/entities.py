@@ -6,15 +6,19 @@ if __name__ == "__main__":
 
 import math
 import random
+import numpy as np
 import pygame
 from dataclasses import dataclass, field
-from collections import defaultdict 
+from collections.abc import MutableMapping
 
 from core.config import bounds
-from core.enums import CollisionResult
+from core.enums import CollisionResult, WeaponEffect, Sound
+from core.weapons import WEAPON_LIST, WEAPON_IDS
 
+MAX_CLIMB_SLOPE = 1.5  # steepest rise (height per column) a tank can drive up
 
-@dataclass
+
+@dataclass(slots=True)
 class Projectile:
     x: float
     y: float
@@ -23,32 +27,100 @@ class Projectile:
     active: bool = True
     strength: int = 10
 
-@dataclass
+
+# Tanks live in a TankStore: one typed array per field, one row per tank, so
+# damage, gravity and "who is still alive" are single NumPy passes however
+# many tanks there are. A Tank is a two-slot view of one row; the code that
+# reads tank.x or writes tank.health keeps working unchanged. A Tank built on
+# its own gets a one-row store, and TankStore.append moves it into the match.
+
+TANK_FIELDS = {
+    "height": np.int32, "width": np.int32, "x": np.float64, "y": np.float64,
+    "cannonRelX": np.float64, "cannonRelY": np.float64, "cannonLen": np.float64,
+    "cannonPower": np.float64, "aimAngle": np.int32, "health": np.float64,
+    "max_health": np.float64, "strength": np.float64, "explosionStrength": np.float64,
+    "fuel": np.float64, "active": np.bool_, "money": np.int32, "weapon": np.int16,
+}
+OBJECT_FIELDS = ("name", "color", "cannonColor")  # plain lists, one entry per tank
+
+TANK_DEFAULTS = {
+    "y": 0.0, "cannonRelX": 0, "cannonRelY": 0, "cannonLen": 20, "name": "Player",
+    "color": (200, 200, 0), "cannonColor": (255, 0, 0), "cannonPower": 30, "aimAngle": 45,
+    "health": 100, "max_health": 100, "strength": 15, "explosionStrength": 70, "fuel": 0.5,
+    "active": True, "money": 100, "weapon": WEAPON_IDS["Baby Missile"],
+}
+
+
+class Inventory(MutableMapping):
+    """Weapon name -> count, backed by one row of TankStore.counts. Any known weapon reads as 0."""
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store, index: int):
+        self._store, self._index = store, index
+
+    def __getitem__(self, name: str) -> int:
+        return int(self._store.counts[self._index, WEAPON_IDS[name]])
+
+    def __setitem__(self, name: str, count: int):
+        self._store.counts[self._index, WEAPON_IDS[name]] = count
+
+    def __delitem__(self, name: str):
+        self[name] = 0
+
+    def __iter__(self):
+        return (WEAPON_LIST[i].name for i in np.flatnonzero(self._store.counts[self._index]))
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self._store.counts[self._index]))
+
+    def __contains__(self, name) -> bool:
+        return name in WEAPON_IDS and self[name] != 0
+
+
+def _column(name):
+    def get(self):
+        return getattr(self._store, name)[self._index].item()
+
+    def set(self, value):
+        getattr(self._store, name)[self._index] = value
+    return property(get, set)
+
+
+def _object_column(name):
+    def get(self):
+        return getattr(self._store, name)[self._index]
+
+    def set(self, value):
+        getattr(self._store, name)[self._index] = value
+    return property(get, set)
+
+
 class Tank:
-    height: float
-    width: float
-    x: float
-    y: float = field(init=False)
-    cannonRelX: float = 0
-    cannonRelY: float = 0
-    cannonLen: float = 20
-    name: str = "Player"
-    color: tuple[int, int, int] = (200, 200, 0)
-    cannonColor: tuple[int, int, int] = (255, 0, 0)
-    cannonPower: float = 30
-    aimAngle: float = 45
-    health: float = 100
-    max_health: float = 100
-    strength: float = 15
-    explosionStrength: float = 70
-    fuel: float = 0.5
-    active: bool = True
-    money: int = 100
-    inventory: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, height: int, width: int, x: float, **fields):
+        TankStore(1).add(self, height=height, width=width, x=x, **fields)
 
-    def bottomCollide(self):
-        from .globals import terrain  # lazy import to avoid circular dependency
-        return max(terrain.heightMap[int(self.x) + n] for n in range(self.width))
+    def __repr__(self):
+        return f"Tank({self.name!r}, x={self.x:.1f}, health={self.health:g}, active={self.active})"
+
+    @property
+    def inventory(self) -> Inventory:
+        return Inventory(self._store, self._index)
+
+    @property
+    def current_weapon(self) -> str:
+        return WEAPON_LIST[self._store.weapon[self._index]].name
+
+    @current_weapon.setter
+    def current_weapon(self, name: str):
+        self._store.weapon[self._index] = WEAPON_IDS[name]
+
+    def bottomCollide(self, terrain_heights=None):
+        if terrain_heights is None:
+            from .globals import terrain  # lazy import to avoid circular dependency
+            terrain_heights = terrain.heightMap
+        return max(terrain_heights[int(self.x) + n] for n in range(self.width))
 
     def aim(self, direction: str):
         if direction == "left":
@@ -56,10 +128,20 @@ class Tank:
         elif direction == "right":
             self.aimAngle = max(0, self.aimAngle - 1)
 
-    def move(self, direction: str):
+    def move(self, direction: str) -> bool:
+        """Drive one step; returns False when the ground ahead is too steep to climb."""
+        from .globals import terrain
+        step = 0.1 if direction == "Right" else -0.1
+        front = self.x + self.width if step > 0 else self.x
+        if not 0 <= front + step < len(terrain.heightMap):
+            return False
+        uphill = terrain.slopes.slope_at(front + step) * (1 if step > 0 else -1)
+        if uphill > MAX_CLIMB_SLOPE:
+            return False
         self.fuel -= 0.001
-        self.x += 0.1 if direction == "Right" else -0.1
+        self.x += step
         self.y = bounds.y2 - self.height - self.bottomCollide()
+        return True
 
     def fire(self, shot_speed: float) -> Projectile:
         rad = math.radians(self.aimAngle)
@@ -72,17 +154,164 @@ class Tank:
             strength=self.strength
         )
 
-    def explode(self):
-        from .globals import tankExplosionSound, Pending_Explosion_Next
-        tankExplosionSound.play()
-        Pending_Explosion_Next.append((
+    def explode(self, pending, audio=None):
+        """Queue this tank's explosion on pending and announce it on audio, if given."""
+        if audio:
+            audio.emit(Sound.TANK_EXPLOSION)
+        pending.append((
             self.x + self.width // 2,
             self.y + self.height // 2,
             self.explosionStrength * (self.fuel + 0.7),
             600,
-            self
+            self,
+            WeaponEffect.EXPLODE
         ))
 
+for _name in TANK_FIELDS:
+    if _name != "weapon":
+        setattr(Tank, _name, _column(_name))
+for _name in OBJECT_FIELDS:
+    setattr(Tank, _name, _object_column(_name))
+
+
+class TankStore:
+    """The tanks of a match. Indexes, iterates and appends like the list it replaces."""
+
+    def __init__(self, capacity: int = 16):
+        self.count = 0
+        self.views = []
+        for name in OBJECT_FIELDS:
+            setattr(self, name, [])
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        old = self.__dict__.get("x")
+        for name, dtype in TANK_FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+        counts = np.zeros((capacity, len(WEAPON_LIST)), dtype=np.int32)
+        if old is not None:
+            counts[:self.count] = self.counts[:self.count]
+        self.counts = counts
+
+    def _row(self) -> int:
+        if self.count == len(self.x):
+            self._allocate(max(1, 2 * len(self.x)))
+        self.count += 1
+        return self.count - 1
+
+    def add(self, tank: Tank, **fields):
+        """Bind tank to a new row filled from fields (Tank's keyword arguments)."""
+        values = {**TANK_DEFAULTS, **fields}
+        if "current_weapon" in values:
+            values["weapon"] = WEAPON_IDS[values.pop("current_weapon")]
+        inventory = values.pop("inventory", {})
+        i = self._row()
+        for name in TANK_FIELDS:
+            getattr(self, name)[i] = values.pop(name)
+        for name in OBJECT_FIELDS:
+            getattr(self, name).append(values.pop(name))
+        if values:
+            raise TypeError(f"Unknown tank fields: {', '.join(values)}")
+        self.counts[i] = 0
+        for name, count in inventory.items():
+            self.counts[i, WEAPON_IDS[name]] = count
+        self.views.append(tank)
+        tank._store, tank._index = self, i
+
+    def append(self, tank: Tank):
+        """Move tank's row into this store; the view keeps working."""
+        source, j = tank._store, tank._index
+        i = self._row()
+        for name in TANK_FIELDS:
+            getattr(self, name)[i] = getattr(source, name)[j]
+        for name in OBJECT_FIELDS:
+            getattr(self, name).append(getattr(source, name)[j])
+        self.counts[i] = source.counts[j]
+        self.views.append(tank)
+        tank._store, tank._index = self, i
+
+    def extend(self, tanks):
+        for tank in tanks:
+            self.append(tank)
+
+    def clear(self):
+        self.count = 0
+        self.views = []
+        for name in OBJECT_FIELDS:
+            setattr(self, name, [])
+
+    def copy(self) -> "TankStore":
+        """An independent store with the same tanks (new views, same order)."""
+        clone = TankStore.__new__(TankStore)
+        clone.count = self.count
+        for name in TANK_FIELDS:
+            setattr(clone, name, getattr(self, name)[:self.count].copy())
+        for name in OBJECT_FIELDS:
+            setattr(clone, name, list(getattr(self, name)))
+        clone.counts = self.counts[:self.count].copy()
+        clone.views = []
+        for i in range(self.count):
+            view = Tank.__new__(Tank)
+            view._store, view._index = clone, i
+            clone.views.append(view)
+        return clone
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index):
+        return self.views[index]
+
+    def __iter__(self):
+        return iter(self.views)
+
+    def index(self, tank: Tank) -> int:
+        return self.views.index(tank)
+
+    def living(self) -> list[Tank]:
+        return [self.views[i] for i in np.flatnonzero(self.active[:self.count])]
+
+    def rects(self) -> np.ndarray:
+        """(left, top, right, bottom) in whole pixels of every active tank, one row each."""
+        live = np.flatnonzero(self.active[:self.count])
+        left, top = self.x[live].astype(np.int64), self.y[live].astype(np.int64)
+        return np.stack([left, top, left + self.width[live], top + self.height[live]], axis=1)
+
+    def blast(self, x: float, y: float, radius: float, max_damage: float) -> list[Tank]:
+        """Blast every tank still standing: max_damage where (x, y) touches its rect, falling
+        linearly to none at radius away. Returns the tanks it finished off."""
+        n = self.count
+        if radius <= 0 or n == 0:
+            return []
+        left, top = self.x[:n], self.y[:n]
+        dx = np.clip(x, left, left + self.width[:n]) - x
+        dy = np.clip(y, top, top + self.height[:n]) - y
+        distance = np.sqrt(dx * dx + dy * dy)
+        hit = np.flatnonzero((self.health[:n] > 0) & (distance < radius))
+        damage = np.trunc(max_damage * (1 - distance[hit] / radius))
+        self.health[hit] = np.maximum(0, self.health[hit] - damage)
+        return [self.views[i] for i in hit if self.health[i] <= 0]
+
+    def ground(self, terrain_heights) -> np.ndarray:
+        """bottomCollide() of every tank at once."""
+        n = self.count
+        heights = np.asarray(terrain_heights)
+        span = np.arange(int(self.width[:n].max(initial=0)))
+        columns = np.clip(self.x[:n, None].astype(np.int64) + span, 0, len(heights) - 1)
+        return np.where(span < self.width[:n, None], heights[columns], -np.inf).max(axis=1, initial=-np.inf)
+
+    def land(self, terrain_heights, max_height: float = bounds.y2) -> np.ndarray:
+        """Drop every active tank left hanging onto the ground below it; returns how far each fell."""
+        n = self.count
+        rest = max_height - self.height[:n] - self.ground(terrain_heights)
+        drop = np.where(self.active[:n], np.maximum(rest - self.y[:n], 0), 0)
+        self.y[:n] += drop
+        return drop
+
+
 @dataclass
 class Particle:
     x: float
@@ -131,9 +360,9 @@ class Firework:
                 p.update()
 
     def explode(self):
-        from .globals import fireworksExplosionSound
+        from .globals import audio
         self.exploded = True
-        fireworksExplosionSound.play()
+        audio.emit(Sound.FIREWORK)
         for _ in range(40):
             angle = random.uniform(0, 2 * math.pi)
             speed = random.uniform(2, 8)
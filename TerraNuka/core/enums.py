@@ -17,3 +17,17 @@ class GameState(Enum):
     MENU = auto()
     PLAYING = auto()
     GAME_OVER = auto()
+
+class WeaponEffect(Enum):
+    EXPLODE = auto()   # crater and blast damage
+    DIRT = auto()      # piles earth up instead of removing it
+    SETTLE = auto()    # smooths the ground around the impact
+    BURN = auto()      # spills burning napalm that flows downhill
+    FLOW = auto()      # spills liquid dirt that flows, then sets
+    NONE = auto()      # tracers: no effect at all
+
+class Sound(Enum):
+    EXPLOSION = auto()
+    TANK_EXPLOSION = auto()
+    SHOT = auto()
+    FIREWORK = auto()
@@ -4,14 +4,29 @@ if __name__ == "__main__":
     raise RuntimeError("This module is not meant to be run directly.")
 
 
+import os
 import pygame
 from core.config import WIDTH, HEIGHT, GRAVITY, FPS
 from core.terrain import Terrain
+from core.entities import TankStore
+from core.projectiles import ProjectileSystem
+from core.liquids import LiquidField
+from core.audio import AudioBus
+from core.bundle import open_bundle
+
+# Headless processes (tournaments, tests) never open the mixer or read assets
+HEADLESS = os.environ.get("TERRANUKA_HEADLESS") == "1"
+# Assets are found next to the code, whatever the working directory
+ASSET_DIR = os.environ.get(
+    "TERRANUKA_ASSETS", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+)
 
 # --- Runtime State ---
 terrain = Terrain()
-tanks = []
-projectile = None
+tanks = TankStore()
+projectiles = ProjectileSystem()
+liquids = LiquidField()
+shot_in_flight = False
 
 # Explosion queue and overlay timing
 Pending_Explosion = None
@@ -28,20 +43,37 @@ fireworks = []
 spawn_interval = 0
 active_tank_index = 0
 
+# Lockstep play: turns resolved so far and where the active tank started
+turn_number = 0
+turn_start = None
+shot_trace = []
+
 # --- Sounds ---
-pygame.mixer.init()
+# Packed assets (build_assets.py), mapped once; without one they load from files
+bundle = None if HEADLESS else open_bundle(ASSET_DIR)
+
 
-menuTheme = "assets/sounds/menu_theme.mp3"
-gameTheme = "assets/sounds/game_theme.mp3"
+def play_music(name, volume, fadeout_ms=0):
+    if HEADLESS:
+        return
+    if fadeout_ms:
+        pygame.mixer.music.fadeout(fadeout_ms)
+    if bundle is not None and name in bundle:
+        pygame.mixer.music.load(bundle.stream(name), os.path.splitext(name)[1][1:])
+    else:
+        pygame.mixer.music.load(os.path.join(ASSET_DIR, name))
+    pygame.mixer.music.set_volume(volume)
+    pygame.mixer.music.play(-1)
 
-explosionSound = pygame.mixer.Sound("assets/sounds/explosion.wav")
-explosionSound.set_volume(0.8)
 
-tankExplosionSound = pygame.mixer.Sound("assets/sounds/tank_explosion.wav")
-tankExplosionSound.set_volume(0.5)
+if not HEADLESS:
+    # Open the mixer at the bundle's format so its PCM plays as stored
+    if bundle is not None:
+        pygame.mixer.init(*bundle.mixer_format)
+    else:
+        pygame.mixer.init()
 
-shotSound = pygame.mixer.Sound("assets/sounds/shot.wav")
-shotSound.set_volume(0.8)
+menuTheme = "sounds/menu_theme.mp3"     # names under ASSET_DIR, as in the bundle
+gameTheme = "sounds/game_theme.mp3"
 
-fireworksExplosionSound = pygame.mixer.Sound("assets/sounds/fireworks_explosion.wav")
-fireworksExplosionSound.set_volume(0.8)
+audio = AudioBus(ASSET_DIR, enabled=not HEADLESS, bundle=bundle)  # forks (core.snapshot.MatchState) have None
@@ -0,0 +1,116 @@
+# core/hud.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import math
+
+import pygame
+
+from .config import WIDTH, HEIGHT
+from .weapons import DEFAULT_WEAPON
+
+# Retained-mode HUD. Each widget owns a small surface and the key of the
+# values it shows (aim angle, fuel bar width, ...); it redraws only when that
+# key changes, so with no key held a frame is one blits call of cached
+# surfaces. Widgets draw in their own coordinates; pos places them on screen.
+
+HUD_HEIGHT = 100
+PANEL = (20, 20, 20)
+FRAME = (200, 200, 200)
+TOP = HEIGHT - HUD_HEIGHT      # top of the panel
+
+FUEL_BAR = (120, 20)
+TRIANGLE = (100, 20)           # power triangle width, height at full power
+
+
+class Widget:
+    def __init__(self, pos: tuple[int, int], size: tuple[int, int], key, render):
+        self.pos = pos
+        self.surface = pygame.Surface(size)
+        self.key = key          # tank -> the values the widget shows
+        self.render = render    # (surface, tank) -> None, onto a surface filled with PANEL
+        self.shown = None
+
+    def refresh(self, tank):
+        key = self.key(tank)
+        if key != self.shown:
+            self.shown = key
+            self.surface.fill(PANEL)
+            self.render(self.surface, tank)
+
+
+def _strip(size, color) -> pygame.Surface:
+    surface = pygame.Surface(size)
+    surface.fill(color)
+    return surface
+
+
+class Hud:
+    def __init__(self):
+        self.fonts = {}
+        self.frame = [
+            (_strip((WIDTH, HUD_HEIGHT), PANEL), (0, TOP)),
+            (_strip((WIDTH, 10), FRAME), (0, TOP - 10)),   # top HUD border
+            (_strip((WIDTH, 5), FRAME), (0, 0)),            # top border
+            (_strip((5, HEIGHT), FRAME), (0, 0)),           # left border
+            (_strip((5, HEIGHT), FRAME), (WIDTH - 5, 0)),   # right border
+        ]
+        self.widgets = [
+            Widget((20, TOP + 10), (150, 30), lambda t: (t.name, t.color), self.render_name),
+            Widget((195, TOP + 5), (95, 85), lambda t: t.aimAngle, self.render_angle),
+            Widget((340, TOP + 15), (FUEL_BAR[0], 45),
+                   lambda t: int(FUEL_BAR[0] * t.fuel), self.render_fuel),
+            Widget((555, TOP + 10), (200, 60),
+                   lambda t: (t.current_weapon, t.inventory.get(t.current_weapon, 0)), self.render_weapon),
+            Widget((815, TOP + 15), (110, 60), lambda t: t.cannonPower, self.render_power),
+        ]
+
+    def font(self, size: int, bold: bool = False) -> pygame.font.Font:
+        font = self.fonts.get((size, bold))
+        if font is None:
+            font = self.fonts[(size, bold)] = pygame.font.SysFont("consolas", size, bold=bold)
+        return font
+
+    def draw(self, screen, tank):
+        for widget in self.widgets:
+            widget.refresh(tank)
+        screen.blits(self.frame + [(w.surface, w.pos) for w in self.widgets], False)
+
+    def render_name(self, surface, tank):
+        surface.fill(tank.color)
+        size = max(10, 22 - max(0, len(tank.name) - 8))
+        label = self.font(size, bold=True).render(tank.name, True, tuple(255 - c for c in tank.color))
+        surface.blit(label, (5, 5))
+
+    def render_angle(self, surface, tank):
+        center, radius = (45, 45), 40
+        pygame.draw.arc(surface, (255, 255, 255), (center[0] - radius, center[1] - radius, radius * 2, radius * 2),
+                        0, math.pi, 3)
+        rad = math.radians(tank.aimAngle)
+        end = (center[0] + radius * math.cos(rad), center[1] - radius * math.sin(rad))
+        pygame.draw.line(surface, (255, 0, 0), center, end, 3)
+        surface.blit(self.font(22).render(f"{tank.aimAngle}°", True, (220, 220, 220)), (center[0] - 40, center[1] + 5))
+
+    def render_fuel(self, surface, tank):
+        bar = pygame.Rect((0, 25), FUEL_BAR)
+        pygame.draw.rect(surface, (255, 255, 255), bar, 2)
+        pygame.draw.rect(surface, (255, 0, 0), (bar.x, bar.y, int(FUEL_BAR[0] * tank.fuel), bar.height))
+        surface.blit(self.font(22).render("FUEL", True, (220, 220, 220)), (FUEL_BAR[0] // 2 - 50, 0))
+
+    def render_weapon(self, surface, tank):
+        count = "" if tank.current_weapon == DEFAULT_WEAPON else f" x{tank.inventory.get(tank.current_weapon, 0)}"
+        surface.fill((50, 50, 50))
+        pygame.draw.rect(surface, FRAME, surface.get_rect(), 3)
+        surface.blit(self.font(22).render("MISSILE", True, (255, 255, 255)), (10, 5))
+        surface.blit(self.font(22).render(f"{tank.current_weapon}{count}", True, (255, 255, 255)), (10, 30))
+
+    def render_power(self, surface, tank):
+        power = tank.cannonPower / 100
+        width, height = int(TRIANGLE[0] * power), int(TRIANGLE[1] * power)
+        x, y = 5, 25           # left end of the triangle's base
+        pygame.draw.polygon(surface, (255, 255, 255),
+                            [(x, y), (x + TRIANGLE[0], y), (x + TRIANGLE[0], y - TRIANGLE[1])], 2)
+        pygame.draw.polygon(surface, (255, 255, 0), [(x, y), (x + width, y), (x + width, y - height)])
+        surface.blit(self.font(22).render("POWER", True, (255, 255, 255)), (x, y + 10))
@@ -0,0 +1,124 @@
+# core/liquids.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import numpy as np
+
+from .config import WIDTH, bounds
+from .enums import WeaponEffect
+
+# Column-based liquids on top of terrain.heightMap. Each column holds a depth
+# of burning napalm and a depth of liquid dirt; every tick both layers flow
+# towards lower neighbouring surfaces in a few vectorized passes over the
+# active span only. Napalm burns away and damages whatever stands in it, mud
+# solidifies into the heightmap once it stops moving.
+
+FLOW_RATE = 0.24       # share of a surface difference moved per pass
+FLOW_PASSES = 4        # passes per tick, so liquid spreads up to 4 columns a tick
+BURN_RATE = 0.04       # napalm depth burnt away per tick ...
+BURN_SHARE = 0.01      # ... plus this share of it, so deep pools don't burn for minutes
+SETTLE_FLOW = 0.02     # mud solidifies once no column moves more than this
+MUD_TICKS = 240        # ... or after this many ticks regardless
+EPSILON = 0.01
+POUR_WIDTH = 4         # columns either side of the impact that receive a pour
+
+
+def _flow(depth, base):
+    # Flux from column i to i + 1, limited so no column gives away more than it holds
+    surface = base + depth
+    flux = (surface[:-1] - surface[1:]) * FLOW_RATE
+    flux = np.clip(flux, -depth[1:] / 2, depth[:-1] / 2)
+    depth[:-1] -= flux
+    depth[1:] += flux
+    return flux
+
+
+class LiquidField:
+    def __init__(self, width: int = WIDTH):
+        self.width = width
+        self.fire = np.zeros(width)
+        self.heat = np.zeros(width)   # napalm depth times heat: the damage per tick of each column
+        self.mud = np.zeros(width)
+        self.lo, self.hi = width, 0   # active span [lo, hi)
+        self.mud_age = 0
+
+    @property
+    def active(self) -> bool:
+        return self.lo < self.hi
+
+    @property
+    def has_mud(self) -> bool:
+        return self.active and bool(self.mud[self.lo:self.hi].any())
+
+    def clear(self):
+        self.fire[:] = 0
+        self.heat[:] = 0
+        self.mud[:] = 0
+        self.lo, self.hi = self.width, 0
+        self.mud_age = 0
+
+    def pour(self, effect: WeaponEffect, x: float, volume: float, heat: float = 0.0):
+        left = max(0, int(x) - POUR_WIDTH)
+        right = min(self.width, int(x) + POUR_WIDTH + 1)
+        if left >= right:
+            return
+        depth = volume / (right - left)
+        if effect == WeaponEffect.BURN:
+            self.fire[left:right] += depth
+            self.heat[left:right] += depth * heat
+        else:
+            self.mud[left:right] += depth
+            self.mud_age = 0
+        self.lo, self.hi = min(self.lo, left), max(self.hi, right)
+
+    def exposure(self, left: float, right: float) -> float:
+        """Burn damage per tick for something standing on columns [left, right)."""
+        left, right = max(0, int(left)), min(self.width, int(right))
+        if left >= right or not self.active:
+            return 0.0
+        return float(self.heat[left:right].max())
+
+    def update(self, terrain_heights) -> tuple[int, int] | None:
+        """Advance one tick. Returns the span of terrain_heights that set mud raised, if any."""
+        if not self.active:
+            return None
+        a, b = max(0, self.lo - FLOW_PASSES), min(self.width, self.hi + FLOW_PASSES)
+        ground = np.asarray(terrain_heights[a:b], dtype=np.float64)
+        fire, heat, mud = self.fire[a:b], self.heat[a:b], self.mud[a:b]
+
+        moved = 0.0
+        for _ in range(FLOW_PASSES):
+            if mud.any():
+                moved = max(moved, float(np.abs(_flow(mud, ground)).max(initial=0)))
+            if fire.any():
+                # Heat travels with the napalm that carries it
+                ratio = np.divide(heat, fire, out=np.zeros_like(heat), where=fire > EPSILON)
+                flux = _flow(fire, ground + mud)
+                carried = flux * np.where(flux > 0, ratio[:-1], ratio[1:])
+                heat[:-1] -= carried
+                heat[1:] += carried
+
+        burning = fire > 0
+        remaining = np.maximum(fire * (1 - BURN_SHARE) - BURN_RATE, 0)
+        np.multiply(heat, np.divide(remaining, fire, out=np.zeros_like(fire), where=burning), out=heat)
+        fire[:] = remaining
+        fire[fire < EPSILON] = 0
+        heat[fire == 0] = 0
+
+        changed = None
+        self.mud_age += 1
+        if mud.any() and (moved < SETTLE_FLOW or self.mud_age >= MUD_TICKS):
+            solid = np.minimum(ground + np.rint(mud), bounds.y2).astype(int)
+            for i in np.flatnonzero(mud >= 0.5):
+                terrain_heights[a + i] = int(solid[i])
+            mud[:] = 0
+            changed = (a, b)
+
+        wet = np.flatnonzero((fire > 0) | (mud > 0))
+        if len(wet):
+            self.lo, self.hi = a + int(wet[0]), a + int(wet[-1]) + 1
+        else:
+            self.lo, self.hi = self.width, 0
+        return changed
@@ -0,0 +1,239 @@
+# core/lockstep.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import json
+import socket
+import struct
+import time
+
+from .simulation import TurnInput
+
+# Lockstep transport over plain TCP. The host accepts every other peer and
+# relays their messages; only the match config (once) and one TurnInput per
+# turn cross the wire. Each peer resolves turns with core.simulation and
+# reports a checksum, and the host announces the first turn that disagrees.
+
+DEFAULT_PORT = 7788
+
+MSG_HELLO = 1     # host -> peer: peer id, peer count
+MSG_CONFIG = 2    # host -> peer: JSON menu config, sent once per match
+MSG_TURN = 3      # any -> all: turn number, TurnInput
+MSG_CHECKSUM = 4  # peer -> host: turn number, state checksum
+MSG_DESYNC = 5    # host -> peer: first turn whose checksums differ
+
+HELLO = struct.Struct("<BBB")
+CONFIG = struct.Struct("<BI")
+TURN = struct.Struct("<BH")
+CHECKSUM = struct.Struct("<BHI")
+DESYNC = struct.Struct("<BH")
+
+
+class Connection:
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.buffer = bytearray()
+        self.closed = False
+
+    def send(self, data: bytes):
+        self.sock.setblocking(True)
+        self.sock.sendall(data)
+        self.sock.setblocking(False)
+
+    def receive(self) -> list[tuple]:
+        self.sock.setblocking(False)
+        try:
+            while True:
+                chunk = self.sock.recv(4096)
+                if not chunk:
+                    self.closed = True
+                    break
+                self.buffer += chunk
+        except BlockingIOError:
+            pass
+        except ConnectionError:
+            self.closed = True
+        return self.parse()
+
+    def parse(self) -> list[tuple]:
+        messages = []
+        while self.buffer:
+            kind = self.buffer[0]
+            if kind == MSG_HELLO and len(self.buffer) >= HELLO.size:
+                _, peer_id, peer_count = HELLO.unpack_from(self.buffer)
+                messages.append((kind, peer_id, peer_count))
+                del self.buffer[:HELLO.size]
+            elif kind == MSG_CONFIG and len(self.buffer) >= CONFIG.size:
+                _, length = CONFIG.unpack_from(self.buffer)
+                if len(self.buffer) < CONFIG.size + length:
+                    break
+                payload = bytes(self.buffer[CONFIG.size:CONFIG.size + length])
+                messages.append((kind, json.loads(payload)))
+                del self.buffer[:CONFIG.size + length]
+            elif kind == MSG_TURN and len(self.buffer) >= TURN.size + TurnInput.FORMAT.size:
+                _, turn = TURN.unpack_from(self.buffer)
+                turn_input = TurnInput.unpack(bytes(self.buffer[TURN.size:TURN.size + TurnInput.FORMAT.size]))
+                messages.append((kind, turn, turn_input))
+                del self.buffer[:TURN.size + TurnInput.FORMAT.size]
+            elif kind == MSG_CHECKSUM and len(self.buffer) >= CHECKSUM.size:
+                messages.append(CHECKSUM.unpack_from(self.buffer))
+                del self.buffer[:CHECKSUM.size]
+            elif kind == MSG_DESYNC and len(self.buffer) >= DESYNC.size:
+                messages.append(DESYNC.unpack_from(self.buffer))
+                del self.buffer[:DESYNC.size]
+            elif kind not in (MSG_HELLO, MSG_CONFIG, MSG_TURN, MSG_CHECKSUM, MSG_DESYNC):
+                raise ValueError(f"Unknown lockstep message {kind}")
+            else:
+                break  # wait for the rest of the message
+        return messages
+
+
+def encode_turn(turn: int, turn_input: TurnInput) -> bytes:
+    return TURN.pack(MSG_TURN, turn & 0xFFFF) + turn_input.pack()
+
+
+class LockstepSession:
+    """Shared state of a host or a joined peer. Poll once per frame."""
+
+    def __init__(self):
+        self.peer_id = 0
+        self.peer_count = 1
+        self.turns = {}          # turn number -> TurnInput received from the network
+        self.config = None
+        self.desync_turn = None
+        self.disconnected = False
+
+    def owns(self, tank_index: int) -> bool:
+        return tank_index % self.peer_count == self.peer_id
+
+    def take_turn(self, turn: int) -> TurnInput | None:
+        return self.turns.pop(turn & 0xFFFF, None)
+
+    def take_config(self) -> dict | None:
+        config, self.config = self.config, None
+        return config
+
+    def handle(self, message: tuple):
+        kind = message[0]
+        if kind == MSG_TURN:
+            self.turns[message[1]] = message[2]
+        elif kind == MSG_CONFIG:
+            self.config = message[1]
+            self.turns.clear()
+            self.desync_turn = None
+        elif kind == MSG_DESYNC and self.desync_turn is None:
+            self.desync_turn = message[1]
+
+
+class LockstepHost(LockstepSession):
+    def __init__(self, peer_count: int, port: int = DEFAULT_PORT, address: str = "0.0.0.0"):
+        super().__init__()
+        self.peer_count = peer_count
+        self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind((address, port))
+        self.listener.listen(peer_count)
+        self.port = self.listener.getsockname()[1]
+        self.peers: list[Connection] = []
+        self.checksums = {}      # turn number -> {peer id: checksum}
+
+    def wait_for_peers(self, timeout: float | None = None, poll=None):
+        """Accept peer_count - 1 peers. `poll` is called between attempts (e.g. to pump pygame events)."""
+        self.listener.settimeout(0.1)
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while len(self.peers) < self.peer_count - 1:
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError("Not every lockstep peer joined in time")
+            try:
+                sock, _ = self.listener.accept()
+            except socket.timeout:
+                if poll:
+                    poll()
+                continue
+            peer = Connection(sock)
+            peer.send(HELLO.pack(MSG_HELLO, len(self.peers) + 1, self.peer_count))
+            self.peers.append(peer)
+
+    def send_config(self, config: dict):
+        payload = json.dumps(config).encode()
+        self.broadcast(CONFIG.pack(MSG_CONFIG, len(payload)) + payload)
+        self.turns.clear()
+        self.checksums.clear()
+        self.desync_turn = None
+
+    def broadcast(self, data: bytes, skip: Connection | None = None):
+        for peer in self.peers:
+            if peer is not skip and not peer.closed:
+                try:
+                    peer.send(data)
+                except OSError:
+                    peer.closed = True
+
+    def send_turn(self, turn: int, turn_input: TurnInput):
+        self.broadcast(encode_turn(turn, turn_input))
+
+    def report_checksum(self, turn: int, checksum: int):
+        self.record_checksum(turn & 0xFFFF, 0, checksum)
+
+    def record_checksum(self, turn: int, peer_id: int, checksum: int):
+        seen = self.checksums.setdefault(turn, {})
+        seen[peer_id] = checksum
+        if len(set(seen.values())) > 1 and self.desync_turn is None:
+            self.desync_turn = turn
+            self.broadcast(DESYNC.pack(MSG_DESYNC, turn))
+        if len(seen) == self.peer_count:
+            del self.checksums[turn]
+
+    def poll(self):
+        for peer_id, peer in enumerate(self.peers, start=1):
+            if peer.closed:
+                continue
+            for message in peer.receive():
+                if message[0] == MSG_TURN:
+                    self.broadcast(encode_turn(message[1], message[2]), skip=peer)
+                    self.handle(message)
+                elif message[0] == MSG_CHECKSUM:
+                    self.record_checksum(message[1], peer_id, message[2])
+            if peer.closed:
+                self.disconnected = True
+
+    def close(self):
+        for peer in self.peers:
+            peer.sock.close()
+        self.listener.close()
+
+
+class LockstepPeer(LockstepSession):
+    def __init__(self, address: str, port: int = DEFAULT_PORT, timeout: float = 10):
+        super().__init__()
+        self.host = Connection(socket.create_connection((address, port), timeout=timeout))
+        deadline = time.monotonic() + timeout
+        while True:
+            for message in self.host.receive():
+                if message[0] == MSG_HELLO:
+                    _, self.peer_id, self.peer_count = message
+                else:
+                    self.handle(message)
+            if self.peer_count > 1 or self.host.closed:
+                break
+            if time.monotonic() > deadline:
+                raise TimeoutError("Lockstep host did not greet us")
+            time.sleep(0.01)
+
+    def send_turn(self, turn: int, turn_input: TurnInput):
+        self.host.send(encode_turn(turn, turn_input))
+
+    def report_checksum(self, turn: int, checksum: int):
+        self.host.send(CHECKSUM.pack(MSG_CHECKSUM, turn & 0xFFFF, checksum))
+
+    def poll(self):
+        for message in self.host.receive():
+            self.handle(message)
+        if self.host.closed:
+            self.disconnected = True
+
+    def close(self):
+        self.host.sock.close()
@@ -0,0 +1,82 @@
+# core/preview.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import math
+
+import numpy as np
+import pygame
+
+from .config import WIDTH, HEIGHT, GRAVITY
+from .weapons import WEAPON_LIST, WEAPON_IDS
+
+# Dotted aim preview. The arc is closed form (frame n of a shot sits at
+# x0 + n*vx, y0 + n*vy + GRAVITY*n*(n-1)/2) and is cut off where the max
+# pyramid says it meets the ground. Points are only recomputed when the aim,
+# the weapon, the tank or the terrain version change; holding an arrow key that is
+# already at its limit, or not touching anything, just redraws the buffer.
+# Beam weapons don't arc: their dots run straight along the aim line to
+# where the pyramid's ray meets the ground, or to the edge of the screen.
+
+PREVIEW_FRAMES = 60    # how much of the flight is shown
+DOT_EVERY = 3          # frames between dots
+DOT_COLOR = (230, 230, 230)
+BEAM_DOT_SPACING = 12  # px between dots on a beam's line
+
+
+class AimPreview:
+    def __init__(self):
+        frames = np.arange(0, PREVIEW_FRAMES, DOT_EVERY, dtype=np.float64)
+        self.frames = frames
+        self.fall = GRAVITY * frames * (frames - 1) / 2
+        self.xs = np.empty_like(frames)
+        self.ys = np.empty_like(frames)
+        self.points = []
+        self.key = None
+
+    def update(self, tank, terrain):
+        key = (tank.aimAngle, tank.cannonPower, tank.x, tank.y, tank.current_weapon, terrain.version)
+        if key == self.key:
+            return
+        self.key = key
+        shot = tank.fire(tank.cannonPower)
+        if WEAPON_LIST[WEAPON_IDS[tank.current_weapon]].beam:
+            self.update_beam(tank, terrain, shot.x, shot.y)
+            return
+        np.multiply(self.frames, shot.vx, out=self.xs)
+        self.xs += shot.x
+        np.multiply(self.frames, shot.vy, out=self.ys)
+        self.ys += shot.y
+        self.ys += self.fall
+
+        count = len(self.frames)
+        landing = terrain.pyramid.arc(shot.x, shot.y, shot.vx, shot.vy)
+        if landing is None:
+            width = len(terrain.heightMap)
+            inside = (self.xs >= 0) & (self.xs < width)
+            count = int(np.argmin(inside)) if not inside.all() else count
+        elif abs(shot.vx) > 1e-9:
+            count = min(count, int(np.searchsorted(self.frames, (landing[0] - shot.x) / shot.vx, side="right")))
+        else:
+            below = self.ys[1:] >= landing[1]
+            if below.any():
+                count = min(count, int(np.argmax(below)) + 1)
+        self.points = [(int(x), int(y)) for x, y in zip(self.xs[:count], self.ys[:count]) if y >= 0]
+
+    def update_beam(self, tank, terrain, x, y):
+        # Same origin and direction as ProjectileSystem.launch gives a beam
+        rad = math.radians(tank.aimAngle)
+        dx, dy = math.cos(rad), -math.sin(rad)
+        hit = terrain.pyramid.ray(x, y, dx, dy)
+        length = math.hypot(hit[0] - x, hit[1] - y) if hit else math.hypot(WIDTH, HEIGHT)
+        distances = np.arange(0, length, BEAM_DOT_SPACING)
+        xs, ys = x + dx * distances, y + dy * distances
+        inside = (xs >= 0) & (xs < WIDTH) & (ys >= 0) & (ys < HEIGHT)
+        self.points = [(int(px), int(py)) for px, py in zip(xs[inside], ys[inside])]
+
+    def draw(self, screen, tank, terrain):
+        self.update(tank, terrain)
+        for point in self.points:
+            pygame.draw.circle(screen, DOT_COLOR, point, 2)
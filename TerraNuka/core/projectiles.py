@@ -0,0 +1,303 @@
+# core/projectiles.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import math
+from dataclasses import dataclass
+
+import numpy as np
+
+from .config import WIDTH, HEIGHT, GRAVITY, bounds
+from .enums import CollisionResult
+from .weapons import Weapon, WEAPON_LIST, WEAPON_IDS
+
+# Every projectile in flight lives in parallel NumPy arrays. One update()
+# integrates all of them, sub-stepping exactly like the original single
+# projectile did (one sub-step per pixel of speed, a frame cut short above
+# the screen), and tests terrain and tanks for the whole batch at once.
+
+_WARHEADS = np.array([w.warheads for w in WEAPON_LIST])
+_BOUNCES = np.array([w.bounces for w in WEAPON_LIST])
+_ROLLS = np.array([w.rolls for w in WEAPON_LIST])
+
+ROLL_FRICTION = 0.98
+ROLL_STOP = 0.3        # rollers slower than this explode where they are
+BEAM_FRAMES = 12       # how long a beam stays on screen
+
+FIELDS = {
+    "x": np.float64, "y": np.float64, "vx": np.float64, "vy": np.float64,
+    "strength": np.float64, "weapon": np.int16, "owner": np.int16,
+    "bounces": np.int16, "rolling": np.bool_, "alive": np.bool_,
+}
+
+# Collision codes used inside the arrays
+_NONE, _OFFSCREEN, _OFFTOP, _TERRAIN, _TANK = range(5)
+
+
+@dataclass
+class Impact:
+    x: float
+    y: float
+    weapon: Weapon
+    strength: float
+    owner: int
+    collision: CollisionResult
+    direction: int  # 1 if the shot was heading right when it hit, -1 if left
+
+    @property
+    def radius(self) -> float:
+        return self.weapon.explosion_radius * self.strength
+
+    @property
+    def damage(self) -> float:
+        return self.weapon.damage * self.strength
+
+    def blasts(self) -> list[tuple[float, float]]:
+        """Every blast centre of this impact: the hit itself plus any chain (diggers, sandhogs).
+
+        Sideways chains carry on the way the shot was travelling."""
+        w = self.weapon
+        return [(self.x + k * w.chain_dx * self.direction, self.y + k * w.chain_dy) for k in range(w.chain + 1)]
+
+
+class ProjectileSystem:
+    def __init__(self, capacity: int = 64):
+        self.count = 0
+        self.rng = np.random.default_rng(0)
+        self.pending = []
+        self.beams = []      # fired this frame, resolved by the next update()
+        self.flashes = []    # [x0, y0, x1, y1, weapon id, frames left] of beams on screen
+        self._allocate(capacity)
+
+    def _allocate(self, capacity: int):
+        old = self.__dict__.get("x")
+        for name, dtype in FIELDS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            if old is not None:
+                array[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, array)
+
+    @property
+    def active(self) -> bool:
+        return bool(self.beams) or bool(self.alive[:self.count].any())
+
+    def clear(self):
+        self.count = 0
+        self.alive[:] = False
+        self.beams.clear()
+        self.flashes.clear()
+
+    def spawn(self, x, y, vx, vy, weapon: Weapon, strength: float, owner: int):
+        if self.count == len(self.x):
+            # Compact dead slots away before growing
+            live = np.flatnonzero(self.alive[:self.count])
+            for name in FIELDS:
+                array = getattr(self, name)
+                array[:len(live)] = array[live]
+            self.count = len(live)
+            if self.count > len(self.x) // 2:
+                self._allocate(len(self.x) * 2)
+        i = self.count
+        self.x[i], self.y[i], self.vx[i], self.vy[i] = x, y, vx, vy
+        self.weapon[i] = WEAPON_IDS[weapon.name]
+        self.strength[i] = strength
+        self.owner[i] = owner
+        self.bounces[i] = weapon.bounces
+        self.rolling[i] = False
+        self.alive[i] = True
+        self.count += 1
+
+    def launch(self, tank, weapon: Weapon, owner: int, seed: int = 0):
+        """Fire weapon from tank. seed makes scattered sub-munitions repeatable."""
+        self.rng = np.random.default_rng(seed)
+        shot = tank.fire(tank.cannonPower)
+        if weapon.beam:
+            rad = math.radians(tank.aimAngle)
+            self.beams.append((shot.x, shot.y, math.cos(rad), -math.sin(rad), weapon, tank.strength, owner))
+        else:
+            self.spawn(shot.x, shot.y, shot.vx, shot.vy, weapon, tank.strength, owner)
+
+    def positions(self):
+        live = np.flatnonzero(self.alive[:self.count])
+        return self.x[live], self.y[live], self.weapon[live]
+
+    def update(self, terrain, tanks: list) -> list[Impact]:
+        """Advance every projectile by one frame and return this frame's impacts."""
+        for flash in self.flashes:
+            flash[5] -= 1
+        self.flashes = [flash for flash in self.flashes if flash[5] > 0]
+        impacts = [impact for beam in self.beams if (impact := self.fire_beam(*beam, terrain, tanks))]
+        self.beams.clear()
+
+        live = np.flatnonzero(self.alive[:self.count])
+        if len(live) == 0:
+            return impacts
+        heights = np.asarray(terrain.heightMap, dtype=np.float64)
+        targets = tanks.rects().tolist()
+
+        # Children are queued and spawned last: spawning may compact the arrays
+        self.pending = []
+        rolling = self.rolling[live]
+        if rolling.any():
+            impacts += self.roll(live[rolling], heights, targets, terrain.slopes)
+        live = live[~rolling]
+        if len(live) == 0:
+            return impacts
+
+        x, y = self.x[live], self.y[live]
+        vx, vy = self.vx[live], self.vy[live]
+        steps = np.maximum(np.maximum(np.abs(vx), np.abs(vy)), 1).astype(np.int64)
+        step_x, step_y = vx / steps, vy / steps
+
+        result = np.full(len(live), _NONE, dtype=np.int8)
+        moving = np.ones(len(live), dtype=bool)
+        for k in range(int(steps.max())):
+            m = moving & (steps > k)
+            if not m.any():
+                break
+            x[m] += step_x[m]
+            y[m] += step_y[m]
+
+            offscreen = m & ((x < 0) | (x >= WIDTH) | (y >= HEIGHT))
+            result[offscreen] = _OFFSCREEN
+            m &= ~offscreen
+            offtop = m & (y < 0)
+            result[offtop] = _OFFTOP
+            m &= ~offtop
+            column = np.clip(x.astype(np.int64), 0, len(heights) - 1)
+            ground = m & (y >= bounds.y2 - heights[column])
+            result[ground] = _TERRAIN
+            m &= ~ground
+            if targets:
+                px, py = np.floor(x), np.floor(y)
+                for left, top, right, bottom in targets:
+                    inside = m & (px >= left) & (px < right) & (py >= top) & (py < bottom)
+                    result[inside] = _TANK
+                    m &= ~inside
+            moving &= (result == _NONE)
+
+        old_vy = vy.copy()
+        vy += GRAVITY
+        self.x[live], self.y[live], self.vx[live], self.vy[live] = x, y, vx, vy
+
+        hit = (result == _TERRAIN) | (result == _TANK)
+        self.alive[live[result == _OFFSCREEN]] = False
+
+        # MIRV-style splits at the top of the arc
+        weapon_ids = self.weapon[live]
+        apex = ~hit & (result != _OFFSCREEN) & (_WARHEADS[weapon_ids] > 0) & (old_vy < 0) & (vy >= 0)
+        for i in live[apex]:
+            self.split(i)
+
+        # Rollers that touch the ground start rolling instead of exploding
+        landed = (result == _TERRAIN) & _ROLLS[weapon_ids]
+        grounded = live[landed]
+        self.rolling[grounded] = True
+        self.vy[grounded] = 0
+        self.y[grounded] = bounds.y2 - heights[np.clip(x[landed].astype(np.int64), 0, len(heights) - 1)] - 1
+        hit &= ~landed
+
+        # Bouncers explode and keep going until they run out of bounces
+        bounce = hit & (_BOUNCES[weapon_ids] > 0) & (self.bounces[live] > 0)
+        for j in np.flatnonzero(hit):
+            i = live[j]
+            weapon = WEAPON_LIST[self.weapon[i]]
+            collision = CollisionResult.HIT_TANK if result[j] == _TANK else CollisionResult.HIT_TERRAIN
+            impacts.append(Impact(float(x[j]), float(y[j]), weapon, float(self.strength[i]), int(self.owner[i]),
+                                  collision, -1 if vx[j] < 0 else 1))
+            if bounce[j]:
+                self.bounces[i] -= 1
+                self.vy[i] = -abs(old_vy[j]) * weapon.bounce_damping
+                self.vx[i] *= weapon.bounce_damping
+                self.y[i] -= 2
+            else:
+                self.alive[i] = False
+                if weapon.bomblets:
+                    self.scatter(i, weapon)
+        for child in self.pending:
+            self.spawn(*child)
+        return impacts
+
+    def roll(self, rollers, heights, targets, slopes) -> list[Impact]:
+        # Gravity along the slope under each roller, one slope lookup per roller
+        x, vx = self.x[rollers], self.vx[rollers]
+        column = np.clip(x.astype(np.int64), 0, len(heights) - 1)
+        slope = slopes.slope[column]
+        new_vx = (vx - GRAVITY * slope / np.sqrt(1 + slope * slope)) * ROLL_FRICTION
+        x = x + new_vx
+        offscreen = (x < 0) | (x >= WIDTH)
+        x = np.clip(x, 0, WIDTH - 1)
+        column = x.astype(np.int64)
+        y = bounds.y2 - heights[column] - 1
+        # Stop in a valley (rolled back) or when too slow to go on
+        stopped = (np.abs(new_vx) < ROLL_STOP) | (np.sign(new_vx) != np.sign(vx))
+        into_tank = np.zeros(len(rollers), dtype=bool)
+        for left, top, right, bottom in targets:
+            into_tank |= (x >= left) & (x < right) & (y >= top - 2)
+        self.x[rollers], self.y[rollers], self.vx[rollers] = x, y, new_vx
+
+        self.alive[rollers[offscreen]] = False
+        impacts = []
+        for j in np.flatnonzero(~offscreen & (stopped | into_tank)):
+            i = rollers[j]
+            self.alive[i] = False
+            collision = CollisionResult.HIT_TANK if into_tank[j] else CollisionResult.HIT_TERRAIN
+            impacts.append(Impact(float(x[j]), float(y[j]), WEAPON_LIST[self.weapon[i]],
+                                  float(self.strength[i]), int(self.owner[i]), collision, -1 if new_vx[j] < 0 else 1))
+        return impacts
+
+    def fire_beam(self, x, y, dx, dy, weapon: Weapon, strength: float, owner: int, terrain, tanks) -> Impact | None:
+        # Ground from the max pyramid, then the nearer of that and any tank but the shooter's
+        ground = terrain.pyramid.ray(x, y, dx, dy)
+        distance = math.hypot(ground[0] - x, ground[1] - y) if ground else math.inf
+        collision = CollisionResult.HIT_TERRAIN
+        for index, t in enumerate(tanks):
+            if t.active and index != owner:
+                hit = _ray_rect(x, y, dx, dy, t.x, t.y, t.x + t.width, t.y + t.height)
+                if hit is not None and hit < distance:
+                    distance, collision = hit, CollisionResult.HIT_TANK
+        if distance == math.inf:
+            # Off the screen: draw to the edge it leaves through
+            exits = [(edge - origin) / d for origin, d, edges in ((x, dx, (0, WIDTH)), (y, dy, (0, HEIGHT)))
+                     if abs(d) > 1e-9 for edge in edges if (edge - origin) / d > 0]
+            length = min(exits, default=0)
+            self.flashes.append([x, y, x + dx * length, y + dy * length, WEAPON_IDS[weapon.name], BEAM_FRAMES])
+            return None
+        end_x, end_y = x + dx * distance, y + dy * distance
+        self.flashes.append([x, y, end_x, end_y, WEAPON_IDS[weapon.name], BEAM_FRAMES])
+        return Impact(end_x, end_y, weapon, strength, owner, collision, -1 if dx < 0 else 1)
+
+    def split(self, i: int):
+        weapon = WEAPON_LIST[self.weapon[i]]
+        sub = WEAPON_LIST[WEAPON_IDS[weapon.sub_weapon]]
+        self.alive[i] = False
+        x, y, vx, vy = self.x[i], self.y[i], self.vx[i], self.vy[i]
+        strength, owner = self.strength[i], self.owner[i]
+        n = weapon.warheads
+        for k in range(n):
+            offset = (k - (n - 1) / 2) / max(1, (n - 1) / 2)
+            self.pending.append((x, y, vx + offset * weapon.spread, vy, sub, strength, owner))
+
+    def scatter(self, i: int, weapon: Weapon):
+        sub = WEAPON_LIST[WEAPON_IDS[weapon.sub_weapon]]
+        angles = self.rng.uniform(math.pi * 0.15, math.pi * 0.85, weapon.bomblets)
+        speeds = self.rng.uniform(weapon.spread * 0.4, weapon.spread, weapon.bomblets)
+        x, y = self.x[i], self.y[i] - 3
+        for angle, speed in zip(angles, speeds):
+            self.pending.append((x, y, math.cos(angle) * speed, -math.sin(angle) * speed,
+                                 sub, self.strength[i], self.owner[i]))
+
+
+def _ray_rect(x, y, dx, dy, left, top, right, bottom) -> float | None:
+    """Distance along the unit ray (dx, dy) from (x, y) to the rectangle, if it is hit."""
+    near, far = 0.0, math.inf
+    for origin, d, low, high in ((x, dx, left, right), (y, dy, top, bottom)):
+        if abs(d) < 1e-12:
+            if not low <= origin < high:
+                return None
+            continue
+        t1, t2 = (low - origin) / d, (high - origin) / d
+        near, far = max(near, min(t1, t2)), min(far, max(t1, t2))
+    return near if near <= far else None
@@ -0,0 +1,118 @@
+# core/pyramid.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import numpy as np
+
+from .config import GRAVITY, bounds
+
+# Max pyramid over the heightmap: level k holds the highest column of each
+# block of 2**k columns. Line-of-fire and arc queries walk it coarse to fine,
+# skipping every block the path clears, so a query touches O(log WIDTH) nodes
+# instead of every column. Kept current through Terrain.changed().
+#
+# Paths are tested in height coordinates (bounds.y2 - y). Over any block a
+# straight line or a falling parabola is lowest at one of the block's edges,
+# which is what makes the block test exact.
+
+
+class MaxPyramid:
+    def __init__(self, terrain):
+        self.terrain = terrain
+        self.build()
+        terrain.listeners.append(self.invalidate)
+
+    def build(self):
+        level = np.asarray(self.terrain.heightMap, dtype=np.float64)
+        self.levels = [level]
+        while len(level) > 1:
+            if len(level) % 2:
+                level = np.append(level, level[-1])
+            level = np.maximum(level[0::2], level[1::2])
+            self.levels.append(level)
+
+    def invalidate(self, left: int, right: int):
+        heights = self.terrain.heightMap
+        if len(heights) != len(self.levels[0]):
+            self.build()
+            return
+        self.levels[0][left:right] = heights[left:right]
+        for k in range(1, len(self.levels)):
+            left, right = left // 2, (right + 1) // 2
+            below = self.levels[k - 1]
+            pairs = below[2 * left:2 * right]
+            if len(pairs) % 2:
+                pairs = np.append(pairs, pairs[-1])
+            self.levels[k][left:right] = np.maximum(pairs[0::2], pairs[1::2])
+
+    def first_hit(self, lo: int, hi: int, lowest, reverse: bool = False) -> int | None:
+        """First column in [lo, hi) whose ground reaches the path; lowest(a, b) is the
+        path's lowest height over x in [a, b]. Columns are visited right to left if reverse."""
+        top = len(self.levels) - 1
+        stack = [(top, 0)]
+        while stack:
+            k, i = stack.pop()
+            a, b = max(lo, i << k), min(hi, (i + 1) << k)
+            if a >= b or lowest(a, b) > self.levels[k][i]:
+                continue
+            if k == 0:
+                return a
+            children = [(k - 1, 2 * i), (k - 1, 2 * i + 1)]
+            stack.extend(children if reverse else children[::-1])
+        return None
+
+    def ray(self, x0: float, y0: float, dx: float, dy: float):
+        """Where the ray from (x0, y0) along (dx, dy) first meets the ground, or None
+        if it leaves the screen first."""
+        width = len(self.levels[0])
+        if not 0 <= x0 < width:
+            return None
+        if abs(dx) < 1e-9:
+            ground = bounds.y2 - self.levels[0][int(x0)]
+            if y0 >= ground:
+                return x0, y0
+            return (x0, ground) if dy > 0 else None
+        slope = dy / dx
+        return self._trace(x0, dx > 0, lambda x: y0 + slope * (x - x0))
+
+    def arc(self, x0: float, y0: float, vx: float, vy: float, gravity: float = GRAVITY):
+        """Where a shot leaving (x0, y0) with velocity (vx, vy) first meets the ground,
+        or None if it leaves the side of the screen. Frame n of the shot sits at
+        x0 + n*vx, y0 + n*vy + gravity*n*(n-1)/2, the positions the game integrates.
+        The game drops part of a frame while a shot is above the screen; this does not."""
+        width = len(self.levels[0])
+        if not 0 <= x0 < width:
+            return None
+        if abs(vx) < 1e-9:
+            return x0, bounds.y2 - self.levels[0][int(x0)]
+
+        def y_at(x):
+            t = (x - x0) / vx
+            return y0 + vy * t + gravity * t * (t - 1) / 2
+
+        return self._trace(x0, vx > 0, y_at)
+
+    def _trace(self, x0: float, rightward: bool, y_at):
+        # y_at is linear or convex, so over [a, b] the path is lowest (largest y) at an edge
+        width = len(self.levels[0])
+        if rightward:
+            column = self.first_hit(int(x0), width, lambda a, b: bounds.y2 - max(y_at(max(a, x0)), y_at(b)))
+        else:
+            column = self.first_hit(0, int(x0) + 1, lambda a, b: bounds.y2 - max(y_at(a), y_at(min(b, x0))),
+                                    reverse=True)
+        if column is None:
+            return None
+        ground = bounds.y2 - self.levels[0][column]
+        # Bisect between the column's edges for the crossing
+        a, b = (max(column, x0), column + 1) if rightward else (min(column + 1, x0), column)
+        if y_at(a) >= ground:
+            return a, y_at(a)
+        for _ in range(20):
+            mid = (a + b) / 2
+            if y_at(mid) >= ground:
+                b = mid
+            else:
+                a = mid
+        return b, y_at(b)
@@ -0,0 +1,241 @@
+# core/simulation.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import struct
+import zlib
+from dataclasses import dataclass, field
+from typing import ClassVar
+
+import numpy as np
+
+from .config import WIDTH, GameConfig, bounds
+from .enums import CollisionResult
+from .entities import Tank
+from .physics import apply_terrain_effect
+from .projectiles import Impact
+from .weapons import WEAPON_IDS, WEAPON_LIST, STARTING_INVENTORY, take_weapon
+
+# Deterministic turn resolution. Given the same state and the same TurnInput
+# every machine ends up with bit-identical terrain and tanks, which is what
+# lockstep play and headless matches rely on. Nothing here reads the clock.
+
+MAX_SHOT_FRAMES = 3000
+MOVE_STEP = 0.1
+FUEL_PER_MOVE = 0.001
+SAFE_FALL = 8          # px a tank can drop without harm
+FALL_DAMAGE = 0.5      # health per px fallen beyond that
+
+
+@dataclass
+class TurnInput:
+    angle: int          # aimAngle in degrees, 0..180
+    power: int          # cannonPower in tenths, 0..1000
+    move: int = 0       # net movement in MOVE_STEP units, negative is left
+    move_frames: int = 0  # frames spent driving, each burns FUEL_PER_MOVE
+    weapon: int = 0     # index into weapons.WEAPON_LIST
+    fire: bool = True
+
+    FORMAT: ClassVar[struct.Struct] = struct.Struct("<BHhHB?")
+
+    def pack(self) -> bytes:
+        return self.FORMAT.pack(self.angle, self.power, self.move, self.move_frames, self.weapon, self.fire)
+
+    @classmethod
+    def unpack(cls, data: bytes) -> "TurnInput":
+        return cls(*cls.FORMAT.unpack(data))
+
+
+@dataclass
+class TurnStart:
+    tank_index: int
+    x: float
+    fuel: float
+
+
+@dataclass
+class ShotResult:
+    path: list[tuple[float, float]] = field(default_factory=list)  # first projectile in flight each frame
+    collision: CollisionResult = CollisionResult.NO_COLLISION     # of the first impact
+    impact: tuple[int, int] | None = None
+    impacts: int = 0
+
+
+def new_match(g, config: GameConfig, names: list[str] | None = None, heights: list[int] | None = None):
+    """Reset the shared state in g to the start of a match described by config.
+
+    heights, if given, must be what config's terrain generates (e.g. the menu preview).
+    """
+    g.terrain.seed = int(config.terrain_seed)
+    g.terrain.min_height, g.terrain.max_height = (int(h) for h in config.terrain_bounds)
+    g.terrain.generator = int(config.terrain_generator)
+    g.terrain.heightMap = list(heights) if heights is not None else g.terrain.generate_terrain()
+    g.terrain.changed()
+
+    g.tanks.clear()
+    for i in range(config.player_count):
+        tank = Tank(
+            height=12,
+            width=24,
+            name=names[i] if names else f"Player {i + 1}",
+            color=tuple(config.player_colors[i % len(config.player_colors)]),
+            fuel=float(config.tank_fuel_start),
+            health=float(config.tank_health),
+            max_health=float(config.tank_health),
+            strength=config.tank_strength,
+            explosionStrength=config.tank_explosion_radius,
+            x=(WIDTH // (config.player_count + 1)) * (i + 1),
+        )
+        tank.cannonColor = tuple(255 - c for c in tank.color)
+        tank.inventory.update(STARTING_INVENTORY)
+        tank.y = bounds.y2 - tank.height - tank.bottomCollide(g.terrain.heightMap)
+        g.tanks.append(tank)
+
+    g.active_tank_index = 0
+    g.projectiles.clear()
+    g.liquids.clear()
+    g.shot_in_flight = False
+    g.Pending_Explosion = None
+    g.Pending_Explosion_Next.clear()
+    g.turn_number = 0
+    g.turn_start = None
+
+
+def next_active_index(g) -> int | None:
+    """Index of the tank whose turn it is, or None once a single tank (or none) is left."""
+    if sum(t.active for t in g.tanks) <= 1:
+        return None
+    index = g.active_tank_index
+    while not g.tanks[index].active:
+        index = (index + 1) % len(g.tanks)
+    return index
+
+
+def begin_turn(tanks: list, tank_index: int) -> TurnStart:
+    tank = tanks[tank_index]
+    return TurnStart(tank_index, tank.x, tank.fuel)
+
+
+def capture_input(tank, start: TurnStart) -> TurnInput:
+    return TurnInput(
+        angle=int(tank.aimAngle),
+        power=int(round(tank.cannonPower * 10)),
+        move=int(round((tank.x - start.x) / MOVE_STEP)),
+        move_frames=int(round((start.fuel - tank.fuel) / FUEL_PER_MOVE)),
+        weapon=WEAPON_IDS[tank.current_weapon],
+    )
+
+
+def apply_input(tank, turn_input: TurnInput, start: TurnStart, terrain_heights=None):
+    # Rebuild the turn from the recorded start so every peer computes the
+    # same floats, whatever key-repeat path the local player took.
+    tank.aimAngle = turn_input.angle
+    tank.cannonPower = turn_input.power / 10
+    tank.x = start.x + turn_input.move * MOVE_STEP
+    tank.fuel = start.fuel - turn_input.move_frames * FUEL_PER_MOVE
+    tank.current_weapon = WEAPON_LIST[turn_input.weapon].name
+    tank.y = bounds.y2 - tank.height - tank.bottomCollide(terrain_heights)
+
+
+def detonate(g, impact: Impact):
+    for x, y in impact.blasts():
+        for t in g.tanks.blast(x, y, impact.radius, impact.damage):
+            if t.active:
+                t.explode(g.Pending_Explosion_Next, g.audio)
+        shape_terrain(g, impact.weapon.effect, int(x), int(y), impact.radius)
+        pour_liquid(g, impact, x)
+    drain_tank_explosions(g)
+
+
+def shape_terrain(g, effect, x: int, y: int, radius: float):
+    apply_terrain_effect(g.terrain.writable(), effect, x, y, radius)
+    g.terrain.changed(x - int(radius) - 1, x + int(radius) + 2)
+    land_tanks(g)
+
+
+def pour_liquid(g, impact: Impact, x: float):
+    if impact.weapon.liquid:
+        g.liquids.pour(impact.weapon.effect, x, impact.weapon.liquid * impact.strength, impact.weapon.heat)
+
+
+def flow_liquids(g):
+    # Only setting mud writes the heightmap, so only then may a fork's copy be needed
+    span = g.liquids.update(g.terrain.writable() if g.liquids.has_mud else g.terrain.heightMap)
+    if span:
+        g.terrain.changed(*span)
+        land_tanks(g)
+    burn_tanks(g)
+
+
+def burn_tanks(g):
+    """One tick of napalm damage to every tank standing in it."""
+    if not g.liquids.active:
+        return
+    for t in g.tanks.living():
+        if t.health > 0:
+            t.health = max(0, t.health - g.liquids.exposure(t.x, t.x + t.width))
+            if t.health <= 0:
+                t.explode(g.Pending_Explosion_Next, g.audio)
+
+
+def drain_tank_explosions(g):
+    while g.Pending_Explosion_Next:
+        impact_x, impact_y, radius, _, origin, effect = g.Pending_Explosion_Next.pop(0)
+        shape_terrain(g, effect, impact_x, impact_y, radius)
+        if origin:
+            origin.active = False
+
+
+def land_tanks(g):
+    """Drop tanks the ground was taken from straight to where they land, with fall damage.
+
+    The fall itself is only ever shown (core.tween); nothing waits for it.
+    """
+    drops = g.tanks.land(g.terrain.heightMap, bounds.y2)
+    for i in np.flatnonzero(drops > SAFE_FALL):
+        t = g.tanks[i]
+        if t.health > 0:
+            t.health = max(0, t.health - int(FALL_DAMAGE * (drops[i] - SAFE_FALL)))
+            if t.health <= 0:
+                t.explode(g.Pending_Explosion_Next, g.audio)
+
+
+def resolve_shot(g, tank, seed: int = 0) -> ShotResult:
+    """Fly the tank's current weapon until every projectile it spawns has landed
+    and any liquid it spilled has burnt out or set.
+
+    seed drives scattered sub-munitions; lockstep peers pass the turn number.
+    """
+    g.projectiles.clear()
+    g.projectiles.launch(tank, take_weapon(tank), g.tanks.index(tank), seed)
+    shot = ShotResult()
+    for _ in range(MAX_SHOT_FRAMES):
+        impacts = g.projectiles.update(g.terrain, g.tanks)
+        xs, ys, _ = g.projectiles.positions()
+        if len(xs):
+            shot.path.append((float(xs[0]), float(ys[0])))
+        for impact in impacts:
+            if shot.impact is None:
+                shot.collision = impact.collision
+                shot.impact = (int(impact.x), int(impact.y))
+            shot.impacts += 1
+            detonate(g, impact)
+        flow_liquids(g)
+        drain_tank_explosions(g)
+        if not g.projectiles.active and not g.liquids.active:
+            break
+    g.projectiles.clear()
+    g.liquids.clear()
+    return shot
+
+
+def state_checksum(g) -> int:
+    heights = g.terrain.heightMap
+    crc = zlib.crc32(struct.pack(f"<{len(heights)}d", *heights))
+    for tank in g.tanks:
+        crc = zlib.crc32(struct.pack(
+            "<6d?", tank.x, tank.y, tank.health, tank.fuel, tank.aimAngle, tank.cannonPower, tank.active
+        ), crc)
+    return zlib.crc32(struct.pack("<I", g.active_tank_index), crc)
@@ -0,0 +1,55 @@
+# core/slopes.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import numpy as np
+
+# Per-column slope and surface normal of the heightmap. Built once per
+# terrain and refreshed only over the span a Terrain.changed() call reports,
+# so rollers and tank movement get O(1) lookups instead of differencing the
+# heightmap on every step.
+#
+# slope is d(height)/dx: positive where the ground rises to the right.
+# normal points out of the ground in screen coordinates (y down).
+
+
+class SlopeField:
+    def __init__(self, terrain):
+        self.terrain = terrain
+        n = len(terrain.heightMap)
+        self.slope = np.zeros(n)
+        self.normal_x = np.zeros(n)
+        self.normal_y = np.full(n, -1.0)
+        terrain.listeners.append(self.invalidate)
+        self.invalidate(0, n)
+
+    def invalidate(self, left: int, right: int):
+        heights = self.terrain.heightMap
+        n = len(heights)
+        if n != len(self.slope):
+            self.resize(n)  # heightMap was replaced by one of another width
+            left, right = 0, n
+        # Central differences need one neighbour either side of the span
+        a, b = max(0, left - 1), min(n, right + 1)
+        h = np.asarray(heights[max(0, a - 1):min(n, b + 1)], dtype=np.float64)
+        offset = a - max(0, a - 1)
+        gradient = np.gradient(h) if len(h) > 1 else np.zeros(len(h))
+        slope = gradient[offset:offset + (b - a)]
+        length = np.sqrt(1 + slope * slope)
+        self.slope[a:b] = slope
+        self.normal_x[a:b] = -slope / length
+        self.normal_y[a:b] = -1 / length
+
+    def resize(self, n: int):
+        self.slope = np.zeros(n)
+        self.normal_x = np.zeros(n)
+        self.normal_y = np.full(n, -1.0)
+
+    def slope_at(self, x: float) -> float:
+        return float(self.slope[min(len(self.slope) - 1, max(0, int(x)))])
+
+    def normal_at(self, x: float) -> tuple[float, float]:
+        i = min(len(self.slope) - 1, max(0, int(x)))
+        return float(self.normal_x[i]), float(self.normal_y[i])
@@ -0,0 +1,244 @@
+# core/snapshot.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import copy
+import struct
+import zlib
+from dataclasses import astuple, dataclass, field
+
+import numpy as np
+
+from .audio import AudioBus
+from .entities import Tank, TankStore
+from .enums import WeaponEffect
+from .liquids import LiquidField
+from .projectiles import FIELDS, ProjectileSystem
+from .simulation import TurnStart
+from .terrain import Terrain
+from .weapons import WEAPON_LIST, WEAPON_IDS
+
+# Match state outside of core.globals. snapshot()/restore() turn everything
+# the simulation reads into a compressed blob for save and resume (turn
+# overlays, fireworks and the aim preview are rebuilt by main.py). fork()
+# gives an in-memory copy for look-ahead search: the tank arrays are copied,
+# but the heightmap and its slope and pyramid caches are shared until the
+# fork first writes terrain (see Terrain.writable).
+
+MAGIC = b"TNK1"
+
+_HEADER = struct.Struct("<4sIIHB?")        # magic, turn, active index, tanks, heights dtype, mid-turn
+_TURN_START = struct.Struct("<Bdd")
+_TANK = struct.Struct("<2H12d?i3B3BHB")    # size, numbers, active, money, colors, name length, weapon
+_SLOT = struct.Struct("<BH")               # inventory (weapon id, count)
+_PENDING = struct.Struct("<dddibB")        # x, y, radius, timer, origin tank (-1: none), effect
+_LIQUIDS = struct.Struct("<iiI")
+_RNG = struct.Struct("<16s16s?Q")
+
+_TANK_NUMBERS = (
+    "height", "width", "x", "y", "cannonRelX", "cannonRelY", "cannonLen", "cannonPower",
+    "aimAngle", "health", "max_health", "strength", "explosionStrength", "fuel",
+)
+_EFFECTS = list(WeaponEffect)
+_HEIGHT_TYPES = [np.int16, np.float64]
+
+
+@dataclass
+class MatchState:
+    """Everything the simulation functions read from g, for a forked match."""
+    terrain: Terrain
+    tanks: TankStore
+    projectiles: ProjectileSystem = field(default_factory=ProjectileSystem)
+    liquids: LiquidField = field(default_factory=LiquidField)
+    Pending_Explosion: tuple | None = None
+    Pending_Explosion_Next: list = field(default_factory=list)
+    active_tank_index: int = 0
+    turn_number: int = 0
+    turn_start: TurnStart | None = None
+    shot_in_flight: bool = False
+    audio: AudioBus | None = None
+
+
+def fork(g) -> MatchState:
+    """A copy of g's match that can be played forward without touching g.
+
+    g's terrain must not be written while the fork is in use."""
+    tanks = g.tanks.copy()
+    remap = {id(old): new for old, new in zip(g.tanks, tanks)}
+
+    def pending(blast):
+        return blast[:4] + (remap.get(id(blast[4])),) + blast[5:]
+
+    state = MatchState(
+        terrain=g.terrain.fork(),
+        tanks=tanks,
+        Pending_Explosion=pending(g.Pending_Explosion) if g.Pending_Explosion else None,
+        Pending_Explosion_Next=[pending(blast) for blast in g.Pending_Explosion_Next],
+        active_tank_index=g.active_tank_index,
+        turn_number=g.turn_number,
+        turn_start=g.turn_start,
+        shot_in_flight=g.shot_in_flight,
+    )
+    # Idle between turns, which is when search forks; copied only mid-shot
+    if g.projectiles.active or g.projectiles.flashes:
+        state.projectiles = copy.deepcopy(g.projectiles)
+    if g.liquids.active:
+        state.liquids = copy.deepcopy(g.liquids)
+    return state
+
+
+def snapshot(g) -> bytes:
+    """Serialize g's match to a compact, self-contained blob (see restore)."""
+    heights = np.asarray(g.terrain.heightMap)
+    integral = bool(np.all(heights == np.rint(heights))) and heights.min() >= -32768 and heights.max() < 32768
+    height_type = 0 if integral else 1
+    out = [_HEADER.pack(MAGIC, g.turn_number, g.active_tank_index, len(g.tanks), height_type,
+                        g.turn_start is not None)]
+    if g.turn_start is not None:
+        out.append(_TURN_START.pack(*astuple(g.turn_start)))
+    out.append(struct.pack("<I", len(heights)))
+    out.append(heights.astype(_HEIGHT_TYPES[height_type]).tobytes())
+
+    for t in g.tanks:
+        name = t.name.encode("utf-8")[:255]
+        out.append(_TANK.pack(int(t.height), int(t.width), *(float(getattr(t, n)) for n in _TANK_NUMBERS[2:]),
+                              t.active, int(t.money),
+                              *t.color, *t.cannonColor, len(name), WEAPON_IDS[t.current_weapon]))
+        out.append(name)
+        slots = [(WEAPON_IDS[w], count) for w, count in t.inventory.items() if count]
+        out.append(struct.pack("<B", len(slots)))
+        out.extend(_SLOT.pack(*slot) for slot in slots)
+
+    blasts = ([g.Pending_Explosion] if g.Pending_Explosion else []) + list(g.Pending_Explosion_Next)
+    out.append(struct.pack("<?H", g.Pending_Explosion is not None, len(blasts)))
+    for x, y, radius, timer, origin, effect in blasts:
+        index = next((i for i, t in enumerate(g.tanks) if t is origin), -1)
+        out.append(_PENDING.pack(x, y, radius, int(timer), index, _EFFECTS.index(effect)))
+
+    out.append(_pack_projectiles(g.projectiles))
+    out.append(_pack_liquids(g.liquids))
+    return zlib.compress(b"".join(out), 6)
+
+
+def restore(g, blob: bytes):
+    """Put the match saved by snapshot() back into g (the globals module or a MatchState)."""
+    data = memoryview(zlib.decompress(blob))
+    pos = 0
+
+    def take(layout):
+        nonlocal pos
+        values = layout.unpack_from(data, pos)
+        pos += layout.size
+        return values
+
+    def take_bytes(size):
+        nonlocal pos
+        chunk = bytes(data[pos:pos + size])
+        pos += size
+        return chunk
+
+    magic, turn, active, tank_count, height_type, mid_turn = take(_HEADER)
+    if magic != MAGIC:
+        raise ValueError("Not a TerraNuka snapshot")
+    turn_start = TurnStart(*take(_TURN_START)) if mid_turn else None
+    (width,) = take(struct.Struct("<I"))
+    dtype = np.dtype(_HEIGHT_TYPES[height_type])
+    heights = np.frombuffer(take_bytes(width * dtype.itemsize), dtype=dtype)
+
+    tanks = []
+    for _ in range(tank_count):
+        *numbers, active_flag, money, r, gr, b, cr, cg, cb, name_len, weapon = take(_TANK)
+        values = dict(zip(_TANK_NUMBERS, numbers))
+        y = values.pop("y")
+        tank = Tank(**values, name=take_bytes(name_len).decode("utf-8"), color=(r, gr, b),
+                    cannonColor=(cr, cg, cb), active=active_flag, money=money,
+                    current_weapon=WEAPON_LIST[weapon].name)
+        tank.y = y
+        (slots,) = take(struct.Struct("<B"))
+        for _ in range(slots):
+            weapon_id, count = take(_SLOT)
+            tank.inventory[WEAPON_LIST[weapon_id].name] = count
+        tanks.append(tank)
+
+    has_current, count = take(struct.Struct("<?H"))
+    blasts = []
+    for _ in range(count):
+        x, y, radius, timer, origin, effect = take(_PENDING)
+        blasts.append((x, y, radius, timer, tanks[origin] if origin >= 0 else None, _EFFECTS[effect]))
+
+    pos = _unpack_projectiles(g.projectiles, data, pos)
+    pos = _unpack_liquids(g.liquids, data, pos)
+
+    g.terrain.writable()  # a fork restored into gets caches of its own
+    g.terrain.heightMap = heights.tolist()
+    g.terrain.changed()
+    g.tanks.clear()
+    g.tanks.extend(tanks)
+    g.Pending_Explosion = blasts.pop(0) if has_current else None
+    g.Pending_Explosion_Next[:] = blasts
+    g.active_tank_index = active
+    g.turn_number = turn
+    g.turn_start = turn_start
+    g.shot_in_flight = g.projectiles.active or g.liquids.active
+
+
+def _pack_projectiles(projectiles: ProjectileSystem) -> bytes:
+    state = projectiles.rng.bit_generator.state
+    inner = state["state"]
+    out = [_RNG.pack(inner["state"].to_bytes(16, "little"), inner["inc"].to_bytes(16, "little"),
+                     bool(state["has_uint32"]), state["uinteger"]),
+           struct.pack("<H", projectiles.count)]
+    for name in FIELDS:
+        out.append(getattr(projectiles, name)[:projectiles.count].tobytes())
+    return b"".join(out)
+
+
+def _unpack_projectiles(projectiles: ProjectileSystem, data, pos: int) -> int:
+    rng_state, inc, has_uint32, uinteger = _RNG.unpack_from(data, pos)
+    pos += _RNG.size
+    projectiles.clear()
+    projectiles.rng = np.random.default_rng()
+    projectiles.rng.bit_generator.state = {
+        "bit_generator": "PCG64",
+        "state": {"state": int.from_bytes(rng_state, "little"), "inc": int.from_bytes(inc, "little")},
+        "has_uint32": int(has_uint32),
+        "uinteger": uinteger,
+    }
+    (count,) = struct.unpack_from("<H", data, pos)
+    pos += 2
+    columns = {}
+    for name, dtype in FIELDS.items():
+        size = count * np.dtype(dtype).itemsize
+        columns[name] = np.frombuffer(data[pos:pos + size], dtype=dtype)
+        pos += size
+    if count:
+        if len(projectiles.x) < count:
+            projectiles._allocate(count)
+        for name, column in columns.items():
+            getattr(projectiles, name)[:count] = column
+        projectiles.count = count
+    return pos
+
+
+def _pack_liquids(liquids: LiquidField) -> bytes:
+    lo, hi = (liquids.lo, liquids.hi) if liquids.active else (0, 0)
+    out = [_LIQUIDS.pack(lo, hi, liquids.mud_age)]
+    for layer in (liquids.fire, liquids.heat, liquids.mud):
+        out.append(layer[lo:hi].tobytes())
+    return b"".join(out)
+
+
+def _unpack_liquids(liquids: LiquidField, data, pos: int) -> int:
+    lo, hi, mud_age = _LIQUIDS.unpack_from(data, pos)
+    pos += _LIQUIDS.size
+    liquids.clear()
+    for layer in (liquids.fire, liquids.heat, liquids.mud):
+        size = (hi - lo) * 8
+        layer[lo:hi] = np.frombuffer(data[pos:pos + size], dtype=np.float64)
+        pos += size
+    if lo < hi:
+        liquids.lo, liquids.hi = lo, hi
+    liquids.mud_age = mud_age
+    return pos
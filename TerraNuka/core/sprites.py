@@ -0,0 +1,80 @@
+# core/sprites.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import math
+
+import numpy as np
+import pygame
+
+# Pre-rendered tank pieces: a body per color and size, a barrel per color,
+# length and whole-degree aim, and a health bar per fill width (one of 31).
+# Each is drawn once, the first time it is needed; a frame is then a single
+# Surface.blits call with three blits per tank, positions computed straight
+# from the TankStore arrays.
+
+BAR_WIDTH, BAR_HEIGHT = 30, 6
+BAR_OFFSET = 38        # bar top, above the tank's top
+BAR_BACK, BAR_FILL, BAR_EDGE = (80, 80, 80), (0, 255, 0), (180, 180, 180)
+BARREL_WIDTH = 3
+
+
+class TankSprites:
+    def __init__(self):
+        self.bodies = {}
+        self.barrels = {}
+        self.bars = {}
+
+    def body(self, color, width: int, height: int) -> pygame.Surface:
+        key = (color, width, height)
+        sprite = self.bodies.get(key)
+        if sprite is None:
+            sprite = self.bodies[key] = pygame.Surface((width, height))
+            sprite.fill(color)
+        return sprite
+
+    def barrel(self, color, angle: int, length: int) -> pygame.Surface:
+        """Barrel at angle on a square sprite whose centre is the pivot."""
+        key = (color, angle, length)
+        sprite = self.barrels.get(key)
+        if sprite is None:
+            half = length + BARREL_WIDTH
+            sprite = self.barrels[key] = pygame.Surface((2 * half, 2 * half), pygame.SRCALPHA)
+            rad = math.radians(angle)
+            end = (half + math.cos(rad) * length, half - math.sin(rad) * length)
+            pygame.draw.line(sprite, color, (half, half), end, BARREL_WIDTH)
+        return sprite
+
+    def bar(self, fill_width: int) -> pygame.Surface:
+        sprite = self.bars.get(fill_width)
+        if sprite is None:
+            sprite = self.bars[fill_width] = pygame.Surface((BAR_WIDTH + 1, BAR_HEIGHT + 1), pygame.SRCALPHA)
+            pygame.draw.rect(sprite, BAR_BACK, (1, 1, BAR_WIDTH, BAR_HEIGHT))
+            pygame.draw.rect(sprite, BAR_FILL, (1, 1, fill_width, BAR_HEIGHT))
+            pygame.draw.rect(sprite, BAR_EDGE, (0, 0, BAR_WIDTH + 1, BAR_HEIGHT + 1), 1)
+        return sprite
+
+    def draw(self, screen, tanks, shown_y):
+        """Draw every active tank in tanks (a TankStore), each at its shown_y."""
+        n = len(tanks)
+        live = np.flatnonzero(tanks.active[:n])
+        if len(live) == 0:
+            return
+        x = tanks.x[live].astype(np.int64)
+        y = np.asarray(shown_y[:n])[live].astype(np.int64)
+        width, height = tanks.width[live], tanks.height[live]
+        length = tanks.cannonLen[live].astype(np.int64)
+        ratio = np.clip(tanks.health[live] / tanks.max_health[live], 0, 1)
+        fill = (BAR_WIDTH * ratio).astype(np.int64)
+        bar_x = x + width // 2 - BAR_WIDTH // 2 - 1
+
+        batch = []
+        for j, i in enumerate(live):
+            half = length[j] + BARREL_WIDTH
+            batch.append((self.body(tanks.color[i], int(width[j]), int(height[j])), (x[j], y[j])))
+            batch.append((self.barrel(tanks.cannonColor[i], int(tanks.aimAngle[i]), int(length[j])),
+                          (x[j] - half, y[j] - half)))
+            batch.append((self.bar(int(fill[j])), (bar_x[j], y[j] - BAR_OFFSET - 1)))
+        screen.blits(batch, False)
@@ -4,11 +4,16 @@
 if __name__ == "__main__":
     raise RuntimeError("This module is not meant to be run directly.")
 
+import copy
 import random
 from dataclasses import dataclass, field
-from noise import pnoise1
+
+import numpy as np
 
 from .config import WIDTH
+from .perlin import GENERATORS, pnoise1, gradient_fbm
+from .slopes import SlopeField
+from .pyramid import MaxPyramid
 
 @dataclass
 class Terrain:
@@ -19,37 +24,80 @@ class Terrain:
     min_height: int = 10
     scale = 360
     octaves = 3
+    generator: int = 1   # core.perlin.GENERATORS; keep 1 for heightmaps that match older seeds
+    version: int = field(init=False, default=0)
+    listeners: list = field(init=False, default_factory=list, repr=False)
+    shared: bool = field(init=False, default=False, repr=False)
 
     def __post_init__(self):
         self.heightMap = self.generate_terrain()
         self.color = (40, 180, 0)  # Default color
+        self.slopes = SlopeField(self)
+        self.pyramid = MaxPyramid(self)
+
+    def changed(self, left: int = 0, right: int | None = None):
+        """Call after writing heightMap[left:right]; derived caches refresh only that span."""
+        left = max(0, int(left))
+        right = len(self.heightMap) if right is None else min(len(self.heightMap), int(right))
+        if left >= right:
+            return
+        self.version += 1
+        for listener in self.listeners:
+            listener(left, right)
+
+    def fork(self) -> "Terrain":
+        """A terrain that shares this one's heightMap and caches until it is first written.
+
+        The parent must not be written while forks of it are in use."""
+        child = copy.copy(self)
+        child.listeners = []
+        child.shared = True
+        return child
+
+    def writable(self) -> list[int]:
+        """heightMap, copied first if it is still shared with the terrain this was forked from."""
+        if self.shared:
+            self.heightMap = self.heightMap[:]
+            self.shared = False
+            self.slopes = SlopeField(self)
+            self.pyramid = MaxPyramid(self)
+        return self.heightMap
 
     def scramble_seed(self, seed: int) -> int:
-        seed ^= (seed << 13) & 0xFFFFFFFF
-        seed ^= (seed >> 17)
-        seed ^= (seed << 5) & 0xFFFFFFFF
-        return seed
+        return scramble_seed(seed)
 
     def generate_terrain(self):
         if self.seed is None:
             self.seed = random.randint(-49999, 50000)
-        scrambled = self.scramble_seed(self.seed)
-        offset = ((scrambled // 1000) % 100) / 10.0
-        octaves = 4 + (scrambled % 6)
-
-        tempTerrain = []
-        for x in range(WIDTH):
-            noise_val = pnoise1((x + offset) / self.scale + self.seed, octaves=octaves)
-            tempTerrain.append(noise_val)
-
-        min_val = min(tempTerrain)
-        max_val = max(tempTerrain)
-        val_range = max_val - min_val if max_val != min_val else 1
-
-        terrain = []
-        for raw in tempTerrain:
-            normalized = (raw - min_val) / val_range
-            height = int(self.min_height + normalized * (self.max_height - self.min_height))
-            terrain.append(height)
-
-        return terrain
+        return generate_heights(self.seed, self.min_height, self.max_height, self.scale, self.generator)
+
+
+def scramble_seed(seed: int) -> int:
+    seed ^= (seed << 13) & 0xFFFFFFFF
+    seed ^= (seed >> 17)
+    seed ^= (seed << 5) & 0xFFFFFFFF
+    return seed
+
+
+def terrain_noise(seed: int, start: int, stop: int, scale: int = Terrain.scale, generator: int = 1):
+    """Raw noise of columns [start, stop) of a seed's terrain, before normalization."""
+    scrambled = scramble_seed(seed)
+    offset = ((scrambled // 1000) % 100) / 10.0
+    octaves = 4 + (scrambled % 6)
+    xs = (np.arange(start, stop) + offset) / scale
+    if generator == 1:
+        return pnoise1(xs + seed, octaves=octaves)
+    if generator == 2:
+        return gradient_fbm(xs, octaves, scrambled)
+    raise ValueError(f"Unknown terrain generator {generator}; known: {GENERATORS}")
+
+
+def generate_heights(seed: int, min_height: int, max_height: int, scale: int = Terrain.scale,
+                     generator: int = 1, width: int = WIDTH) -> list[int]:
+    """The heightmap a Terrain with these settings generates. Touches no shared state,
+    so the setup menu can call it from a worker thread."""
+    raw = terrain_noise(seed, 0, width, scale, generator)
+    min_val, max_val = raw.min(), raw.max()
+    val_range = max_val - min_val if max_val != min_val else 1
+    normalized = (raw - min_val) / val_range
+    return (min_height + normalized * (max_height - min_height)).astype(int).tolist()
@@ -0,0 +1,39 @@
+# core/tween.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+import numpy as np
+
+from .config import GRAVITY
+
+# Where tanks are drawn, as opposed to where they are. The simulation lands a
+# tank the moment the ground under it goes (simulation.land_tanks); this
+# lets the drawn tank drop after it under gravity. Purely cosmetic: nothing
+# reads it back, and headless runs never create one.
+
+
+class FallTween:
+    def __init__(self):
+        self.views = None
+        self.y = np.zeros(0)
+        self.vy = np.zeros(0)
+
+    def update(self, tanks) -> np.ndarray:
+        """Advance one frame and return the drawn y of every tank in tanks."""
+        n = len(tanks)
+        target = tanks.y[:n]
+        if tanks.views is not self.views or len(self.y) != n:
+            # A new match (or new tanks): start where they are
+            self.views = tanks.views
+            self.y = target.copy()
+            self.vy = np.zeros(n)
+            return self.y
+        self.vy += GRAVITY
+        self.y += self.vy
+        # Landed, or moved up (new dirt, driving uphill): snap to the real position
+        done = self.y >= target
+        self.y[done] = target[done]
+        self.vy[done] = 0
+        return self.y
@@ -0,0 +1,111 @@
+# core/weapons.py
+
+
+if __name__ == "__main__":
+    raise RuntimeError("This module is not meant to be run directly.")
+
+from dataclasses import dataclass
+
+from .enums import WeaponEffect
+
+# Every weapon is plain data: the projectile engine reads these fields and
+# never special-cases a weapon by name. Radius and damage are multiples of
+# the firing tank's strength, so GameConfig.tank_strength scales them all.
+
+
+@dataclass(frozen=True)
+class Weapon:
+    name: str
+    cost: int
+    damage: float = 1.0
+    explosion_radius: float = 1.0
+    color: tuple = (255, 255, 255)
+    effect: WeaponEffect = WeaponEffect.EXPLODE
+    warheads: int = 0          # split into this many sub_weapon at the top of the arc
+    bomblets: int = 0          # scatter this many sub_weapon on impact
+    sub_weapon: str | None = None
+    spread: float = 0.0        # horizontal speed spread of warheads / max bomblet speed
+    bounces: int = 0           # explode and bounce this many times before the last impact
+    bounce_damping: float = 0.6
+    rolls: bool = False        # roll along the ground after landing, explode where it stops
+    beam: bool = False         # hits instantly along the aim line instead of flying
+    chain: int = 0             # extra blasts stepped along (chain_dx, chain_dy), e.g. diggers
+    chain_dx: float = 0.0
+    chain_dy: float = 0.0
+    preview_ms: int = 333      # how long the main loop shows the blast before cratering
+    liquid: float = 0.0        # BURN / FLOW: volume spilled, per unit of tank strength
+    heat: float = 0.0          # BURN: damage per tick per pixel of napalm depth
+
+
+ALL_WEAPONS = ["Baby Missile", "Nuke",
+"Leap Frog","Funky Bomb","MIRV","Death's Head", "Napalm",
+"Hot Napalm","Tracer","Smoke Tracer", "Baby Roller",
+"Roller","Heavy Roller", "Riot Charge", "Riot Blast",
+"Riot Bomb","Heavy Riot Bomb","Baby Digger", "Digger",
+"Heavy Digger","Baby Sandhog","Sandhog","Heavy Sandhog",
+"Dirt Clod","Dirt Ball","Ton of Dirt","Liquid Dirt",
+"Dirt Charge","Earth Disrupter","Plasma Blast","Laser"]
+
+_weapons = [
+    Weapon("Baby Missile", 0, 1.0, 1.0, (0, 255, 255)),
+    Weapon("Nuke", 100, 6.5, 4.0, (255, 128, 0), preview_ms=600),
+    Weapon("Leap Frog", 40, 1.2, 1.3, (120, 255, 120), bounces=2),
+    Weapon("Funky Bomb", 60, 1.0, 1.5, (255, 0, 255), bomblets=8, sub_weapon="Funky Bomblet", spread=6.0),
+    Weapon("MIRV", 70, 1.0, 1.0, (255, 60, 60), warheads=5, sub_weapon="MIRV Warhead", spread=4.0),
+    Weapon("Death's Head", 120, 1.0, 1.0, (200, 200, 200), warheads=9, sub_weapon="Death's Head Warhead", spread=6.0),
+    Weapon("Napalm", 50, 0.2, 1.0, (255, 90, 0), effect=WeaponEffect.BURN, liquid=40, heat=0.02),
+    Weapon("Hot Napalm", 80, 0.3, 1.0, (255, 40, 0), effect=WeaponEffect.BURN, liquid=50, heat=0.04),
+    Weapon("Tracer", 1, 0.0, 0.0, (255, 255, 255), effect=WeaponEffect.NONE),
+    Weapon("Smoke Tracer", 2, 0.0, 0.0, (160, 160, 160), effect=WeaponEffect.NONE),
+    Weapon("Baby Roller", 20, 1.0, 1.2, (180, 180, 255), rolls=True),
+    Weapon("Roller", 35, 1.5, 1.8, (140, 140, 255), rolls=True),
+    Weapon("Heavy Roller", 55, 2.5, 2.5, (100, 100, 255), rolls=True),
+    Weapon("Riot Charge", 15, 0.0, 1.5, (255, 255, 160)),
+    Weapon("Riot Blast", 20, 0.0, 2.2, (255, 255, 120)),
+    Weapon("Riot Bomb", 30, 0.0, 2.8, (255, 255, 80)),
+    Weapon("Heavy Riot Bomb", 45, 0.0, 3.6, (255, 255, 40)),
+    Weapon("Baby Digger", 10, 0.2, 0.8, (160, 110, 60), chain=3, chain_dy=8),
+    Weapon("Digger", 20, 0.2, 0.8, (150, 100, 50), chain=6, chain_dy=8),
+    Weapon("Heavy Digger", 35, 0.2, 0.8, (140, 90, 40), chain=10, chain_dy=8),
+    Weapon("Baby Sandhog", 15, 0.5, 0.8, (200, 160, 90), chain=3, chain_dx=8, chain_dy=6),
+    Weapon("Sandhog", 30, 0.5, 0.8, (190, 150, 80), chain=6, chain_dx=8, chain_dy=6),
+    Weapon("Heavy Sandhog", 50, 0.5, 0.8, (180, 140, 70), chain=10, chain_dx=8, chain_dy=6),
+    Weapon("Dirt Clod", 5, 0.0, 1.2, (120, 80, 30), effect=WeaponEffect.DIRT),
+    Weapon("Dirt Ball", 10, 0.0, 2.0, (110, 70, 25), effect=WeaponEffect.DIRT),
+    Weapon("Ton of Dirt", 25, 0.0, 3.5, (100, 60, 20), effect=WeaponEffect.DIRT),
+    Weapon("Liquid Dirt", 25, 0.0, 1.0, (90, 60, 30), effect=WeaponEffect.FLOW, liquid=60),
+    Weapon("Dirt Charge", 20, 0.0, 2.5, (130, 90, 40), effect=WeaponEffect.DIRT),
+    Weapon("Earth Disrupter", 30, 0.0, 4.0, (80, 200, 120), effect=WeaponEffect.SETTLE),
+    Weapon("Plasma Blast", 90, 3.0, 2.5, (120, 200, 255), beam=True),
+    Weapon("Laser", 60, 2.0, 0.6, (255, 0, 0), beam=True),
+    # Sub-munitions: never in an inventory, only spawned by the weapons above
+    Weapon("Funky Bomblet", 0, 0.8, 1.0, (255, 120, 255), preview_ms=80),
+    Weapon("MIRV Warhead", 0, 1.0, 1.2, (255, 90, 90), preview_ms=80),
+    Weapon("Death's Head Warhead", 0, 1.5, 2.0, (230, 230, 230), preview_ms=80),
+]
+
+WEAPON_LIST = tuple(_weapons)
+WEAPON_IDS = {weapon.name: index for index, weapon in enumerate(WEAPON_LIST)}
+weapon_data = {weapon.name: weapon for weapon in WEAPON_LIST}
+
+DEFAULT_WEAPON = "Baby Missile"  # never runs out
+STARTING_INVENTORY = {name: 2 for name in ALL_WEAPONS}
+STARTING_INVENTORY.update({"Baby Missile": 99, "Nuke": 1, "Death's Head": 1})
+
+
+def cycle_weapon(tank, direction=1):
+    owned_weapons = [w for w in ALL_WEAPONS if tank.inventory.get(w, 0) > 0 or w == DEFAULT_WEAPON]
+    current_index = owned_weapons.index(tank.current_weapon) if tank.current_weapon in owned_weapons else 0
+    new_index = (current_index + direction) % len(owned_weapons)
+    tank.current_weapon = owned_weapons[new_index]
+
+
+def take_weapon(tank) -> Weapon:
+    """Use up one round of the tank's current weapon, falling back to the default when empty."""
+    name = tank.current_weapon
+    if name != DEFAULT_WEAPON:
+        if tank.inventory.get(name, 0) <= 0:
+            name = tank.current_weapon = DEFAULT_WEAPON
+        else:
+            tank.inventory[name] -= 1
+    return weapon_data[name]
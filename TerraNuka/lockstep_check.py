@@ -0,0 +1,123 @@
+# lockstep_check.py
+#
+# Scripted lockstep match over loopback, no window needed:
+#   python3 lockstep_check.py --peers 3 --seed 42
+# A host and peers - 1 joined peers connect on a free port, the host sends
+# the match config and every peer plays its own copy of the match from it.
+# Owners pick turns with the AI and send them; everyone resolves every turn
+# and reports its checksum, as main.py does. Fails if the host sees a desync
+# or the copies don't end in the same state.
+
+import os
+os.environ.setdefault("TERRANUKA_HEADLESS", "1")
+
+import argparse
+import random
+import threading
+import time
+
+from core.ai import choose_input
+from core.cli import build_parser, menuconfig_from_args, game_config
+from core.entities import TankStore
+from core.lockstep import LockstepHost, LockstepPeer
+from core.simulation import new_match, next_active_index, begin_turn, apply_input, resolve_shot, state_checksum
+from core.snapshot import MatchState
+from core.terrain import Terrain
+
+MAX_TURNS = 60
+TIMEOUT = 10
+
+
+def connect(peer_count: int) -> list:
+    """A host on a free loopback port and peer_count - 1 peers joined to it, by peer id."""
+    host = LockstepHost(peer_count, port=0, address="127.0.0.1")
+    peers = []
+    # Each peer blocks until the host greets it, so they join from threads
+    threads = [threading.Thread(target=lambda: peers.append(LockstepPeer("127.0.0.1", host.port, TIMEOUT)))
+               for _ in range(peer_count - 1)]
+    for thread in threads:
+        thread.start()
+    host.wait_for_peers(timeout=TIMEOUT)
+    for thread in threads:
+        thread.join()
+    return [host] + sorted(peers, key=lambda peer: peer.peer_id)
+
+
+def wait_for(sessions, ready, what: str):
+    deadline = time.monotonic() + TIMEOUT
+    while not ready():
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"Timed out waiting for {what}")
+        for session in sessions:
+            session.poll()
+        time.sleep(0.001)
+
+
+def play(peer_count: int, seed: int, max_turns: int = MAX_TURNS) -> int:
+    sessions = connect(peer_count)
+    host = sessions[0]
+    try:
+        menuconfig = menuconfig_from_args(build_parser().parse_args(["--players", str(peer_count), "--seed", str(seed)]))
+        host.send_config(menuconfig)
+        configs = [menuconfig]
+        for session in sessions[1:]:
+            wait_for(sessions, lambda: session.config is not None, f"the config on peer {session.peer_id}")
+            configs.append(session.take_config())
+
+        states = []
+        for config in configs:
+            state = MatchState(terrain=Terrain(), tanks=TankStore())
+            new_match(state, game_config(config), [player["name"] for player in config["players"]])
+            states.append(state)
+        rng = random.Random(seed)
+
+        turn = 0
+        while turn < max_turns:
+            index = next_active_index(states[0])
+            if index is None:
+                break
+            owner = next(session for session in sessions if session.owns(index))
+            owner_state = states[sessions.index(owner)]
+            turn_input = choose_input(owner_state, index, rng)
+            owner.send_turn(turn, turn_input)
+            for session, state in zip(sessions, states):
+                if session is not owner:
+                    wait_for(sessions, lambda: turn in session.turns, f"turn {turn} on peer {session.peer_id}")
+                    turn_input = session.take_turn(turn)
+                state.turn_start = begin_turn(state.tanks, index)
+                tank = state.tanks[index]
+                apply_input(tank, turn_input, state.turn_start, state.terrain.heightMap)
+                resolve_shot(state, tank, turn)
+                state.turn_start = None
+                state.active_tank_index = (index + 1) % len(state.tanks)
+                session.report_checksum(turn, state_checksum(state))
+            turn += 1
+
+        # Every checksum has reached the host once it has none left waiting
+        wait_for(sessions, lambda: not host.checksums or host.desync_turn is not None, "the last checksums")
+        for session in sessions:
+            if session.desync_turn is not None:
+                raise RuntimeError(f"Peer {session.peer_id} saw a desync at turn {session.desync_turn}")
+        checksums = {state_checksum(state) for state in states}
+        if len(checksums) != 1:
+            raise RuntimeError(f"The {peer_count} copies of the match ended in {len(checksums)} different states")
+        return turn
+    finally:
+        for session in sessions:
+            session.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a scripted lockstep match over loopback and check for desyncs.")
+    parser.add_argument("--peers", type=int, default=3, help="machines in the match, host included")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--matches", type=int, default=1, help="matches to play, with seeds seed, seed + 1, ...")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    args = parser.parse_args()
+    for seed in range(args.seed, args.seed + args.matches):
+        turns = play(args.peers, seed, args.max_turns)
+        print(f"seed {seed}: {args.peers} peers, {turns} turns, no desync")
+
+
+if __name__ == "__main__":
+    main()
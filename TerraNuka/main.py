@@ -1,58 +1,130 @@
 # main.py
+#
+#   python3 main.py                         setup menu
+#   python3 main.py --players 3 --seed 42   straight into a match
+#   python3 main.py --config kiosk.json     saved profile (see --save-config)
+#
+# F5 quick-saves the match to quicksave.tns and F9 loads it back (not in lockstep matches).
+
+import cProfile
+import os
+import random
+
+from core.cli import build_parser, apply_headless, uses_cli_config, menuconfig_from_args, save_profile
+
+args = build_parser().parse_args()
+apply_headless(args)  # before core.globals reads the environment
 
 import pygame
-import sys
 import tkinter as tk
-import random
-import math
 
 from core import globals as g
-from core.config import WIDTH, HEIGHT, FPS, bounds
-from core.enums import GameState, CollisionResult
+from core import config_ui
+from core.config import WIDTH, HEIGHT, FPS
+from core.enums import GameState, WeaponEffect, Sound
 from core.entities import Firework
 from core.terrain import Terrain
 from core.config_ui import GameConfigUI, load_game_config
-from core.physics import (
-    apply_gravity_to_tank,
-    check_projectile_collision,
-    apply_explosion_damage,
-    apply_explosion_with_collapse,
-)
 from core.drawing import (
-    draw_hud,
-    draw_health_bar,
     draw_outlined_text,
     draw_explosion_preview,
+    draw_liquids,
+    draw_terrain,
 )
+from core.simulation import (
+    begin_turn,
+    capture_input,
+    apply_input,
+    resolve_shot,
+    state_checksum,
+    pour_liquid,
+    flow_liquids,
+    shape_terrain,
+)
+from core.lockstep import LockstepHost, LockstepPeer
+from core.snapshot import snapshot, restore
+from core.weapons import WEAPON_LIST, cycle_weapon, take_weapon
+from core.preview import AimPreview
+from core.tween import FallTween
+from core.display import Display
+from core.sprites import TankSprites
+from core.hud import Hud
+
+QUICKSAVE_PATH = "quicksave.tns"
+
+profiler = None
+if args.profile:
+    profiler = cProfile.Profile()
+    profiler.enable()
 
 # --- Initialize ---
 pygame.init()
-pygame.mixer.init()
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
+display = Display(args.window, g.HEADLESS)
+screen = display.surface
 pygame.display.set_caption("Scorched Earth Prototype")
 clock = pygame.time.Clock()
+aim_preview = AimPreview()
+tank_sprites = TankSprites()
+hud = Hud()
+fall_tween = None if g.HEADLESS else FallTween()
+
+net = None
+if args.lockstep_host:
+    net = LockstepHost(args.lockstep_host, args.port)
+    pygame.display.set_caption(f"Scorched Earth Prototype - waiting for {args.lockstep_host - 1} peer(s)")
+    net.wait_for_peers(poll=pygame.event.pump)
+elif args.lockstep_join:
+    net = LockstepPeer(args.lockstep_join, args.port)
+if net:
+    pygame.display.set_caption(f"Scorched Earth Prototype - lockstep peer {net.peer_id + 1}/{net.peer_count}")
 
 # --- Main loop ---
 running = True
 current_state = GameState.MENU
+frame = 0
 
 while running:
     if current_state == GameState.MENU:
-        pygame.mixer.music.load(g.menuTheme)
-        pygame.mixer.music.set_volume(0.3)
-        pygame.mixer.music.play(-1)
-        root = tk.Tk()
-        GameConfigUI(root)
-        root.mainloop()
+        if isinstance(net, LockstepPeer):
+            # The host picks the settings; wait for them instead of opening the menu
+            while config_ui.menuconfig is None and not net.disconnected:
+                pygame.event.pump()
+                net.poll()
+                config_ui.menuconfig = net.take_config()
+                clock.tick(FPS)
+        elif uses_cli_config(args):
+            config_ui.menuconfig = menuconfig_from_args(args)
+            if net:
+                net.send_config(config_ui.menuconfig)
+        else:
+            g.play_music(g.menuTheme, 0.3)
+            # Tk runs inside our loop so the pygame window keeps drawing and answering
+            menu = GameConfigUI(tk.Tk())
+            while config_ui.menuconfig is None and menu.pump():
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT:
+                        menu.close()
+                screen.fill((30, 30, 30))
+                if menu.preview_heights:
+                    draw_terrain(screen, menu.preview_heights[1], g.terrain.color)
+                display.present()
+                clock.tick(FPS)
+            menu.close()
+            if config_ui.menuconfig is None:
+                running = False
+                continue
+            if net:
+                net.send_config(config_ui.menuconfig)
+        if args.save_config and config_ui.menuconfig:
+            save_profile(args.save_config, config_ui.menuconfig)
+        g.turn_number = 0
+        g.turn_start = None
         current_state = GameState.PLAYING
 
     elif current_state in (GameState.PLAYING, GameState.GAME_OVER):
         if not g.config_loaded[0]:
             load_game_config()
-            pygame.mixer.music.fadeout(1000)
-            pygame.mixer.music.load(g.gameTheme)
-            pygame.mixer.music.set_volume(0.12)
-            pygame.mixer.music.play(-1)
+            g.play_music(g.gameTheme, 0.12, fadeout_ms=1000)
 
         screen.fill((30, 30, 30))
         dt = clock.tick(FPS) / 1000
@@ -61,6 +133,18 @@ while running:
         for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F5 and net is None:
+                with open(QUICKSAVE_PATH, "wb") as f:
+                    f.write(snapshot(g))
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_F9 and net is None:
+                if os.path.exists(QUICKSAVE_PATH):
+                    # Before the active tank is looked up, so this frame already plays the loaded match
+                    with open(QUICKSAVE_PATH, "rb") as f:
+                        restore(g, f.read())
+                    g.shot_trace.clear()
+                    g.fireworks.clear()
+                    g.show_game_over_overlay = False
+                    current_state = GameState.PLAYING
 
         def get_active_tank():
             last_index = (len(g.tanks) + g.active_tank_index - 1) % len(g.tanks)
@@ -80,13 +164,44 @@ while running:
         if game_over:
             current_state = GameState.GAME_OVER
 
+        def next_turn():
+            g.turn_overlay_start = pygame.time.get_ticks()
+            g.active_tank_index = (g.active_tank_index + 1) % len(g.tanks)
+            g.show_turn_overlay = True
+
+        def resolve_lockstep_turn(tank, turn_input):
+            apply_input(tank, turn_input, g.turn_start)
+            g.audio.emit(Sound.SHOT)
+            g.shot_trace = resolve_shot(g, tank, g.turn_number).path
+            net.report_checksum(g.turn_number, state_checksum(g))
+            g.turn_number += 1
+            g.turn_start = None
+            next_turn()
+
+        if net and current_state == GameState.PLAYING:
+            net.poll()
+            if g.turn_start is None or g.turn_start.tank_index != g.active_tank_index:
+                g.turn_start = begin_turn(g.tanks, g.active_tank_index)
+            if not net.owns(g.active_tank_index):
+                turn_input = net.take_turn(g.turn_number)
+                if turn_input:
+                    resolve_lockstep_turn(tank, turn_input)
+
         # --- Input ---
-        if current_state == GameState.PLAYING:
+        if current_state == GameState.PLAYING and (net is None or net.owns(g.active_tank_index)):
             for event in events:
-                if event.type == pygame.KEYDOWN and g.projectile is None:
-                    if event.key == pygame.K_SPACE:
-                        g.shotSound.play()
-                        g.projectile = tank.fire(tank.cannonPower)
+                if event.type == pygame.KEYDOWN and not g.shot_in_flight:
+                    if event.key == pygame.K_SPACE and net:
+                        turn_input = capture_input(tank, g.turn_start)
+                        net.send_turn(g.turn_number, turn_input)
+                        resolve_lockstep_turn(tank, turn_input)
+                        break
+                    elif event.key == pygame.K_SPACE:
+                        g.audio.emit(Sound.SHOT)
+                        g.projectiles.launch(tank, take_weapon(tank), g.active_tank_index, pygame.time.get_ticks())
+                        g.shot_in_flight = True
+                    elif event.key in (pygame.K_RSHIFT, pygame.K_SLASH):
+                        cycle_weapon(tank, 1 if event.key == pygame.K_RSHIFT else -1)
 
             keys = pygame.key.get_pressed()
             if keys[pygame.K_LEFT]:
@@ -130,74 +245,51 @@ while running:
                     ))
 
         # --- Terrain drawing ---
-        terrain_coords = [(0, bounds.y2)]
-        for x in range(WIDTH):
-            terrain_coords.append((x, bounds.y2 - g.terrain.heightMap[x]))
-        terrain_coords.append((WIDTH - 1, bounds.y2))
-        pygame.draw.polygon(screen, g.terrain.color, terrain_coords)
+        draw_terrain(screen, g.terrain.heightMap, g.terrain.color)
 
         # --- Tank updates & drawing ---
-        for tank in [t for t in g.tanks if t.active]:
-            apply_gravity_to_tank(tank, g.terrain.heightMap, bounds.y2)
-            pygame.draw.rect(screen, tank.color, (tank.x, tank.y, tank.width, tank.height))
-            aim_rad = math.radians(tank.aimAngle)
-            line_end = (
-                tank.x + math.cos(aim_rad) * tank.cannonLen,
-                tank.y - math.sin(aim_rad) * tank.cannonLen
-            )
-            pygame.draw.line(screen, tank.cannonColor, (tank.x, tank.y), line_end, 3)
-            draw_health_bar(screen, tank)
+        shown_y = fall_tween.update(g.tanks) if fall_tween else g.tanks.y
+        tank_sprites.draw(screen, g.tanks, shown_y)
+
+        # --- Aim preview for the local player ---
+        if (current_state == GameState.PLAYING and not g.shot_in_flight
+                and (net is None or net.owns(g.active_tank_index))):
+            aim_preview.draw(screen, g.tanks[g.active_tank_index], g.terrain)
 
         # --- Projectile updates ---
-        if g.projectile:
-            if g.projectile.x == tank.x and g.projectile.y == tank.y:
-                g.projectile.x = line_end[0]
-                g.projectile.y = line_end[1]
-
-            steps = int(max(abs(g.projectile.vx), abs(g.projectile.vy), 1))
-            for _ in range(steps):
-                g.projectile.x += g.projectile.vx / steps
-                g.projectile.y += g.projectile.vy / steps
-                result = check_projectile_collision(
-                    g.projectile.x, g.projectile.y, g.terrain.heightMap, WIDTH, HEIGHT, g.tanks
-                )
-                if result != CollisionResult.NO_COLLISION:
-                    break
-            g.projectile.vy += g.GRAVITY
+        for impact in g.projectiles.update(g.terrain, g.tanks):
+            if impact.weapon.effect is WeaponEffect.NONE:
+                continue  # tracers only show where the shot lands
+            for x, y in impact.blasts():
+                draw_explosion_preview(screen, x, y, impact.radius)
+                g.audio.emit(Sound.EXPLOSION)
+                for t in g.tanks.blast(x, y, impact.radius, impact.damage):
+                    if t.active:
+                        t.explode(g.Pending_Explosion_Next, g.audio)
+                pour_liquid(g, impact, x)
+                blast = (int(x), int(y), impact.radius, impact.weapon.preview_ms, None, impact.weapon.effect)
+                if g.Pending_Explosion is None:
+                    g.Shot_Show_Timer = 0
+                    g.Pending_Explosion = blast
+                else:
+                    g.Pending_Explosion_Next.append(blast)
 
-        def next_turn():
-            g.turn_overlay_start = pygame.time.get_ticks()
-            g.active_tank_index = (g.active_tank_index + 1) % len(g.tanks)
-            g.show_turn_overlay = True
+        flow_liquids(g)
 
-        if g.projectile:
-            collision = check_projectile_collision(
-                g.projectile.x, g.projectile.y, g.terrain.heightMap, WIDTH, HEIGHT, [tank]
-            )
-            match collision:
-                case CollisionResult.HIT_TERRAIN | CollisionResult.HIT_TANK:
-                    draw_explosion_preview(screen, g.projectile.x, g.projectile.y, g.projectile.strength)
-                    g.Shot_Show_Timer = 0
-                    g.Pending_Explosion = (
-                        int(g.projectile.x), int(g.projectile.y), g.projectile.strength,
-                        g.Shot_Show_Timer_Max, None
-                    )
-                    for t in g.tanks:
-                        apply_explosion_damage(t, g.projectile)
-                        if t.health <= 0 and t.active:
-                            t.explode()
-                    g.projectile = None
-                    next_turn()
-                case CollisionResult.MISS_OFFSCREEN:
-                    g.projectile = None
-                    next_turn()
+        if g.shot_in_flight and not g.projectiles.active and not g.liquids.active:
+            g.shot_in_flight = False
+            next_turn()
+
+        if g.Pending_Explosion is None and g.Pending_Explosion_Next:
+            g.Shot_Show_Timer = 0
+            g.Pending_Explosion = g.Pending_Explosion_Next.pop(0)
 
         if g.Pending_Explosion:
-            impact_x, impact_y, radius, anim_timer, origin = g.Pending_Explosion
+            impact_x, impact_y, radius, anim_timer, origin, effect = g.Pending_Explosion
             draw_explosion_preview(screen, impact_x, impact_y, radius)
             g.Shot_Show_Timer += clock.get_time()
             if g.Shot_Show_Timer >= anim_timer:
-                apply_explosion_with_collapse(g.terrain.heightMap, impact_x, impact_y, radius)
+                shape_terrain(g, effect, impact_x, impact_y, radius)
                 g.Shot_Show_Timer = 0
                 if origin:
                     origin.active = False
@@ -206,10 +298,20 @@ while running:
                     else g.Pending_Explosion_Next.pop(0)
                 )
 
-        if g.projectile:
-            pygame.draw.circle(screen, (255, 255, 255), (int(g.projectile.x), int(g.projectile.y)), 4)
+        draw_liquids(screen, g.liquids, g.terrain.heightMap)
 
-        draw_hud(screen, g.tanks[g.active_tank_index])
+        xs, ys, weapons = g.projectiles.positions()
+        for x, y, weapon in zip(xs, ys, weapons):
+            pygame.draw.circle(screen, WEAPON_LIST[weapon].color, (int(x), int(y)), 4)
+        for x0, y0, x1, y1, weapon, _ in g.projectiles.flashes:
+            pygame.draw.line(screen, WEAPON_LIST[weapon].color, (x0, y0), (x1, y1), 3)
+
+        # Lockstep shots are already resolved; replay the flight for show
+        if g.shot_trace:
+            x, y = g.shot_trace.pop(0)
+            pygame.draw.circle(screen, (255, 255, 255), (int(x), int(y)), 4)
+
+        hud.draw(screen, g.tanks[g.active_tank_index])
 
         if game_over and not g.show_turn_overlay and not g.show_game_over_overlay:
             g.show_game_over_overlay = True
@@ -225,6 +327,13 @@ while running:
                 font_overlay = pygame.font.SysFont(None, 48)
                 draw_outlined_text(screen, g.tanks[g.active_tank_index].name, font_overlay, WIDTH // 2 - 100, 60, overlay_color)
 
+        if net and net.desync_turn is not None:
+            font_overlay = pygame.font.SysFont(None, 48)
+            draw_outlined_text(screen, f"DESYNC at turn {net.desync_turn}", font_overlay, WIDTH // 2 - 160, 120, (255, 0, 0))
+        elif net and net.disconnected:
+            font_overlay = pygame.font.SysFont(None, 48)
+            draw_outlined_text(screen, "Peer disconnected", font_overlay, WIDTH // 2 - 140, 120, (255, 0, 0))
+
         if g.show_game_over_overlay:
             elapsed = pygame.time.get_ticks() - g.game_over_overlay_start
             fade = max(0, 255 - int((elapsed / 5000) * 255))
@@ -237,6 +346,15 @@ while running:
                 current_state = GameState.MENU
                 g.config_loaded[0] = False
 
-        pygame.display.flip()
+        g.audio.mix()
+        display.present()
+        frame += 1
+        if args.frames and frame >= args.frames:
+            running = False
 
+if net:
+    net.close()
 pygame.quit()
+if profiler:
+    profiler.disable()
+    profiler.dump_stats(args.profile)
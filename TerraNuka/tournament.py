@@ -0,0 +1,174 @@
+# tournament.py
+#
+# Headless AI-vs-AI balance sweeps:
+#   python3 tournament.py --seeds 200 --set tank_health=50,100 --set tank_explosion_radius=40,70
+# Each (seed, config) pair always plays out the same way; seed picks the
+# terrain and the AI's aiming error.
+
+import os
+os.environ.setdefault("TERRANUKA_HEADLESS", "1")
+
+import argparse
+import itertools
+import multiprocessing
+import random
+import time
+from dataclasses import fields, replace
+
+import numpy as np
+
+from core import globals as g
+from core.ai import choose_input
+from core.columnar import ColumnWriter
+from core.config import GameConfig
+from core.simulation import new_match, next_active_index, begin_turn, apply_input, resolve_shot, state_checksum
+from core.snapshot import fork, restore, snapshot
+
+MAX_TURNS = 200
+CHUNK_SIZE = 8
+
+MATCH_COLUMNS = {"config": "<u4", "seed": "<u4", "winner": "<i1", "turns": "<u2", "total_damage": "<f4"}
+SHOT_COLUMNS = {"config": "<u4", "seed": "<u4", "turn": "<u2", "shooter": "<u1", "damage": "<f4"}
+
+
+def check_snapshot(turn_input, turn: int):
+    """Snapshot g mid-turn, restore it into a fork and check both play the turn out identically."""
+    blob = snapshot(g)
+    restored = fork(g)
+    restore(restored, blob)
+    if snapshot(restored) != blob:
+        raise RuntimeError(f"Turn {turn}: snapshot does not survive a restore")
+    tank = restored.tanks[restored.turn_start.tank_index]
+    apply_input(tank, turn_input, restored.turn_start, restored.terrain.heightMap)
+    resolve_shot(restored, tank, turn)
+    return state_checksum(restored)
+
+
+def play_match(config: GameConfig, seed: int, max_turns: int = MAX_TURNS, lookahead: int = 0,
+               check_snapshots: bool = False):
+    new_match(g, replace(config, terrain_seed=seed))
+    rng = random.Random(seed)
+    shots = []
+    turn = 0
+    while turn < max_turns:
+        index = next_active_index(g)
+        if index is None:
+            break
+        tank = g.tanks[index]
+        health = [t.health for t in g.tanks]
+        turn_input = choose_input(g, index, rng, lookahead=lookahead, seed=turn)
+        g.turn_start = begin_turn(g.tanks, index)
+        expected = check_snapshot(turn_input, turn) if check_snapshots else None
+        apply_input(tank, turn_input, g.turn_start)
+        g.turn_start = None
+        resolve_shot(g, tank, turn)
+        if expected is not None and state_checksum(g) != expected:
+            raise RuntimeError(f"Seed {seed}, turn {turn}: restored snapshot played out differently")
+        shots.append((turn, index, sum(before - t.health for before, t in zip(health, g.tanks))))
+        g.active_tank_index = (index + 1) % len(g.tanks)
+        turn += 1
+
+    alive = [i for i, t in enumerate(g.tanks) if t.active]
+    winner = alive[0] if len(alive) == 1 else -1
+    return winner, turn, shots
+
+
+def play_chunk(job):
+    config_index, config, seeds, max_turns, lookahead, check_snapshots = job
+    matches = {name: [] for name in MATCH_COLUMNS}
+    shots = {name: [] for name in SHOT_COLUMNS}
+    for seed in seeds:
+        winner, turns, match_shots = play_match(config, seed, max_turns, lookahead, check_snapshots)
+        for name, value in zip(MATCH_COLUMNS, (config_index, seed, winner, turns, sum(s[2] for s in match_shots))):
+            matches[name].append(value)
+        for turn, shooter, damage in match_shots:
+            for name, value in zip(SHOT_COLUMNS, (config_index, seed, turn, shooter, damage)):
+                shots[name].append(value)
+    return matches, shots
+
+
+def parse_grid(settings: list[str], base: GameConfig) -> list[GameConfig]:
+    # "tank_health=50,100" -> one axis of the grid; terrain_bounds takes "min:max"
+    types = {f.name: f.type for f in fields(GameConfig)}
+    axes = []
+    for setting in settings:
+        name, values = setting.split("=", 1)
+        if name not in types or name in ("player_colors", "terrain_seed"):
+            raise ValueError(f"Cannot sweep GameConfig.{name}")
+        if name == "terrain_bounds":
+            parsed = [tuple(int(v) for v in value.split(":")) for value in values.split(",")]
+        else:
+            parsed = [types[name](value) if types[name] in (int, float) else float(value) for value in values.split(",")]
+        axes.append([(name, value) for value in parsed])
+    return [replace(base, **dict(combo)) for combo in itertools.product(*axes)]
+
+
+def summarize(config_index: int, config: GameConfig, matches: dict, shots: dict):
+    in_config = matches["config"] == config_index
+    winners = matches["winner"][in_config]
+    turns = matches["turns"][in_config]
+    damage = shots["damage"][shots["config"] == config_index]
+    print(f"[{config_index}] {config}")
+    if not len(turns):
+        print("    no matches played")
+        return
+    rates = ", ".join(
+        f"P{player + 1} {100 * np.mean(winners == player):.1f}%" for player in range(config.player_count)
+    )
+    print(f"    wins: {rates}, draws {100 * np.mean(winners == -1):.1f}%")
+    print(f"    turns/match: mean {turns.mean():.1f}, median {np.median(turns):.0f}, max {turns.max()}")
+    if len(damage):
+        p50, p90, p99 = np.percentile(damage, (50, 90, 99))
+        print(f"    damage/shot: mean {damage.mean():.1f}, p50 {p50:.1f}, p90 {p90:.1f}, p99 {p99:.1f}, "
+              f"misses {100 * np.mean(damage == 0):.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run headless TerraNuka AI tournaments over a process pool.")
+    parser.add_argument("--seeds", type=int, default=100, help="matches per configuration")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--players", type=int, default=2)
+    parser.add_argument("--set", action="append", default=[], metavar="FIELD=V1,V2",
+                        help="GameConfig field to sweep; repeat for a full grid")
+    parser.add_argument("--max-turns", type=int, default=MAX_TURNS)
+    parser.add_argument("--lookahead", type=int, default=0, metavar="SHOTS",
+                        help="let the AI play out its SHOTS best aims in forked matches before firing")
+    parser.add_argument("--check-snapshots", action="store_true",
+                        help="snapshot and restore every turn mid-turn and check the restored match plays the same")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--out", default="tournament_results")
+    args = parser.parse_args()
+
+    configs = parse_grid(args.set, GameConfig(player_count=args.players))
+    seeds = list(range(args.first_seed, args.first_seed + args.seeds))
+    jobs = [
+        (config_index, config, seeds[i:i + CHUNK_SIZE], args.max_turns, args.lookahead, args.check_snapshots)
+        for config_index, config in enumerate(configs)
+        for i in range(0, len(seeds), CHUNK_SIZE)
+    ]
+
+    started = time.perf_counter()
+    matches = {name: [] for name in MATCH_COLUMNS}
+    shots = {name: [] for name in SHOT_COLUMNS}
+    with ColumnWriter(os.path.join(args.out, "matches"), MATCH_COLUMNS) as match_writer, \
+            ColumnWriter(os.path.join(args.out, "shots"), SHOT_COLUMNS) as shot_writer, \
+            multiprocessing.Pool(args.workers) as pool:
+        for done, (chunk_matches, chunk_shots) in enumerate(pool.imap_unordered(play_chunk, jobs), start=1):
+            match_writer.append(chunk_matches)
+            shot_writer.append(chunk_shots)
+            for name in MATCH_COLUMNS:
+                matches[name].extend(chunk_matches[name])
+            for name in SHOT_COLUMNS:
+                shots[name].extend(chunk_shots[name])
+            print(f"\r{done}/{len(jobs)} chunks", end="", flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"\r{len(configs) * len(seeds)} matches in {elapsed:.1f}s ({args.workers} workers), results in {args.out}/")
+
+    matches = {name: np.asarray(values) for name, values in matches.items()}
+    shots = {name: np.asarray(values) for name, values in shots.items()}
+    for config_index, config in enumerate(configs):
+        summarize(config_index, config, matches, shots)
+
+
+if __name__ == "__main__":
+    main()